@@ -1,3 +1,4 @@
+import sys
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -17,25 +18,33 @@ st.set_page_config(
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_PROCESSED = BASE_DIR / "data" / "processed"
 
+sys.path.insert(0, str(BASE_DIR))
+from src.data.price_store import (  # noqa: E402
+    PriceDataset, ensure_column_store, open_column_store, store_version,
+)
+
 # --------------------------------------------------
 # LOAD DATA
 # --------------------------------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv(DATA_PROCESSED / "gold_silver_cleaned.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Gold_Silver_Ratio"] = df["Gold_Close"] / df["Silver_Close"]
-    return df
-
-df = load_data()
+# cache_resource (not cache_data) hands every session the same object,
+# so the memory-mapped columns are loaded once per server process and
+# store version. The version is checked on every rerun, so a rebuilt
+# store is picked up (and keys the view caches below).
+@st.cache_resource(max_entries=2)
+def load_data(version):
+    return PriceDataset(open_column_store())
+
+ensure_column_store()
+data_version = store_version()
+dataset = load_data(data_version)
 
 # --------------------------------------------------
 # SIDEBAR FILTERS
 # --------------------------------------------------
 st.sidebar.title("Filters")
 
-min_date = df["Date"].min()
-max_date = df["Date"].max()
+min_date = pd.Timestamp(dataset.dates[0])
+max_date = pd.Timestamp(dataset.dates[-1])
 
 date_range = st.sidebar.date_input(
     "Select Date Range",
@@ -50,11 +59,6 @@ if len(date_range) == 2:
 else:
     start_date = end_date = date_range[0]
 
-df = df[
-    (df["Date"] >= pd.to_datetime(start_date)) &
-    (df["Date"] <= pd.to_datetime(end_date))
-]
-
 # --------------------------------------------------
 # HEADER
 # --------------------------------------------------
@@ -62,108 +66,145 @@ st.title("📊 Gold & Silver Market Analysis")
 st.caption("Interactive BI-style dashboard for Product & Analytics roles")
 
 # --------------------------------------------------
-# TABS (NO SCROLLING DESIGN)
+# VIEWS (NO SCROLLING DESIGN)
 # --------------------------------------------------
-tab1, tab2, tab3, tab4 = st.tabs(
-    ["Overview", "Volatility", "Gold–Silver Ratio", "Strategy View"]
-)
-
-# ==================================================
-# TAB 1 — OVERVIEW
-# ==================================================
-with tab1:
-    st.subheader("Market Overview")
+# Each view builds its own data and figure, only when it is the active view.
+# st.cache_data keeps one entry per (view, data version, date range), so
+# switching back to a view, or to a range seen before, reuses its figure
+# instead of recomputing it, and a rebuilt store never serves old figures.
+VIEW_CACHE_ENTRIES = 16
+
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def overview_view(version, start_date, end_date):
+    query = load_data(version).between(start_date, end_date)
+    df = query.collect(query.prices(), query.normalized(), query.ratio())
+
+    metrics = {
+        "Gold Total Return": f"{df['Gold_Normalized'].iloc[-1] - 100:.2f}%",
+        "Silver Total Return": f"{df['Silver_Normalized'].iloc[-1] - 100:.2f}%",
+        "Avg Gold–Silver Ratio": f"{df['Gold_Silver_Ratio'].mean():.1f}",
+    }
+    fig = px.line(
+        df,
+        x="Date",
+        y=["Gold_Close", "Silver_Close"],
+        labels={"value": "Price", "variable": "Asset"},
+        title="Gold vs Silver Price Trends"
+    )
+    return metrics, fig
+
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def volatility_view(version, start_date, end_date):
+    # Reads the 30-day lookback too, so volatility is defined from the first day
+    query = load_data(version).between(start_date, end_date)
+    df = query.returns().rolling_vol(30).collect().rename(columns={
+        "Gold_Return_Vol_30": "Gold_Vol_30",
+        "Silver_Return_Vol_30": "Silver_Vol_30",
+    })
+    return px.line(
+        df,
+        x="Date",
+        y=["Gold_Vol_30", "Silver_Vol_30"],
+        labels={"value": "Volatility", "variable": "Asset"},
+        title="Rolling Volatility Comparison"
+    )
 
-    col1, col2, col3 = st.columns(3)
 
-    gold_return = (df["Gold_Close"].iloc[-1] / df["Gold_Close"].iloc[0] - 1) * 100
-    silver_return = (df["Silver_Close"].iloc[-1] / df["Silver_Close"].iloc[0] - 1) * 100
-    avg_ratio = df["Gold_Silver_Ratio"].mean()
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def ratio_view(version, start_date, end_date):
+    df = load_data(version).between(start_date, end_date).ratio().collect()
+    return px.line(
+        df,
+        x="Date",
+        y="Gold_Silver_Ratio",
+        labels={"Gold_Silver_Ratio": "Gold / Silver Ratio"},
+        title="Gold–Silver Ratio Over Time"
+    )
 
-    col1.metric("Gold Total Return", f"{gold_return:.2f}%")
-    col2.metric("Silver Total Return", f"{silver_return:.2f}%")
-    col3.metric("Avg Gold–Silver Ratio", f"{avg_ratio:.1f}")
 
-    fig_price = px.line(
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def strategy_view(version, start_date, end_date):
+    df = load_data(version).between(start_date, end_date).normalized().collect().rename(columns={
+        "Gold_Normalized": "Gold (Normalized)",
+        "Silver_Normalized": "Silver (Normalized)",
+    })
+    return px.line(
         df,
         x="Date",
-        y=["Gold_Close", "Silver_Close"],
-        labels={"value": "Price", "variable": "Asset"},
-        title="Gold vs Silver Price Trends"
+        y=["Gold (Normalized)", "Silver (Normalized)"],
+        labels={"value": "Index Value (Base = 100)", "variable": "Asset"},
+        title="Normalized Performance Comparison"
     )
 
-    st.plotly_chart(fig_price, width="stretch", key="price_trends")
 
 # ==================================================
-# TAB 2 — VOLATILITY
+# VIEW 1 — OVERVIEW
 # ==================================================
-with tab2:
-    st.subheader("Volatility Comparison (30-Day Rolling)")
+def render_overview(start_date, end_date):
+    st.subheader("Market Overview")
 
-    df["Gold_Return"] = df["Gold_Close"].pct_change()
-    df["Silver_Return"] = df["Silver_Close"].pct_change()
+    metrics, fig_price = overview_view(data_version, start_date, end_date)
+    for col, (label, value) in zip(st.columns(3), metrics.items()):
+        col.metric(label, value)
 
-    df["Gold_Vol_30"] = df["Gold_Return"].rolling(30).std()
-    df["Silver_Vol_30"] = df["Silver_Return"].rolling(30).std()
+    st.plotly_chart(fig_price, width="stretch", key="price_trends")
 
-    fig_vol = px.line(
-        df,
-        x="Date",
-        y=["Gold_Vol_30", "Silver_Vol_30"],
-        labels={"value": "Volatility", "variable": "Asset"},
-        title="Rolling Volatility Comparison"
-    )
 
-    st.plotly_chart(fig_vol, width="stretch", key="volatility_chart")
+# ==================================================
+# VIEW 2 — VOLATILITY
+# ==================================================
+def render_volatility(start_date, end_date):
+    st.subheader("Volatility Comparison (30-Day Rolling)")
+
+    st.plotly_chart(volatility_view(data_version, start_date, end_date), width="stretch", key="volatility_chart")
 
     st.caption("Silver consistently exhibits higher volatility than Gold.")
 
+
 # ==================================================
-# TAB 3 — GOLD–SILVER RATIO
+# VIEW 3 — GOLD–SILVER RATIO
 # ==================================================
-with tab3:
+def render_ratio(start_date, end_date):
     st.subheader("Gold–Silver Ratio")
 
-    fig_ratio = px.line(
-        df,
-        x="Date",
-        y="Gold_Silver_Ratio",
-        labels={"Gold_Silver_Ratio": "Gold / Silver Ratio"},
-        title="Gold–Silver Ratio Over Time"
-    )
-
-    st.plotly_chart(fig_ratio, width="stretch", key="ratio_chart")
+    st.plotly_chart(ratio_view(data_version, start_date, end_date), width="stretch", key="ratio_chart")
 
     st.caption(
         "Higher ratio → Silver undervalued relative to Gold. "
         "Lower ratio → Silver outperforming Gold."
     )
 
+
 # ==================================================
-# TAB 4 — STRATEGY VIEW
+# VIEW 4 — STRATEGY VIEW
 # ==================================================
-with tab4:
+def render_strategy(start_date, end_date):
     st.subheader("Normalized Performance (Buy & Hold Perspective)")
 
-    df_norm = df.copy()
-    df_norm["Gold (Normalized)"] = df_norm["Gold_Close"] / df_norm["Gold_Close"].iloc[0] * 100
-    df_norm["Silver (Normalized)"] = df_norm["Silver_Close"] / df_norm["Silver_Close"].iloc[0] * 100
-
-    fig_norm = px.line(
-        df_norm,
-        x="Date",
-        y=["Gold (Normalized)", "Silver (Normalized)"],
-        labels={"value": "Index Value (Base = 100)", "variable": "Asset"},
-        title="Normalized Performance Comparison"
-    )
-
-    st.plotly_chart(fig_norm, width="stretch", key="normalized_chart")
+    st.plotly_chart(strategy_view(data_version, start_date, end_date), width="stretch", key="normalized_chart")
 
     st.markdown(
         "**Insight:** Trend-following buy-and-hold strategies captured long-term gains "
         "more effectively than short-term mean-reversion signals."
     )
 
+
+VIEWS = {
+    "Overview": render_overview,
+    "Volatility": render_volatility,
+    "Gold–Silver Ratio": render_ratio,
+    "Strategy View": render_strategy,
+}
+
+# Unlike st.tabs, which runs every tab's code on each rerun, only the
+# selected view is computed and rendered
+active_view = st.radio(
+    "View", list(VIEWS), horizontal=True, key="active_view", label_visibility="collapsed"
+)
+VIEWS[active_view](start_date, end_date)
+
 # --------------------------------------------------
 # FOOTER
 # --------------------------------------------------
@@ -2,13 +2,28 @@
 Gold & Silver Market Analysis
 Main Entry Point
 
-This script serves as a reference entry point for the project.
-It documents the analysis workflow and allows selective execution
-of data preparation and analysis steps.
+Command-line interface for the project workflow:
 
-Dashboard is launched separately using Streamlit.
+    python main.py status                  project overview and data status
+    python main.py fetch                   download raw prices (yfinance)
+    python main.py clean                   build the cleaned dataset + binary store
+    python main.py analyze <analysis>      run one analysis script
+    python main.py backtest <strategy>     run a backtest
+    python main.py render                  render every chart without opening windows
+    python main.py dashboard               launch the Streamlit dashboard
+    python main.py serve                   start the local HTTP analytics API
+    python main.py imports                 check import time of each subcommand
+
+Only the standard library is imported at startup. pandas, matplotlib,
+yfinance and streamlit are imported inside the subcommand that needs them,
+so `--help` and `status` start almost instantly.
 """
 
+import argparse
+import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 # --------------------------------------------------
@@ -20,24 +35,273 @@ DATA_DIR = BASE_DIR / "data"
 SRC_DIR = BASE_DIR / "src"
 DASHBOARD_DIR = BASE_DIR / "dashboard"
 
-print("📊 Gold & Silver Market Analysis Project")
-print("-" * 45)
+ANALYSES = {
+    "trends": ("src.analysis.price_trends", "plot_gold_silver_trends"),
+    "ratio": ("src.analysis.gold_silver_ratio", "plot_gold_silver_ratio"),
+    "returns": ("src.analysis.returns_volatility", "analyze_returns_and_volatility"),
+    "returns-combined": ("src.analysis.returns_volatility_combine", "analyze_returns_and_volatility_combined"),
+    "rolling-vol": ("src.analysis.rolling_volatility", "analyze_rolling_volatility_improved"),
+    "bollinger": ("src.analysis.bollinger_bands", "plot_bollinger_bands"),
+    "var": ("src.analysis.risk", "analyze_rolling_var"),
+    "garch": ("src.analysis.garch", "analyze_garch_volatility"),
+    "holding": ("src.analysis.holding_period", "analyze_holding_periods"),
+    "validate": ("src.data.validate", None),
+}
+
+BACKTESTS = {
+    "bollinger": ("src.analysis.bollinger_backtest", "backtest_bollinger_strategy"),
+    "batch": ("src.analysis.strategy_backtest", "run_batch_backtest"),
+    "execution": ("src.analysis.execution_backtest", "backtest_execution"),
+}
+
+# Analyses that take an asset argument
+PER_ASSET = {"bollinger", "holding"}
+
+# Analyses that take a timeframe argument (see src/data/resample.py)
+TIMEFRAME_AWARE = {"bollinger", "returns", "returns-combined", "rolling-vol"}
+TIMEFRAMES = ["D", "W", "M", "Q"]
+
+# Analyses that can overlay GARCH(1,1) volatility forecasts (see src/analysis/garch.py)
+FORECAST_AWARE = {"rolling-vol"}
+
+# Modules each subcommand imports, and its import-time budget (ms, fresh interpreter)
+COMMAND_IMPORTS = {
+    "status": [],
+    "fetch": ["src.data.fitcher", "yfinance"],
+    "clean": ["src.data.clean_data"],
+    "analyze": [module for module, _ in ANALYSES.values()],
+    "backtest": [module for module, _ in BACKTESTS.values()],
+    "render": [module for module, _ in ANALYSES.values()],
+    "dashboard": ["streamlit", "plotly.express", "src.data.price_store"],
+    "serve": ["src.api.server"],
+}
+
+IMPORT_BUDGET_MS = {
+    "status": 100,
+    "fetch": 1500,
+    "clean": 600,
+    "analyze": 1500,
+    "backtest": 1500,
+    "render": 1500,
+    "dashboard": 2500,
+    "serve": 1500,
+}
+
+
+def _call(module_name, func_name, *args, **kwargs):
+    import importlib
+
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)(*args, **kwargs)
+
+
+def _use_headless_backend():
+    # Must happen before matplotlib.pyplot is imported
+    os.environ["MPLBACKEND"] = "Agg"
+
+
+# --------------------------------------------------
+# SUBCOMMANDS
+# --------------------------------------------------
+def cmd_status(args):
+    print("📊 Gold & Silver Market Analysis Project")
+    print("-" * 45)
+
+    print("Project structure:")
+    print(f"- Data directory:      {DATA_DIR}")
+    print(f"- Analysis scripts:    {SRC_DIR / 'analysis'}")
+    print(f"- Dashboard app:       {DASHBOARD_DIR / 'app.py'}")
+
+    print("\nData status:")
+    for path in (DATA_DIR / "raw" / "gold.csv", DATA_DIR / "raw" / "silver.csv",
+                 DATA_DIR / "processed" / "gold_silver_cleaned.csv"):
+        state = f"{path.stat().st_size / 1024:.0f} KiB" if path.exists() else "missing"
+        print(f"- {path.relative_to(BASE_DIR)}: {state}")
+
+    meta_path = DATA_DIR / "processed" / "gold_silver_cleaned" / "meta.json"
+    if meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        print(f"- binary store: {meta['rows']} rows, {meta['price_dtype']}")
+    else:
+        print("- binary store: missing (run `python main.py clean`)")
+
+    for manifest_path in sorted((DATA_DIR / "versions").glob("*/manifest.json")):
+        manifest = json.loads(manifest_path.read_text())
+        working = (manifest.get("working") or {}).get("version")
+        print(f"- versions/{manifest['dataset']}: {len(manifest['versions'])} recorded, "
+              f"working files at {working or 'unversioned'}")
+
+    print("\nWorkflow:")
+    print("1. python main.py fetch      → raw data (data/raw)")
+    print("2. python main.py clean      → cleaned data (data/processed)")
+    print("3. python main.py analyze …  → market analysis and backtesting (src/analysis)")
+    print("4. python main.py dashboard  → Streamlit dashboard (dashboard/app.py)")
+
+    print("\nNote:")
+    print("This project focuses on analytical validation and insight communication,")
+    print("not automated trading or prediction.")
+
+
+def cmd_fetch(args):
+    _call("src.data.fitcher", "fetch_gold_silver_data")
+
+
+def cmd_clean(args):
+    from src.data.clean_data import clean_gold_silver_data
+
+    formats = ("binary",) if args.binary_only else ("csv", "binary")
+    clean_gold_silver_data(
+        formats=formats,
+        price_dtype="float32" if args.float32 else "float64",
+        drop_invalid=args.drop_invalid,
+    )
+
+
+def cmd_analyze(args):
+    if args.no_show:
+        _use_headless_backend()
+    module_name, func_name = ANALYSES[args.analysis]
+    kwargs = {"timeframe": args.timeframe} if args.analysis in TIMEFRAME_AWARE else {}
+    if args.analysis in FORECAST_AWARE:
+        kwargs["forecast"] = args.forecast
+    if func_name is None:
+        import runpy
+
+        runpy.run_module(module_name, run_name="__main__")
+    elif args.analysis in PER_ASSET:
+        for asset in args.asset:
+            _call(module_name, func_name, asset, **kwargs)
+    else:
+        _call(module_name, func_name, **kwargs)
+
+
+def cmd_backtest(args):
+    if args.no_show:
+        _use_headless_backend()
+    module_name, func_name = BACKTESTS[args.strategy]
+    for asset in args.asset:
+        _call(module_name, func_name, asset, timeframe=args.timeframe)
+
+
+def cmd_render(args):
+    _use_headless_backend()
+    for name, (module_name, func_name) in ANALYSES.items():
+        if func_name is None:
+            continue
+        if name in PER_ASSET:
+            for asset in ("Gold", "Silver"):
+                _call(module_name, func_name, asset)
+        else:
+            _call(module_name, func_name)
+
+
+def cmd_dashboard(args):
+    command = [sys.executable, "-m", "streamlit", "run", str(DASHBOARD_DIR / "app.py")]
+    raise SystemExit(subprocess.call(command, cwd=BASE_DIR))
+
+
+def cmd_serve(args):
+    _call("src.api.server", "serve", args.host, args.port)
+
+
+def measure_import_ms(modules):
+    """
+    Time importing `modules` in a fresh interpreter (interpreter startup excluded).
+    """
+    code = (
+        "import time, importlib\n"
+        "t = time.perf_counter()\n"
+        f"for m in {modules!r}: importlib.import_module(m)\n"
+        "print((time.perf_counter() - t) * 1000)\n"
+    )
+    env = dict(os.environ, MPLBACKEND="Agg")
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BASE_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def cmd_imports(args):
+    commands = args.command_names or list(COMMAND_IMPORTS)
+    unknown = [name for name in commands if name not in COMMAND_IMPORTS]
+    if unknown:
+        raise SystemExit(f"Unknown subcommand(s): {', '.join(unknown)}")
+    over_budget = False
+
+    print(f"{'Command':<12}{'Import (ms)':>12}{'Budget (ms)':>13}  Status")
+    print("-" * 48)
+    for name in commands:
+        elapsed = measure_import_ms(["main"] + COMMAND_IMPORTS[name])
+        budget = IMPORT_BUDGET_MS[name]
+        if elapsed is None:
+            status, shown = "missing dependency", "-"
+        else:
+            status = "ok" if elapsed <= budget else "OVER BUDGET"
+            over_budget |= elapsed > budget
+            shown = f"{elapsed:.0f}"
+        print(f"{name:<12}{shown:>12}{budget:>13}  {status}")
+
+    if over_budget:
+        raise SystemExit(1)
+
+
+# --------------------------------------------------
+# ARGUMENT PARSING
+# --------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Gold & Silver Market Analysis command-line interface."
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    sub.add_parser("status", help="project overview and data status").set_defaults(func=cmd_status)
+    sub.add_parser("fetch", help="download raw Gold/Silver prices").set_defaults(func=cmd_fetch)
+
+    clean = sub.add_parser("clean", help="build the cleaned dataset")
+    clean.add_argument("--binary-only", action="store_true", help="skip writing the CSV")
+    clean.add_argument("--float32", action="store_true", help="store prices as float32")
+    clean.add_argument("--drop-invalid", action="store_true", help="drop rows flagged by validation")
+    clean.set_defaults(func=cmd_clean)
+
+    analyze = sub.add_parser("analyze", help="run one analysis")
+    analyze.add_argument("analysis", choices=list(ANALYSES))
+    analyze.add_argument("--asset", nargs="+", default=["Gold", "Silver"], choices=["Gold", "Silver"])
+    analyze.add_argument("--timeframe", default="D", choices=TIMEFRAMES, help="bar size (default: daily)")
+    analyze.add_argument("--forecast", action="store_true",
+                         help="overlay GARCH(1,1) forecasts on rolling-vol (daily bars only)")
+    analyze.add_argument("--no-show", action="store_true", help="save charts without opening windows")
+    analyze.set_defaults(func=cmd_analyze)
+
+    backtest = sub.add_parser("backtest", help="run a backtest")
+    backtest.add_argument("strategy", choices=list(BACKTESTS))
+    backtest.add_argument("--asset", nargs="+", default=["Gold", "Silver"], choices=["Gold", "Silver"])
+    backtest.add_argument("--timeframe", default="D", choices=TIMEFRAMES, help="bar size (default: daily)")
+    backtest.add_argument("--no-show", action="store_true", help="save charts without opening windows")
+    backtest.set_defaults(func=cmd_backtest)
+
+    sub.add_parser("render", help="render every analysis chart headlessly").set_defaults(func=cmd_render)
+    sub.add_parser("dashboard", help="launch the Streamlit dashboard").set_defaults(func=cmd_dashboard)
+
+    serve = sub.add_parser("serve", help="start the local HTTP analytics API")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.set_defaults(func=cmd_serve)
+
+    imports = sub.add_parser("imports", help="measure import time per subcommand against its budget")
+    imports.add_argument("command_names", nargs="*", metavar="command",
+                         help=f"subcommands to check (default: all of {', '.join(COMMAND_IMPORTS)})")
+    imports.set_defaults(func=cmd_imports)
 
-print("Project structure:")
-print(f"- Data directory:      {DATA_DIR}")
-print(f"- Analysis scripts:    {SRC_DIR / 'analysis'}")
-print(f"- Dashboard app:       {DASHBOARD_DIR / 'app.py'}")
+    return parser
 
-print("\nWorkflow:")
-print("1. Raw data is cleaned and processed (src/data)")
-print("2. Market analysis and backtesting are performed (src/analysis)")
-print("3. Insights are presented via Streamlit dashboard (dashboard/app.py)")
 
-print("\nTo run the dashboard:")
-print("python -m streamlit run dashboard/app.py")
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    func = getattr(args, "func", cmd_status)
+    func(args)
 
-print("\nNote:")
-print("This project focuses on analytical validation and insight communication,")
-print("not automated trading or prediction.")
 
-print("\n✅ Project setup complete.")
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.resample import load_prices, timeframe_suffix
+from src.data.versioning import data_versions, format_versions, record_run
+
 # Paths
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_PROCESSED = BASE_DIR / "data" / "processed"
@@ -22,10 +30,11 @@ def calculate_max_drawdown(equity):
 def backtest_bollinger_strategy(
     asset="Gold",
     initial_capital=100_000,
-    transaction_cost=0.001  # 0.1% per trade
+    transaction_cost=0.001,  # 0.1% per trade
+    timeframe="D"            # D / W / M / Q bars, see src/data/resample.py
 ):
-    df = pd.read_csv(DATA_PROCESSED / "gold_silver_cleaned.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
+    df = load_prices(timeframe)
+    versions = data_versions(("cleaned",))
 
     price_col = "Gold_Close" if asset == "Gold" else "Silver_Close"
 
@@ -110,6 +119,7 @@ def backtest_bollinger_strategy(
     print(f"Win Rate:               {win_rate:.2f}%")
     print(f"Average Trade PnL:      {avg_trade:.2f}%")
     print("Transaction Cost:       0.1% per trade")
+    print(f"Data Version:           {format_versions(versions)}")
     print("Note: Results are illustrative, not financial advice.")
     print("=" * 60)
 
@@ -125,13 +135,17 @@ def backtest_bollinger_strategy(
     ax.legend()
     ax.grid(True, alpha=0.3)
 
-    output_path = BASE_DIR / "outputs" / "charts" / f"{asset.lower()}_equity_curve.png"
+    output_path = BASE_DIR / "outputs" / "charts" / f"{asset.lower()}_equity_curve{timeframe_suffix(timeframe)}.png"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(output_path, dpi=300, bbox_inches="tight")
+    record_run(output_path, versions, asset=asset, timeframe=timeframe,
+               initial_capital=initial_capital, transaction_cost=transaction_cost)
 
     plt.show()
     plt.close(fig)
 
+    return df, trades_df
+
 
 # -----------------------------
 # Run
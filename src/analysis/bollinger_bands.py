@@ -1,14 +1,21 @@
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.resample import TIMEFRAME_LABELS, load_prices, timeframe_suffix
+
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_PROCESSED = BASE_DIR / "data" / "processed"
 
-def plot_bollinger_bands(asset="Gold"):
-    df = pd.read_csv(DATA_PROCESSED / "gold_silver_cleaned.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
+def plot_bollinger_bands(asset="Gold", timeframe="D"):
+    df = load_prices(timeframe)
+    bar = TIMEFRAME_LABELS[timeframe]
     
     if asset == "Gold":
         price_col = "Gold_Close"
@@ -61,7 +68,7 @@ def plot_bollinger_bands(asset="Gold"):
     # Plot price and bands
     ax1.plot(df["Date"], df[price_col], label=f"{asset} Price", 
              color=color, linewidth=1.5, alpha=0.9, zorder=3)
-    ax1.plot(df["Date"], df["MA"], label="20-Day MA (Middle Band)", 
+    ax1.plot(df["Date"], df["MA"], label=f"20-{bar} MA (Middle Band)", 
              color="black", linewidth=1.5, linestyle="--", zorder=2)
     
     # Plot upper and lower bands
@@ -92,7 +99,7 @@ def plot_bollinger_bands(asset="Gold"):
                 s=100, label=f"Sell Signal ({total_sell_signals})", zorder=5, edgecolors='black', linewidth=0.5)
     
     # Styling
-    ax1.set_title(f"{asset} Price with Bollinger Bands (20-Day, 2σ)", 
+    ax1.set_title(f"{asset} Price with Bollinger Bands (20-{bar}, 2σ)", 
                   fontsize=15, fontweight="bold", pad=15)
     ax1.set_ylabel("Price (USD)", fontsize=12, fontweight="bold")
     ax1.legend(loc='upper left', fontsize=10, framealpha=0.95)
@@ -132,7 +139,7 @@ def plot_bollinger_bands(asset="Gold"):
     fig.tight_layout()
     
     # Save
-    output_path = BASE_DIR / "outputs" / "charts" / f"{asset.lower()}_bollinger_bands.png"
+    output_path = BASE_DIR / "outputs" / "charts" / f"{asset.lower()}_bollinger_bands{timeframe_suffix(timeframe)}.png"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(output_path, dpi=300, bbox_inches="tight")
     
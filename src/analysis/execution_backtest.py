@@ -0,0 +1,430 @@
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.clean_data import DATA_RAW, load_yfinance_csv
+from src.data.query import _rolling_mean, _rolling_vol
+from src.data.resample import TIMEFRAMES, aggregate_ohlc, check_timeframe, timeframe_suffix
+from src.data.versioning import data_versions, format_versions, record_run
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+OUTPUT_DATA = BASE_DIR / "outputs" / "data"
+OUTPUT_CHARTS = BASE_DIR / "outputs" / "charts"
+
+SIZING_RULES = ("fixed_fraction", "fixed_units", "risk_per_trade")
+
+FILL_DTYPE = np.dtype([
+    ("bar", "<i8"), ("side", "<i1"), ("qty", "<f8"), ("price", "<f8"),
+    ("slippage", "<f8"), ("reason", "<i1"),
+])
+REASONS = {0: "LIMIT_BUY", 1: "TAKE_PROFIT", 2: "STOP", 3: "MARKET_EXIT"}
+
+
+# -----------------------------
+# Data
+# -----------------------------
+def load_ohlcv(asset="Gold", timeframe="D"):
+    """
+    Raw OHLCV bars for one asset (the cleaned dataset only keeps closes).
+    """
+    columns = ["Open", "High", "Low", "Close", "Volume"]
+    df = load_yfinance_csv(DATA_RAW / f"{asset.lower()}.csv")
+    for col in columns:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df = df.dropna(subset=columns[:4]).sort_values("Date").reset_index(drop=True)
+
+    rule = TIMEFRAMES[check_timeframe(timeframe)]
+    if rule is None:
+        return df
+    bars = aggregate_ohlc(df.set_index("Date")[columns].add_prefix(f"{asset}_"), rule)
+    bars.columns = [col[len(asset) + 1:] for col in bars.columns]
+    return bars.reset_index()
+
+
+# -----------------------------
+# Chunk preparation (vectorized)
+# -----------------------------
+def _prev_bands(close, c0, c1, window, k, stop_k):
+    """
+    Bollinger values of the PREVIOUS bar for bars c0..c1-1 (orders for bar t
+    are placed at the close of t-1). Reads `window` extra bars of history, and
+    each window is reduced on its own (not a running sum), so the bands are
+    identical whatever the chunk boundaries.
+    """
+    lo = max(0, c0 - window)
+    hist = close[lo:c1]
+    ma = _rolling_mean(hist, window)
+    std = _rolling_vol(hist, window)
+
+    def prev(values):
+        out = np.empty(c1 - c0)
+        start = c0 - lo
+        out[:] = np.nan
+        if start > 0:
+            out[:] = values[start - 1:start - 1 + (c1 - c0)]
+        else:
+            out[1:] = values[:c1 - c0 - 1]
+        return out
+
+    std_prev = prev(std)
+    ma_prev = prev(ma)
+    return ma_prev - k * std_prev, ma_prev + k * std_prev, ma_prev - stop_k * std_prev, std_prev
+
+
+def _next_index(indices, t):
+    i = np.searchsorted(indices, t)
+    return int(indices[i]) if i < len(indices) else None
+
+
+# -----------------------------
+# Execution simulation
+# -----------------------------
+def simulate_execution(
+    open_, high, low, close, volume,
+    window=20,
+    k=2.0,                 # limit entry / take-profit band width
+    stop_k=3.0,            # protective stop band width
+    initial_capital=100_000,
+    contract_size=1.0,     # price multiplier per unit of quantity
+    sizing="fixed_fraction",
+    sizing_value=0.5,      # fraction of equity / units / equity risked per trade
+    participation=0.1,     # max share of bar volume one order can take
+    impact=0.1,            # square-root impact coefficient (x bar range)
+    commission=0.0005,     # per side, fraction of notional
+    chunk_size=1_000_000,
+):
+    """
+    Order-level Bollinger mean-reversion simulation.
+
+    Orders (placed at the close of bar t-1, working during bar t):
+    - Flat: buy LIMIT at the lower band; fills at min(open, limit) when low <= limit.
+    - Long: sell LIMIT at the upper band (take profit) and a sell STOP at the
+      `stop_k` band. If both trigger in one bar the stop is assumed first.
+    - Each fill is capped at `participation` x bar volume (volume is read in
+      the same units as quantity), so large orders fill over several bars.
+      An unfilled stop keeps selling at market on the next bars.
+    - Limit orders fill at their price; stop and market fills pay square-root
+      impact: impact * (high - low) / close * sqrt(qty / volume).
+
+    Bars are handled in numpy chunks: masks mark the bars where a working order
+    could fill, and the Python state machine only visits those bars. Results
+    are the same for every chunk size and equal simulate_execution_reference.
+    Returns (equity array, fills structured array).
+    """
+    if sizing not in SIZING_RULES:
+        raise ValueError(f"sizing must be one of {SIZING_RULES}, got {sizing!r}")
+
+    open_, high, low, close = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+    volume = np.nan_to_num(np.asarray(volume, dtype=np.float64))
+    n = len(close)
+    equity = np.empty(n)
+    fills = []
+    states = []  # (cash, qty) after each fill
+
+    cash = float(initial_capital)
+    qty = 0.0
+    entry_remaining = 0.0
+    selling = False
+
+    def impact_price(base, q, i_high, i_low, i_close, i_vol, side):
+        slip = impact * (i_high - i_low) / i_close * np.sqrt(q / i_vol)
+        return base * (1 - side * slip), base * slip * q * contract_size
+
+    for c0 in range(0, n, chunk_size):
+        c1 = min(n, c0 + chunk_size)
+        o, h, l, c, v = open_[c0:c1], high[c0:c1], low[c0:c1], close[c0:c1], volume[c0:c1]
+        lower, upper, stop, std = _prev_bands(close, c0, c1, window, k, stop_k)
+
+        liquid = v > 0
+        with np.errstate(invalid="ignore"):
+            entry_idx = np.flatnonzero(liquid & (l <= lower))
+            exit_idx = np.flatnonzero(liquid & ((h >= upper) | (l <= stop)))
+        liquid_idx = np.flatnonzero(liquid)
+
+        cash_start, qty_start, first_fill = cash, qty, len(fills)
+        t = 0
+        while True:
+            if selling:
+                i = _next_index(liquid_idx, t)
+            elif qty > 0 and entry_remaining == 0:
+                i = _next_index(exit_idx, t)
+            elif qty > 0:
+                candidates = [x for x in (_next_index(entry_idx, t), _next_index(exit_idx, t)) if x is not None]
+                i = min(candidates) if candidates else None
+            else:
+                i = _next_index(entry_idx, t)
+            if i is None:
+                break
+            t = i + 1
+
+            cap = participation * v[i]
+            if selling or (qty > 0 and l[i] <= stop[i]):
+                # Stop (or leftover stop quantity sold at market)
+                reason = 3 if selling else 2
+                base = o[i] if selling else min(o[i], stop[i])
+                q = min(qty, cap)
+                price, slip_cost = impact_price(base, q, h[i], l[i], c[i], v[i], side=1)
+                entry_remaining = 0.0
+            elif qty > 0 and h[i] >= upper[i]:
+                reason = 1
+                q = min(qty, cap)
+                price, slip_cost = max(o[i], upper[i]), 0.0
+                entry_remaining = 0.0
+            else:
+                reason = 0
+                price, slip_cost = min(o[i], lower[i]), 0.0
+                if qty == 0 and entry_remaining == 0:
+                    equity_now = cash
+                    if sizing == "fixed_fraction":
+                        target = sizing_value * equity_now / (price * contract_size)
+                    elif sizing == "fixed_units":
+                        target = sizing_value
+                    else:
+                        risk_per_unit = (stop_k - k) * std[i] * contract_size
+                        target = sizing_value * equity_now / risk_per_unit
+                    entry_remaining = target
+                affordable = cash / (price * contract_size * (1 + commission))
+                q = min(entry_remaining, cap, affordable)
+                entry_remaining = 0.0 if q >= entry_remaining else entry_remaining - q
+                if q <= 0:
+                    continue
+
+            notional = q * price * contract_size
+            fee = notional * commission
+            if reason == 0:
+                cash -= notional + fee
+                qty += q
+                fills.append((c0 + i, 1, q, price, 0.0, reason))
+            else:
+                cash += notional - fee
+                qty -= q
+                selling = qty > 1e-12 and reason in (2, 3)
+                if qty <= 1e-12:
+                    qty = 0.0
+                fills.append((c0 + i, -1, q, price, slip_cost, reason))
+            states.append((cash, qty))
+
+        # Equity for the chunk: cash/qty after the last fill at or before each bar
+        fill_bars = np.array([fill[0] for fill in fills[first_fill:]], dtype=np.int64) - c0
+        last = np.searchsorted(fill_bars, np.arange(c1 - c0), side="right") - 1
+        chunk_states = np.array([(cash_start, qty_start)] + states[first_fill:])
+        cash_path, qty_path = chunk_states[last + 1].T
+        equity[c0:c1] = cash_path + qty_path * c * contract_size
+
+    return equity, np.array(fills, dtype=FILL_DTYPE)
+
+
+def simulate_execution_reference(
+    open_, high, low, close, volume, window=20, k=2.0, stop_k=3.0, initial_capital=100_000,
+    contract_size=1.0, sizing="fixed_fraction", sizing_value=0.5, participation=0.1,
+    impact=0.1, commission=0.0005,
+):
+    """
+    Plain per-bar loop with the same order rules as simulate_execution (for
+    checking it; far too slow for long histories).
+    """
+    open_, high, low, close = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+    volume = np.nan_to_num(np.asarray(volume, dtype=np.float64))
+    n = len(close)
+    ma_prev, std_prev = np.full(n, np.nan), np.full(n, np.nan)
+    ma_prev[1:] = _rolling_mean(close, window)[:-1]
+    std_prev[1:] = _rolling_vol(close, window)[:-1]
+    lower, upper, stop = ma_prev - k * std_prev, ma_prev + k * std_prev, ma_prev - stop_k * std_prev
+
+    equity = np.empty(n)
+    fills = []
+    cash, qty, entry_remaining, selling = float(initial_capital), 0.0, 0.0, False
+
+    for t in range(n):
+        o, h, l, c, v = open_[t], high[t], low[t], close[t], volume[t]
+        q = 0.0
+        if v > 0 and (selling or (qty > 0 and l <= stop[t])):
+            base = o if selling else min(o, stop[t])
+            q = min(qty, participation * v)
+            slip = impact * (h - l) / c * np.sqrt(q / v)
+            price, slip_cost, reason = base * (1 - slip), base * slip * q * contract_size, 3 if selling else 2
+        elif v > 0 and qty > 0 and h >= upper[t]:
+            q, price, slip_cost, reason = min(qty, participation * v), max(o, upper[t]), 0.0, 1
+        elif v > 0 and (qty == 0 or entry_remaining > 0) and l <= lower[t]:
+            price, reason = min(o, lower[t]), 0
+            if qty == 0 and entry_remaining == 0:
+                if sizing == "fixed_fraction":
+                    entry_remaining = sizing_value * cash / (price * contract_size)
+                elif sizing == "fixed_units":
+                    entry_remaining = sizing_value
+                else:
+                    entry_remaining = sizing_value * cash / ((stop_k - k) * std_prev[t] * contract_size)
+            q = min(entry_remaining, participation * v, cash / (price * contract_size * (1 + commission)))
+            entry_remaining = 0.0 if q >= entry_remaining else entry_remaining - q
+
+        if q > 0:
+            notional = q * price * contract_size
+            if reason == 0:
+                cash -= notional + notional * commission
+                qty += q
+                fills.append((t, 1, q, price, 0.0, reason))
+            else:
+                cash += notional - notional * commission
+                qty -= q
+                entry_remaining = 0.0
+                selling = qty > 1e-12 and reason in (2, 3)
+                if qty <= 1e-12:
+                    qty = 0.0
+                fills.append((t, -1, q, price, slip_cost, reason))
+        equity[t] = cash + qty * c * contract_size
+
+    return equity, np.array(fills, dtype=FILL_DTYPE)
+
+
+def round_trip_pnl(fills):
+    """
+    PnL % of each completed round trip (buy value vs sell value, before fees).
+    """
+    pnl = []
+    bought = sold = held = 0.0
+    for side, q, price in zip(fills["side"], fills["qty"], fills["price"]):
+        if side > 0:
+            bought += q * price
+            held += q
+        else:
+            sold += q * price
+            held -= q
+            if held <= 1e-12:
+                pnl.append((sold / bought - 1) * 100)
+                bought = sold = held = 0.0
+    return np.array(pnl)
+
+
+def calculate_max_drawdown(equity):
+    peak = np.maximum.accumulate(equity)
+    return ((equity - peak) / peak).min() * 100
+
+
+# -----------------------------
+# Backtest Function
+# -----------------------------
+def backtest_execution(asset="Gold", initial_capital=100_000, timeframe="D", **params):
+    df = load_ohlcv(asset, timeframe)
+    versions = data_versions((asset.lower(),))
+    equity, fills = simulate_execution(
+        df["Open"].to_numpy(), df["High"].to_numpy(), df["Low"].to_numpy(),
+        df["Close"].to_numpy(), df["Volume"].to_numpy(),
+        initial_capital=initial_capital, **params
+    )
+
+    pnl = round_trip_pnl(fills)
+    sells = fills[fills["side"] < 0]
+    sell_notional = (sells["qty"] * sells["price"]).sum()
+    slippage_bps = sells["slippage"].sum() / sell_notional * 1e4 if sell_notional else 0.0
+    buy_orders = (np.diff(np.concatenate([[0], (fills["side"] > 0).astype(int)])) == 1).sum()
+
+    final_equity = equity[-1]
+    total_return = (final_equity / initial_capital - 1) * 100
+    buy_hold_return = (df["Close"].iloc[-1] / df["Close"].iloc[0] - 1) * 100
+
+    # -----------------------------
+    # Print Summary
+    # -----------------------------
+    print("\n" + "=" * 60)
+    print(f"{asset} – Bollinger Execution Backtest (limit/stop orders)")
+    print("=" * 60)
+    print(f"Initial Capital:        ${initial_capital:,.0f}")
+    print(f"Final Capital:          ${final_equity:,.0f}")
+    print(f"Strategy Return:        {total_return:.2f}%")
+    print(f"Buy & Hold Return:      {buy_hold_return:.2f}%")
+    print(f"Max Drawdown:           {calculate_max_drawdown(equity):.2f}%")
+    print(f"Round Trips:            {len(pnl)}")
+    print(f"Fills:                  {len(fills)} ({len(fills) / max(len(pnl), 1):.1f} per round trip)")
+    print(f"Entry Orders:           {buy_orders}")
+    print(f"Win Rate:               {(pnl > 0).mean() * 100 if len(pnl) else 0:.2f}%")
+    print(f"Avg Exit Slippage:      {slippage_bps:.1f} bps")
+    print(f"Data Version:           {format_versions(versions)}")
+    print("Note: Results are illustrative, not financial advice.")
+    print("=" * 60)
+
+    fills_df = pd.DataFrame({
+        "Date": df["Date"].to_numpy()[fills["bar"]],
+        "Type": np.where(fills["side"] > 0, "BUY", "SELL"),
+        "Reason": [REASONS[r] for r in fills["reason"]],
+        "Qty": fills["qty"],
+        "Price": fills["price"],
+        "Slippage_$": fills["slippage"],
+    })
+    output_path = OUTPUT_DATA / f"{asset.lower()}_execution_fills{timeframe_suffix(timeframe)}.csv"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fills_df.to_csv(output_path, index=False)
+    record_run(output_path, versions, asset=asset, timeframe=timeframe,
+               initial_capital=initial_capital, params=params)
+
+    # -----------------------------
+    # Equity Curve Plot
+    # -----------------------------
+    fig, ax = plt.subplots(figsize=(12, 5))
+    ax.plot(df["Date"], equity, label="Strategy Equity (order-level)", color="purple")
+
+    ax.set_title(f"{asset} Bollinger Execution Backtest – Equity Curve")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Portfolio Value")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    chart_path = OUTPUT_CHARTS / f"{asset.lower()}_execution_equity_curve{timeframe_suffix(timeframe)}.png"
+    chart_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(chart_path, dpi=300, bbox_inches="tight")
+
+    plt.show()
+    plt.close(fig)
+
+    return equity, fills_df
+
+
+def synthetic_bars(n_bars, seed=0):
+    """Random-walk OHLCV bars: (open, high, low, close, volume)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))
+    open_ = np.empty(n_bars)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0, 0.0008, n_bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(0, 500, n_bars).astype(np.float64)
+    return open_, high, low, close, volume
+
+
+def benchmark(n_bars=10_000_000, seed=0, **params):
+    """
+    Time the simulation on synthetic random-walk OHLCV bars.
+    """
+    bars = synthetic_bars(n_bars, seed)
+
+    start = time.perf_counter()
+    equity, fills = simulate_execution(*bars, **params)
+    elapsed = time.perf_counter() - start
+    print(f"{n_bars:,} bars, {len(fills):,} fills in {elapsed:.2f}s "
+          f"({n_bars / elapsed / 1e6:.1f}M bars/s)")
+    return elapsed
+
+
+# -----------------------------
+# Run
+# -----------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Order-level Bollinger execution backtest.")
+    parser.add_argument("--bench", type=int, metavar="N_BARS", help="time N synthetic bars instead")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+    else:
+        backtest_execution("Gold")
+        backtest_execution("Silver")
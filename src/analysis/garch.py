@@ -0,0 +1,477 @@
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.price_store import load_price_dataset
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+OUTPUT_DATA = BASE_DIR / "outputs" / "data"
+OUTPUT_CHARTS = BASE_DIR / "outputs" / "charts"
+
+MODELS = ("garch", "egarch")
+N_PARAMS = {"garch": 3, "egarch": 4}
+MODEL_LABELS = {"garch": "GARCH(1,1)", "egarch": "EGARCH(1,1)"}
+
+# Returns are modelled in percent: parameters stay O(1), which keeps the
+# finite-difference gradients well scaled
+RETURN_SCALE = 100.0
+LOG_2PI = np.log(2 * np.pi)
+ABS_Z_MEAN = np.sqrt(2 / np.pi)  # E|z| for z ~ N(0, 1)
+MAX_PERSISTENCE = 0.9999
+
+# Box for the unconstrained parameters: keeps the sigmoid/tanh transforms
+# away from saturation, where gradients vanish and warm starts get stuck
+THETA_BOUNDS = {
+    "garch": (np.array([-20.0, -8.0, -8.0]), np.array([5.0, 8.0, 8.0])),
+    "egarch": (np.array([-5.0, -2.0, -2.0, -4.0]), np.array([5.0, 2.0, 2.0, 4.0])),
+}
+
+# Line search: every step size is tried at once in one batched evaluation
+STEP_SIZES = np.array([1.0, 0.5, 0.25, 0.1, 0.03, 0.01])
+GRAD_STEP = 1e-5
+
+
+# -----------------------------
+# Parameters (unconstrained theta <-> model parameters)
+# -----------------------------
+# GARCH(1,1):  s2[t+1] = omega + alpha * r[t]^2 + beta * s2[t]
+#   omega = exp(theta0), alpha + beta = MAX_PERSISTENCE * sigmoid(theta1),
+#   alpha / (alpha + beta) = sigmoid(theta2)      (positive and stationary)
+# EGARCH(1,1): ln s2[t+1] = omega + alpha * (|z[t]| - E|z|) + gamma * z[t] + beta * ln s2[t]
+#   beta = MAX_PERSISTENCE * tanh(theta3), the rest unconstrained
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def _logit(p):
+    return np.log(p / (1 - p))
+
+
+def to_params(model, theta):
+    theta = np.asarray(theta, dtype=np.float64)
+    if model == "garch":
+        persistence = MAX_PERSISTENCE * _sigmoid(theta[..., 1])
+        share = _sigmoid(theta[..., 2])
+        return np.stack([np.exp(theta[..., 0]), persistence * share, persistence * (1 - share)], axis=-1)
+    return np.stack([theta[..., 0], theta[..., 1], theta[..., 2],
+                     MAX_PERSISTENCE * np.tanh(theta[..., 3])], axis=-1)
+
+
+def initial_theta(model, variance):
+    """
+    Textbook starting point for a cold fit, one row per asset.
+    """
+    variance = np.asarray(variance, dtype=np.float64)
+    ones = np.ones_like(variance)
+    if model == "garch":
+        persistence, alpha = 0.97, 0.08
+        return np.stack([np.log(variance * (1 - persistence)),
+                         _logit(persistence / MAX_PERSISTENCE) * ones,
+                         _logit(alpha / persistence) * ones], axis=-1)
+    beta = 0.97
+    return np.stack([(1 - beta) * np.log(variance), 0.1 * ones, 0.0 * ones,
+                     np.arctanh(beta / MAX_PERSISTENCE) * ones], axis=-1)
+
+
+# -----------------------------
+# Variance recursion (vectorized across series)
+# -----------------------------
+def variance_paths(model, returns, params, sigma2_0):
+    """
+    Conditional variance for every column of `returns` (T x B), each with its
+    own parameters (B x n_params). The recursion is sequential in time, so
+    the loop runs over time and every step updates all B series at once.
+
+    Returns (T + 1) x B: row t is the variance forecast for returns[t] made
+    after t - 1; the last row is the one-step forecast after the sample.
+    """
+    T, B = returns.shape
+    out = np.empty((T + 1, B))
+    out[0] = sigma2_0
+
+    if model == "garch":
+        omega, alpha, beta = params.T
+        shock = omega + alpha * returns ** 2
+        for t in range(T):
+            np.multiply(beta, out[t], out=out[t + 1])
+            out[t + 1] += shock[t]
+        return out
+
+    # Run on m = -ln(s2) / 2, so 1 / sigma is a single exp(m), with the
+    # coefficients pre-scaled and all temporaries preallocated
+    omega, alpha, gamma, beta = params.T
+    constant = -0.5 * (omega - alpha * ABS_Z_MEAN)
+    alpha, gamma = -0.5 * alpha, -0.5 * gamma
+    m = out
+    m[0] = -0.5 * np.log(sigma2_0)
+    z, term = np.empty(B), np.empty(B)
+    for t in range(T):
+        np.exp(m[t], out=z)
+        z *= returns[t]
+        np.multiply(gamma, z, out=term)
+        np.abs(z, out=z)
+        z *= alpha
+        term += z
+        np.multiply(beta, m[t], out=m[t + 1])
+        m[t + 1] += term
+        m[t + 1] += constant
+    return np.exp(-2 * m)
+
+
+def negative_log_likelihood(model, returns, thetas):
+    """
+    Average Gaussian negative log-likelihood of several parameter candidates
+    per asset in one pass.
+
+    returns: T x N, thetas: N x K x n_params -> N x K
+    """
+    N, K, n_params = thetas.shape
+    params = to_params(model, thetas.reshape(N * K, n_params))
+    r = np.repeat(returns, K, axis=1)
+    sigma2_0 = np.repeat(returns.var(axis=0), K)
+
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        s2 = variance_paths(model, r, params, sigma2_0)[:-1]
+        nll = 0.5 * (LOG_2PI + (np.log(s2) + r ** 2 / s2).mean(axis=0))
+    return np.where(np.isfinite(nll), nll, np.inf).reshape(N, K)
+
+
+def _value_and_grad(model, returns, theta):
+    # theta, theta + h e_i, theta - h e_i for every asset, in one batch
+    N, n_params = theta.shape
+    offsets = np.vstack([np.zeros(n_params), GRAD_STEP * np.eye(n_params), -GRAD_STEP * np.eye(n_params)])
+    values = negative_log_likelihood(model, returns, theta[:, None, :] + offsets[None])
+    grad = (values[:, 1:1 + n_params] - values[:, 1 + n_params:]) / (2 * GRAD_STEP)
+    return values[:, 0], grad
+
+
+# -----------------------------
+# Batched quasi-Newton fit
+# -----------------------------
+def fit(model, returns, theta0=None, hessian_inv0=None, max_iter=200, tol=1e-8):
+    """
+    Maximum-likelihood fit of one model to every column of `returns` (T x N,
+    already in RETURN_SCALE units) at once: BFGS with finite-difference
+    gradients and a parallel step-size line search, run in lockstep across
+    assets; converged assets drop out of later iterations.
+
+    theta0 (N x n_params) and hessian_inv0 (N x n_params x n_params) warm-start
+    the search from a previous fit. Assets where the default starting point
+    scores better than theta0 start from the default instead.
+
+    Returns (theta, negative log-likelihood, iterations, inverse Hessian).
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    if not np.isfinite(returns).all():
+        raise ValueError("returns must not contain NaN/inf")
+    N = returns.shape[1]
+    n_params = N_PARAMS[model]
+
+    lower, upper = THETA_BOUNDS[model]
+    eye = np.eye(n_params)
+    theta = initial_theta(model, returns.var(axis=0))
+    hessian_inv = np.tile(eye, (N, 1, 1))
+    steepest = np.ones(N, dtype=bool)  # inverse Hessian is the identity
+    if theta0 is not None:
+        starts = np.stack([np.clip(theta0, lower, upper), theta], axis=1)
+        warm = negative_log_likelihood(model, returns, starts).argmin(axis=1) == 0
+        theta[warm] = starts[warm, 0]
+        if hessian_inv0 is not None:
+            hessian_inv[warm] = hessian_inv0[warm]
+            steepest[warm] = False
+    theta = np.clip(theta, lower, upper)
+    iterations = np.zeros(N, dtype=np.int64)
+
+    value, grad = _value_and_grad(model, returns, theta)
+    active = np.flatnonzero(np.isfinite(value))
+
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        r, th, g, h_inv = returns[:, active], theta[active], grad[active], hessian_inv[active]
+        iterations[active] += 1
+
+        direction = -np.einsum("nij,nj->ni", h_inv, g)
+        uphill = np.einsum("ni,ni->n", direction, g) >= 0
+        direction[uphill] = -g[uphill]
+        h_inv[uphill] = eye
+        was_steepest = steepest[active] | uphill
+
+        candidates = np.clip(th[:, None, :] + STEP_SIZES[None, :, None] * direction[:, None, :], lower, upper)
+        trial = negative_log_likelihood(model, r, candidates)
+        best = trial.argmin(axis=1)
+        improved = trial[np.arange(len(active)), best] < value[active]
+
+        new_theta = np.where(improved[:, None], candidates[np.arange(len(active)), best], th)
+        new_value, new_grad = _value_and_grad(model, r, new_theta)
+
+        # BFGS update of the inverse Hessian where the curvature condition holds
+        s = new_theta - th
+        y = new_grad - g
+        sy = np.einsum("ni,ni->n", s, y)
+        update = improved & (sy > 1e-12)
+        if update.any():
+            rho = 1 / sy[update]
+            left = eye - rho[:, None, None] * np.einsum("ni,nj->nij", s[update], y[update])
+            h_inv[update] = (
+                left @ h_inv[update] @ left.transpose(0, 2, 1)
+                + rho[:, None, None] * np.einsum("ni,nj->nij", s[update], s[update])
+            )
+        h_inv[~improved] = eye
+
+        # Converged: negligible gain, or no step helps even along the gradient
+        gain = value[active] - new_value
+        done = (improved & (gain < tol * (1 + np.abs(new_value)))) | (~improved & was_steepest)
+
+        theta[active], value[active], grad[active], hessian_inv[active] = new_theta, new_value, new_grad, h_inv
+        steepest[active] = ~improved
+        active = active[~done]
+
+    return theta, value, iterations, hessian_inv
+
+
+# -----------------------------
+# Rolling re-estimation and forecasts
+# -----------------------------
+def rolling_forecast(model, returns, window=1000, refit_every=1, theta0=None):
+    """
+    Out-of-sample one-step variance forecasts with periodic re-estimation.
+
+    Every `refit_every` bars the model is refitted on the last `window`
+    returns, warm-started from the previous fit, and its parameters are
+    used until the next refit. The variance recursion carries on across
+    refits, so each forecast only uses returns known at the time.
+
+    returns: T x N (RETURN_SCALE units). Returns (forecast (T + 1) x N,
+    NaN before the first fit; row t forecasts returns[t], the last row is
+    the next bar), final theta, and the total BFGS iteration count.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    T, N = returns.shape
+    window = min(window, T)
+    forecast = np.full((T + 1, N), np.nan)
+
+    theta, _, iterations, hessian_inv = fit(model, returns[:window], theta0)
+    total_iterations = int(iterations.sum())
+    # State at the first forecast: filter the first window with its own fit
+    sigma2 = variance_paths(model, returns[:window], to_params(model, theta), returns[:window].var(axis=0))[-1]
+
+    for start in range(window, T + 1, refit_every):
+        stop = min(start + refit_every, T)
+        if start > window:
+            theta, _, iterations, hessian_inv = fit(model, returns[start - window: start], theta, hessian_inv)
+            total_iterations += int(iterations.sum())
+        path = variance_paths(model, returns[start:stop], to_params(model, theta), sigma2)
+        forecast[start: stop + 1] = path
+        sigma2 = path[-1]
+
+    return forecast, theta, total_iterations
+
+
+def _rolling_forecast_chunk(args):
+    return rolling_forecast(*args)
+
+
+def rolling_forecast_parallel(model, returns, window=1000, refit_every=1, workers=1):
+    """
+    rolling_forecast() with the assets split across worker processes.
+    Each worker still fits its share of assets as one batch.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if workers <= 1 or returns.shape[1] < 2:
+        return rolling_forecast(model, returns, window, refit_every)
+
+    chunks = np.array_split(np.arange(returns.shape[1]), min(workers, returns.shape[1]))
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        results = list(pool.map(
+            _rolling_forecast_chunk,
+            [(model, returns[:, chunk], window, refit_every) for chunk in chunks],
+        ))
+    forecast = np.hstack([result[0] for result in results])
+    theta = np.vstack([result[1] for result in results])
+    return forecast, theta, sum(result[2] for result in results)
+
+
+def forecast_path(model, theta, sigma2_next, horizon=20):
+    """
+    Expected variance 1..horizon bars ahead, given the one-step forecast.
+    GARCH reverts geometrically to its long-run variance; for EGARCH the
+    log-variance does (the Jensen term is ignored).
+    """
+    params = to_params(model, theta)
+    steps = np.arange(horizon)[:, None]
+    if model == "garch":
+        omega, alpha, beta = params.T
+        persistence = alpha + beta
+        long_run = omega / (1 - persistence)
+        return long_run + persistence ** steps * (sigma2_next - long_run)
+    omega, _, _, beta = params.T
+    long_run = omega / (1 - beta)
+    return np.exp(long_run + beta ** steps * (np.log(sigma2_next) - long_run))
+
+
+def garch_volatility(prices, model="garch", window=1000, refit_every=21, workers=1):
+    """
+    One-step conditional volatility forecasts for price columns, on the scale
+    of the rolling std of returns (a fraction per bar), aligned to the bar
+    they forecast. prices: DataFrame of price columns.
+    """
+    log_returns = np.log(prices).diff().iloc[1:]
+    forecast, theta, _ = rolling_forecast_parallel(
+        model, log_returns.to_numpy() * RETURN_SCALE, window, refit_every, workers
+    )
+    vol = np.sqrt(forecast[:-1]) / RETURN_SCALE
+    return pd.DataFrame(vol, index=log_returns.index, columns=prices.columns).reindex(prices.index), theta
+
+
+# -----------------------------
+# Report
+# -----------------------------
+def _qlike(variance_forecast, squared_returns):
+    # Standard loss for variance forecasts against noisy r^2 (defined for r = 0)
+    return np.nanmean(np.log(variance_forecast) + squared_returns / variance_forecast)
+
+
+def analyze_garch_volatility(window=1000, refit_every=21, workers=1, horizon=20):
+    dataset = load_price_dataset()
+    query = dataset.assets(["Gold", "Silver"])
+    df = query.collect(query.log_returns(), query.ratio().log_returns())
+    dates = pd.DatetimeIndex(df["Date"])[1:]
+    names = ["Gold", "Silver", "Gold/Silver Ratio"]
+    returns = df[["Gold_LogReturn", "Silver_LogReturn", "Gold_Silver_Ratio_LogReturn"]].to_numpy()[1:]
+    scaled = returns * RETURN_SCALE
+
+    results = {}
+    for model in MODELS:
+        t0 = time.perf_counter()
+        forecast, theta, iterations = rolling_forecast_parallel(model, scaled, window, refit_every, workers)
+        results[model] = (forecast, theta, iterations, time.perf_counter() - t0)
+
+    realized = pd.DataFrame(returns, index=dates).rolling(30).std()
+    table = {"Date": dates}
+    for j, name in enumerate(names):
+        key = name.replace("/", "_").replace(" ", "_")
+        table[f"{key}_Vol_30"] = realized[j].to_numpy()
+        for model in MODELS:
+            table[f"{key}_{model.upper()}_Vol"] = np.sqrt(results[model][0][:-1, j]) / RETURN_SCALE
+    out = pd.DataFrame(table)
+
+    # -----------------------------
+    # Print Summary
+    # -----------------------------
+    scored = slice(window + 30, None)
+    squared = scaled[scored] ** 2
+    previous_30 = (realized.shift(1).to_numpy() * RETURN_SCALE) ** 2
+
+    print("\n" + "=" * 72)
+    print(f"Conditional Volatility Forecasts (refit every {refit_every} days on {window} days)")
+    print("=" * 72)
+    for model in MODELS:
+        _, _, iterations, elapsed = results[model]
+        print(f"{MODEL_LABELS[model]:<12} fitted in {elapsed:.2f}s ({iterations} BFGS iterations, warm-started)")
+    print(f"\n{'Series':<20}{'Model':<13}{'Params':<34}{'Next day':>9}{f'{horizon}d avg':>9}{'QLIKE':>8}")
+    print("-" * 93)
+    for j, name in enumerate(names):
+        for model in MODELS:
+            forecast, theta, _, _ = results[model]
+            params = to_params(model, theta[j])
+            path = forecast_path(model, theta[j: j + 1], forecast[-1, j], horizon)[:, 0]
+            shown = ", ".join(f"{p:.3f}" for p in params)
+            print(f"{name:<20}{MODEL_LABELS[model]:<13}{shown:<34}"
+                  f"{np.sqrt(forecast[-1, j]) / RETURN_SCALE * 100:8.2f}%"
+                  f"{np.sqrt(path.mean()) / RETURN_SCALE * 100:8.2f}%"
+                  f"{_qlike(forecast[:-1][scored, j], squared[:, j]):8.3f}")
+        print(f"{'':<20}{'30-day std':<13}{'':<34}{'':>9}{'':>9}"
+              f"{_qlike(previous_30[scored, j], squared[:, j]):8.3f}")
+    print("Volatility per day; QLIKE: lower is a better out-of-sample variance forecast.")
+    print("=" * 72)
+
+    output_path = OUTPUT_DATA / "garch_volatility_forecast.csv"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    out.to_csv(output_path, index=False)
+
+    # -----------------------------
+    # Chart: forecasts next to rolling volatility
+    # -----------------------------
+    fig, axes = plt.subplots(len(names), 1, figsize=(16, 12), sharex=True)
+    for ax, name in zip(axes, names):
+        key = name.replace("/", "_").replace(" ", "_")
+        ax.plot(out["Date"], out[f"{key}_Vol_30"], label="30-Day Rolling Volatility",
+                color="#FF6B35", linewidth=1.2, alpha=0.8)
+        ax.plot(out["Date"], out[f"{key}_GARCH_Vol"], label="GARCH(1,1) Forecast",
+                color="#004E89", linewidth=1)
+        ax.plot(out["Date"], out[f"{key}_EGARCH_Vol"], label="EGARCH(1,1) Forecast",
+                color="#2A9D8F", linewidth=1, alpha=0.8)
+        ax.set_title(f"{name} – Conditional vs Rolling Volatility", fontsize=13, fontweight="bold")
+        ax.set_ylabel("Volatility (Std Dev)", fontsize=11)
+        ax.legend(loc="upper left", fontsize=9, framealpha=0.95)
+        ax.grid(True, alpha=0.3, linestyle="--")
+    axes[-1].set_xlabel("Date", fontsize=11)
+    fig.tight_layout()
+
+    chart_path = OUTPUT_CHARTS / "garch_volatility_forecast.png"
+    chart_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(chart_path, dpi=300, bbox_inches="tight")
+    print(f"GARCH volatility chart saved to: {chart_path}")
+
+    plt.show()
+    plt.close(fig)
+
+    return out
+
+
+# -----------------------------
+# Benchmark: one daily refit across a synthetic universe
+# -----------------------------
+def benchmark(n_assets=500, window=1000, model="garch", workers=1, seed=0):
+    rng = np.random.default_rng(seed)
+    params = np.array([0.02, 0.06, 0.92]) if model == "garch" else np.array([0.0, 0.12, -0.04, 0.97])
+    returns = np.empty((window + 1, n_assets))
+    sigma2 = np.ones(n_assets)
+    for t in range(window + 1):
+        returns[t] = rng.standard_normal(n_assets) * np.sqrt(sigma2)
+        sigma2 = variance_paths(model, returns[t: t + 1], np.tile(params, (n_assets, 1)), sigma2)[-1]
+
+    t0 = time.perf_counter()
+    theta, _, iterations, hessian_inv = fit(model, returns[:-1])
+    cold = time.perf_counter() - t0
+
+    # Next day: one more observation, warm-started from yesterday's fit
+    t0 = time.perf_counter()
+    if workers > 1:
+        chunks = np.array_split(np.arange(n_assets), workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(fit, [model] * workers, [returns[1:, c] for c in chunks],
+                          [theta[c] for c in chunks], [hessian_inv[c] for c in chunks]))
+    else:
+        _, _, warm_iterations, _ = fit(model, returns[1:], theta, hessian_inv)
+    warm = time.perf_counter() - t0
+
+    print(f"{MODEL_LABELS[model]}: {n_assets} assets x {window} days")
+    print(f"cold fit:          {cold:.2f}s ({iterations.mean():.1f} iterations/asset)")
+    print(f"warm-started refit: {warm:.2f}s" + ("" if workers > 1 else f" ({warm_iterations.mean():.1f} iterations/asset)"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GARCH / EGARCH volatility forecasts.")
+    parser.add_argument("--bench", action="store_true", help="time a daily refit on a synthetic universe")
+    parser.add_argument("--model", choices=MODELS, default="garch")
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.assets, model=args.model, workers=args.workers)
+    else:
+        analyze_garch_volatility(workers=args.workers)
@@ -0,0 +1,216 @@
+import sys
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.analysis.strategy_backtest import build_signal_matrix, expand_grid, simulate_signal_matrix
+from src.data.price_store import load_price_dataset
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+OUTPUT_DATA = BASE_DIR / "outputs" / "data"
+OUTPUT_CHARTS = BASE_DIR / "outputs" / "charts"
+
+BARS_PER_YEAR = 252
+# Holding periods for the distribution table (trading days)
+HORIZONS = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252, "3Y": 756, "5Y": 1260}
+
+
+# -----------------------------
+# Prefix sums of log returns
+# -----------------------------
+class HoldingPeriods:
+    """
+    Holding-period returns of one or more value curves (prices or equity)
+    for any (start, end) pair.
+
+    Only the prefix sums of log returns are stored (one array per curve),
+    so each pair is answered in O(1) as exp(P[end] - P[start]) - 1, and
+    any set of pairs in one vectorized lookup. The n x n matrix is never built;
+    matrix() samples a k x k grid of it for charts.
+    """
+
+    def __init__(self, dates, curves):
+        self.dates = pd.DatetimeIndex(dates)
+        self._prefix = {}
+        for name, values in curves.items():
+            values = np.asarray(values, dtype=np.float64)
+            if len(values) != len(self.dates):
+                raise ValueError(f"{name}: {len(values)} values for {len(self.dates)} dates")
+            if not (np.isfinite(values).all() and (values > 0).all()):
+                raise ValueError(f"{name}: values must be positive and finite")
+            # P[t] = sum of log returns up to t = log(v[t] / v[0])
+            self._prefix[name] = np.log(values) - np.log(values[0])
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def names(self):
+        return list(self._prefix)
+
+    def index_of(self, dates):
+        """Row of each date: the last row on or before it."""
+        positions = self.dates.searchsorted(pd.DatetimeIndex(np.atleast_1d(dates)), side="right") - 1
+        return np.clip(positions, 0, len(self) - 1)
+
+    def log_return(self, name, start, end):
+        """
+        Log return between row indices (scalars or arrays, broadcast).
+        """
+        prefix = self._prefix[name]
+        return prefix[end] - prefix[start]
+
+    def total_return(self, name, start, end):
+        return np.expm1(self.log_return(name, start, end))
+
+    def annualized_return(self, name, start, end, bars_per_year=BARS_PER_YEAR):
+        years = (np.asarray(end) - np.asarray(start)) / bars_per_year
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(years > 0, np.expm1(self.log_return(name, start, end) / years), np.nan)
+
+    def between(self, name, start_date, end_date):
+        """Total return from the close on/before start_date to end_date."""
+        start, end = self.index_of([start_date, end_date])
+        return float(self.total_return(name, start, end))
+
+    # -----------------------------
+    # Fixed-length windows: O(n) per horizon
+    # -----------------------------
+    def window_returns(self, name, horizon):
+        """
+        Total return of every `horizon`-bar holding period, indexed by start date.
+        """
+        if horizon >= len(self):
+            return pd.Series(dtype=np.float64, name=name)
+        prefix = self._prefix[name]
+        return pd.Series(np.expm1(prefix[horizon:] - prefix[:-horizon]), index=self.dates[:-horizon], name=name)
+
+    def window_stats(self, name, horizons=HORIZONS, benchmark=None):
+        """
+        Distribution of holding-period returns per horizon. With `benchmark`,
+        also the share of windows where `name` beat it and the median excess.
+        """
+        rows = {}
+        for label, horizon in horizons.items():
+            returns = self.window_returns(name, horizon)
+            if returns.empty:
+                continue
+            row = {
+                "Windows": len(returns),
+                "Mean_%": returns.mean() * 100,
+                "Median_%": returns.median() * 100,
+                "P5_%": returns.quantile(0.05) * 100,
+                "P95_%": returns.quantile(0.95) * 100,
+                "Positive_%": (returns > 0).mean() * 100,
+            }
+            if benchmark is not None:
+                excess = returns - self.window_returns(benchmark, horizon)
+                row["Beat_Benchmark_%"] = (excess > 0).mean() * 100
+                row["Median_Excess_%"] = excess.median() * 100
+            rows[label] = row
+        return pd.DataFrame(rows).T.rename_axis("Horizon")
+
+    # -----------------------------
+    # Downsampled matrix for heatmaps
+    # -----------------------------
+    def grid(self, points=200):
+        """Row indices of a k-point grid over the dates (k <= points)."""
+        return np.unique(np.linspace(0, len(self) - 1, min(points, len(self))).round().astype(np.int64))
+
+    def matrix(self, name, points=200, annualized=True, benchmark=None):
+        """
+        k x k sample of the start x end matrix (rows: start, columns: end),
+        NaN where end <= start. With `benchmark`, the difference to it.
+        """
+        idx = self.grid(points)
+        start, end = idx[:, None], idx[None, :]
+        compute = self.annualized_return if annualized else self.total_return
+        values = compute(name, start, end)
+        if benchmark is not None:
+            values = values - compute(benchmark, start, end)
+        values = np.where(end > start, values, np.nan)
+        return pd.DataFrame(values, index=self.dates[idx], columns=self.dates[idx])
+
+
+# -----------------------------
+# Report: buy & hold vs Bollinger strategy
+# -----------------------------
+def analyze_holding_periods(asset="Gold", points=200):
+    dataset = load_price_dataset()
+    prices = np.asarray(dataset.column(f"{asset}_Close"), dtype=np.float64)
+
+    # Bollinger (20, 2) strategy equity, same rules as bollinger_backtest.py
+    variants = expand_grid({"bollinger": {"window": [20], "k": [2.0]}})
+    equity, _ = simulate_signal_matrix(prices, build_signal_matrix(prices, variants))
+
+    periods = HoldingPeriods(dataset.dates, {"Buy & Hold": prices, "Strategy": equity[:, 0]})
+    stats = {
+        name: periods.window_stats(name, benchmark="Buy & Hold" if name == "Strategy" else None)
+        for name in periods.names
+    }
+
+    # -----------------------------
+    # Print Summary
+    # -----------------------------
+    print("\n" + "=" * 72)
+    print(f"{asset} – Holding-Period Returns, every start/end pair ({len(periods)} days)")
+    print("=" * 72)
+    for name, table in stats.items():
+        print(f"\n{name}")
+        print(table.round(2).to_string())
+    one_year = stats["Strategy"].loc["1Y"] if "1Y" in stats["Strategy"].index else None
+    if one_year is not None:
+        print(f"\nStrategy beat buy & hold in {one_year['Beat_Benchmark_%']:.1f}% "
+              f"of {int(one_year['Windows'])} one-year windows")
+    print("Note: Results are illustrative, not financial advice.")
+    print("=" * 72)
+
+    output_path = OUTPUT_DATA / f"{asset.lower()}_holding_period_stats.csv"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    pd.concat(stats, names=["Curve"]).to_csv(output_path)
+
+    # -----------------------------
+    # Heatmaps (downsampled start x end grid)
+    # -----------------------------
+    panels = [
+        ("Buy & Hold", None, "Buy & Hold – Annualized Return", "RdYlGn"),
+        ("Strategy", "Buy & Hold", "Strategy minus Buy & Hold – Annualized", "RdBu"),
+    ]
+    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+    for ax, (name, benchmark, title, cmap) in zip(axes, panels):
+        matrix = periods.matrix(name, points, benchmark=benchmark) * 100
+        limit = np.nanpercentile(np.abs(matrix.to_numpy()), 98)
+        image = ax.imshow(
+            matrix.to_numpy(), origin="lower", cmap=cmap, vmin=-limit, vmax=limit, aspect="auto",
+            extent=[*map(pd.Timestamp.toordinal, matrix.columns[[0, -1]]),
+                    *map(pd.Timestamp.toordinal, matrix.index[[0, -1]])],
+        )
+        ticks = pd.date_range(matrix.index[0], matrix.index[-1], freq="2YS")
+        ax.set_xticks([t.toordinal() for t in ticks], [t.year for t in ticks])
+        ax.set_yticks([t.toordinal() for t in ticks], [t.year for t in ticks])
+        ax.set_title(f"{asset} {title}", fontsize=12, fontweight="bold")
+        ax.set_xlabel("End Date")
+        ax.set_ylabel("Start Date")
+        fig.colorbar(image, ax=ax, label="% per year")
+    fig.tight_layout()
+
+    chart_path = OUTPUT_CHARTS / f"{asset.lower()}_holding_period_heatmap.png"
+    chart_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(chart_path, dpi=300, bbox_inches="tight")
+    print(f"Holding-period heatmap saved to: {chart_path}")
+
+    plt.show()
+    plt.close(fig)
+
+    return periods, stats
+
+
+if __name__ == "__main__":
+    for asset in ("Gold", "Silver"):
+        analyze_holding_periods(asset)
@@ -1,14 +1,21 @@
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.resample import TIMEFRAME_ADJECTIVES, load_prices, timeframe_suffix
+
 # Project paths
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_PROCESSED = BASE_DIR / "data" / "processed"
 
-def analyze_returns_and_volatility():
-    df = pd.read_csv(DATA_PROCESSED / "gold_silver_cleaned.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
+def analyze_returns_and_volatility(timeframe="D"):
+    df = load_prices(timeframe)
+    period = TIMEFRAME_ADJECTIVES[timeframe]
 
     # Calculate daily returns
     df["Gold_Return"] = df["Gold_Close"].pct_change()
@@ -21,8 +28,8 @@ def analyze_returns_and_volatility():
     gold_volatility = df["Gold_Return"].std()
     silver_volatility = df["Silver_Return"].std()
 
-    print("Gold Volatility (Daily):", round(gold_volatility, 4))
-    print("Silver Volatility (Daily):", round(silver_volatility, 4))
+    print(f"Gold Volatility ({period}):", round(gold_volatility, 4))
+    print(f"Silver Volatility ({period}):", round(silver_volatility, 4))
 
     # Create separate subplots stacked vertically
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
@@ -36,8 +43,8 @@ def analyze_returns_and_volatility():
         alpha=0.8
     )
     ax1.axhline(y=0, color='black', linestyle='-', linewidth=0.5, alpha=0.3)
-    ax1.set_ylabel("Daily Return", fontsize=11)
-    ax1.set_title("Gold Daily Returns (Lower Volatility)", fontsize=12, fontweight='bold')
+    ax1.set_ylabel(f"{period} Return", fontsize=11)
+    ax1.set_title(f"Gold {period} Returns (Lower Volatility)", fontsize=12, fontweight='bold')
     ax1.grid(True, alpha=0.3, linestyle='--')
     ax1.text(
         0.02, 0.95,
@@ -58,8 +65,8 @@ def analyze_returns_and_volatility():
     )
     ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5, alpha=0.3)
     ax2.set_xlabel("Date", fontsize=11)
-    ax2.set_ylabel("Daily Return", fontsize=11)
-    ax2.set_title("Silver Daily Returns (Higher Volatility)", fontsize=12, fontweight='bold')
+    ax2.set_ylabel(f"{period} Return", fontsize=11)
+    ax2.set_title(f"Silver {period} Returns (Higher Volatility)", fontsize=12, fontweight='bold')
     ax2.grid(True, alpha=0.3, linestyle='--')
     ax2.text(
         0.02, 0.95,
@@ -71,12 +78,12 @@ def analyze_returns_and_volatility():
     )
 
     # Overall title
-    fig.suptitle("Daily Returns & Volatility: Gold vs Silver", 
+    fig.suptitle(f"{period} Returns & Volatility: Gold vs Silver", 
                  fontsize=14, fontweight='bold', y=0.995)
 
     fig.tight_layout()
 
-    output_path = BASE_DIR / "outputs" / "charts" / "daily_returns_gold_silver.png"
+    output_path = BASE_DIR / "outputs" / "charts" / f"daily_returns_gold_silver{timeframe_suffix(timeframe)}.png"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(output_path, dpi=300, bbox_inches='tight')
 
@@ -1,14 +1,21 @@
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.resample import TIMEFRAME_ADJECTIVES, load_prices, timeframe_suffix
+
 # Project paths
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_PROCESSED = BASE_DIR / "data" / "processed"
 
-def analyze_returns_and_volatility_combined():
-    df = pd.read_csv(DATA_PROCESSED / "gold_silver_cleaned.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
+def analyze_returns_and_volatility_combined(timeframe="D"):
+    df = load_prices(timeframe)
+    period = TIMEFRAME_ADJECTIVES[timeframe]
 
     # Calculate daily returns
     df["Gold_Return"] = df["Gold_Close"].pct_change()
@@ -21,8 +28,8 @@ def analyze_returns_and_volatility_combined():
     gold_volatility = df["Gold_Return"].std()
     silver_volatility = df["Silver_Return"].std()
 
-    print("Gold Volatility (Daily):", round(gold_volatility, 4))
-    print("Silver Volatility (Daily):", round(silver_volatility, 4))
+    print(f"Gold Volatility ({period}):", round(gold_volatility, 4))
+    print(f"Silver Volatility ({period}):", round(silver_volatility, 4))
 
     # Create combined plot with contrasting colors
     fig, ax = plt.subplots(figsize=(14, 7))
@@ -31,7 +38,7 @@ def analyze_returns_and_volatility_combined():
     ax.plot(
         df["Date"],
         df["Gold_Return"],
-        label=f"Gold Daily Returns (σ={gold_volatility:.4f})",
+        label=f"Gold {period} Returns (σ={gold_volatility:.4f})",
         color="#FF8C00",  # Dark orange
         linewidth=0.9,
         alpha=0.9
@@ -40,7 +47,7 @@ def analyze_returns_and_volatility_combined():
     ax.plot(
         df["Date"],
         df["Silver_Return"],
-        label=f"Silver Daily Returns (σ={silver_volatility:.4f})",
+        label=f"Silver {period} Returns (σ={silver_volatility:.4f})",
         color="#4169E1",  # Royal blue
         linewidth=0.9,
         alpha=0.7
@@ -50,10 +57,10 @@ def analyze_returns_and_volatility_combined():
     ax.axhline(y=0, color='black', linestyle='-', linewidth=0.8, alpha=0.4)
 
     # Styling
-    ax.set_title("Daily Returns & Volatility: Gold vs Silver (Combined)", 
+    ax.set_title(f"{period} Returns & Volatility: Gold vs Silver (Combined)", 
                  fontsize=14, fontweight='bold', pad=20)
     ax.set_xlabel("Date", fontsize=11)
-    ax.set_ylabel("Daily Return", fontsize=11)
+    ax.set_ylabel(f"{period} Return", fontsize=11)
     ax.grid(True, alpha=0.3, linestyle='--')
     ax.legend(loc='upper left', fontsize=10, framealpha=0.9)
 
@@ -73,7 +80,7 @@ def analyze_returns_and_volatility_combined():
 
     fig.tight_layout()
 
-    output_path = BASE_DIR / "outputs" / "charts" / "daily_returns_gold_silver_combine.png"
+    output_path = BASE_DIR / "outputs" / "charts" / f"daily_returns_gold_silver_combine{timeframe_suffix(timeframe)}.png"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(output_path, dpi=300, bbox_inches='tight')
 
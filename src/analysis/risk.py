@@ -0,0 +1,244 @@
+import bisect
+import sys
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+from statistics import NormalDist
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.analysis.strategy_backtest import build_signal_matrix, expand_grid, simulate_signal_matrix
+from src.data.price_store import load_price_dataset
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+OUTPUT_CHARTS = BASE_DIR / "outputs" / "charts"
+
+DEFAULT_LEVELS = (0.95, 0.99)
+DEFAULT_WINDOWS = (250,)
+
+
+# -----------------------------
+# Incremental sorted window
+# -----------------------------
+class SortedWindow:
+    """
+    Fixed-size window kept in sorted order.
+    Each push is a binary search plus one insert/remove, instead of
+    re-sorting the whole window for every step.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._values = []
+        self._fifo = []
+        self._head = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def full(self):
+        return len(self._values) == self.size
+
+    def push(self, value):
+        if self.full:
+            oldest = self._fifo[self._head]
+            self._head += 1
+            del self._values[bisect.bisect_left(self._values, oldest)]
+            # Compact the FIFO now and then so it does not grow without bound
+            if self._head > self.size:
+                self._fifo = self._fifo[self._head:]
+                self._head = 0
+        self._fifo.append(value)
+        bisect.insort(self._values, value)
+
+    def quantile(self, q):
+        # Same as numpy/pandas "linear" interpolation
+        pos = q * (len(self._values) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(self._values) - 1)
+        return self._values[lo] + (self._values[hi] - self._values[lo]) * (pos - lo)
+
+    def tail_mean(self, q):
+        # Mean of the worst ceil(q * n) observations
+        k = max(1, int(np.ceil(q * len(self._values))))
+        return sum(self._values[:k]) / k
+
+
+def _tail_name(level, window):
+    return f"{int(round(level * 100))}_{window}"
+
+
+def rolling_historical_var_es(returns, windows=DEFAULT_WINDOWS, levels=DEFAULT_LEVELS):
+    """
+    Rolling historical VaR and Expected Shortfall (CVaR), reported as positive losses.
+
+    returns: Series of periodic returns (NaNs are skipped)
+    Returns a DataFrame with VaR_<level>_<window> and ES_<level>_<window> columns.
+    """
+    returns = pd.Series(returns)
+    clean = returns.dropna()
+    values = clean.to_numpy(dtype=np.float64)
+    out = {}
+
+    for window in windows:
+        sorted_window = SortedWindow(window)
+        var = np.full((len(values), len(levels)), np.nan)
+        es = np.full((len(values), len(levels)), np.nan)
+
+        for i, value in enumerate(values):
+            sorted_window.push(value)
+            if sorted_window.full:
+                for j, level in enumerate(levels):
+                    var[i, j] = 0.0 - sorted_window.quantile(1 - level)
+                    es[i, j] = 0.0 - sorted_window.tail_mean(1 - level)
+
+        for j, level in enumerate(levels):
+            out[f"VaR_{_tail_name(level, window)}"] = var[:, j]
+            out[f"ES_{_tail_name(level, window)}"] = es[:, j]
+
+    return pd.DataFrame(out, index=clean.index).reindex(returns.index)
+
+
+# -----------------------------
+# Parametric / Cornish-Fisher
+# -----------------------------
+def _cornish_fisher_z(z, skew, kurt):
+    return (
+        z
+        + (z ** 2 - 1) * skew / 6
+        + (z ** 3 - 3 * z) * kurt / 24
+        - (2 * z ** 3 - 5 * z) * skew ** 2 / 36
+    )
+
+
+def rolling_parametric_var_es(returns, windows=DEFAULT_WINDOWS, levels=DEFAULT_LEVELS,
+                              cornish_fisher=True, tail_points=50):
+    """
+    Parametric VaR/ES from rolling moments (mean, std, skew, excess kurtosis).
+    With cornish_fisher=True the normal quantile is adjusted for skew and kurtosis,
+    and ES is the average adjusted quantile over the tail.
+    """
+    returns = pd.Series(returns)
+    norm = NormalDist()
+    out = {}
+
+    for window in windows:
+        rolling = returns.rolling(window)
+        mean = rolling.mean().to_numpy()
+        std = rolling.std().to_numpy()
+        skew = rolling.skew().to_numpy() if cornish_fisher else np.zeros(len(returns))
+        kurt = rolling.kurt().to_numpy() if cornish_fisher else np.zeros(len(returns))
+
+        for level in levels:
+            tail = 1 - level
+            z = norm.inv_cdf(tail)
+            var = -(mean + std * _cornish_fisher_z(z, skew, kurt))
+
+            # ES: average quantile over evenly spaced tail probabilities
+            u = (np.arange(tail_points) + 0.5) / tail_points * tail
+            z_tail = np.array([norm.inv_cdf(p) for p in u])
+            zq = _cornish_fisher_z(z_tail[None, :], skew[:, None], kurt[:, None])
+            es = -(mean + std * zq.mean(axis=1))
+
+            prefix = "CF" if cornish_fisher else "Normal"
+            out[f"{prefix}_VaR_{_tail_name(level, window)}"] = var
+            out[f"{prefix}_ES_{_tail_name(level, window)}"] = es
+
+    return pd.DataFrame(out, index=returns.index)
+
+
+def equity_var_es(equity, windows=DEFAULT_WINDOWS, levels=DEFAULT_LEVELS, held=None):
+    """
+    Historical VaR/ES of a backtest equity curve (in return terms).
+    held: optional boolean per bar, True where a position was held over the
+    bar. Flat bars are skipped, so the windows hold in-position returns only
+    (a strategy that sat flat would otherwise report zero risk).
+    """
+    returns = pd.Series(equity).pct_change()
+    if held is not None:
+        returns = returns.where(np.asarray(held, dtype=bool))
+    return rolling_historical_var_es(returns, windows, levels)
+
+
+# -----------------------------
+# Report
+# -----------------------------
+def analyze_rolling_var(windows=(250,), levels=DEFAULT_LEVELS):
+    dataset = load_price_dataset()
+    dates = pd.DatetimeIndex(dataset.dates)
+
+    assets = {}
+    for asset in ("Gold", "Silver"):
+        prices = pd.Series(np.asarray(dataset.column(f"{asset}_Close")), index=dates)
+        returns = prices.pct_change()
+        assets[asset] = pd.concat(
+            [rolling_historical_var_es(returns, windows, levels),
+             rolling_parametric_var_es(returns, windows, levels)],
+            axis=1
+        )
+
+    # Bollinger (20, 2) strategy equity, same rules as bollinger_backtest.py
+    gold = np.asarray(dataset.column("Gold_Close"), dtype=np.float64)
+    variants = expand_grid({"bollinger": {"window": [20], "k": [2.0]}})
+    equity, positions = simulate_signal_matrix(gold, build_signal_matrix(gold, variants))
+    # Position held over each bar (entered at the previous close)
+    held = np.zeros(len(gold), dtype=bool)
+    held[1:] = positions[:-1, 0] > 0
+    strategy = equity_var_es(pd.Series(equity[:, 0], index=dates), windows, levels, held=held)
+
+    window = windows[0]
+    exposure = held[-window:].mean() * 100
+    print("\n" + "=" * 60)
+    print(f"Rolling Value-at-Risk / Expected Shortfall ({window}-day, daily, % loss)")
+    print("=" * 60)
+    for level in levels:
+        name = _tail_name(level, window)
+        for label, df in [*assets.items(), ("Gold Bollinger strategy", strategy)]:
+            if df is strategy and not exposure:
+                print(f"{label:<24} {int(level * 100)}%  flat for the last {window} days: no position at risk")
+                continue
+            latest = df.dropna().iloc[-1]
+            line = f"{label:<24} {int(level * 100)}%  VaR {latest[f'VaR_{name}'] * 100:5.2f}%  ES {latest[f'ES_{name}'] * 100:5.2f}%"
+            if f"CF_VaR_{name}" in df:
+                line += f"  CF-VaR {latest[f'CF_VaR_{name}'] * 100:5.2f}%"
+            if df is strategy:
+                line += f"  (in-position days only; exposure {exposure:.0f}% of last {window})"
+            print(line)
+    print("=" * 60)
+
+    fig, axes = plt.subplots(2, 1, figsize=(14, 9), sharex=True)
+    for ax, (asset, df) in zip(axes, assets.items()):
+        for level, color in zip(levels, ("#FF6B35", "#004E89")):
+            name = _tail_name(level, window)
+            ax.plot(df.index, df[f"VaR_{name}"], color=color, linewidth=1.2,
+                    label=f"Historical VaR {int(level * 100)}%")
+            ax.plot(df.index, df[f"ES_{name}"], color=color, linewidth=1, linestyle="--",
+                    label=f"Expected Shortfall {int(level * 100)}%")
+            ax.plot(df.index, df[f"CF_VaR_{name}"], color=color, linewidth=0.8, linestyle=":",
+                    label=f"Cornish-Fisher VaR {int(level * 100)}%")
+        ax.set_title(f"{asset} Rolling {window}-Day VaR / ES", fontsize=13, fontweight="bold")
+        ax.set_ylabel("Daily Loss", fontsize=11)
+        ax.legend(loc="upper left", fontsize=8, framealpha=0.95)
+        ax.grid(True, alpha=0.3, linestyle="--")
+    axes[-1].set_xlabel("Date", fontsize=11)
+
+    fig.tight_layout()
+
+    output_path = OUTPUT_CHARTS / "rolling_var_gold_silver.png"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output_path, dpi=300, bbox_inches="tight")
+    print(f"Rolling VaR chart saved to: {output_path}")
+
+    plt.show()
+    plt.close(fig)
+
+    return assets, strategy
+
+
+if __name__ == "__main__":
+    analyze_rolling_var()
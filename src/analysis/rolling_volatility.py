@@ -1,13 +1,31 @@
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.resample import TIMEFRAME_LABELS, load_prices, timeframe_suffix
+
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_PROCESSED = BASE_DIR / "data" / "processed"
 
-def analyze_rolling_volatility_improved():
-    df = pd.read_csv(DATA_PROCESSED / "gold_silver_cleaned.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
+# GARCH overlay: rolling fit window, and the smallest window worth fitting
+GARCH_WINDOW = 1000
+GARCH_MIN_WINDOW = 500
+
+def analyze_rolling_volatility_improved(timeframe="D", forecast=False):
+    df = load_prices(timeframe)
+    bar = TIMEFRAME_LABELS[timeframe]
+
+    # GARCH is only fitted on daily bars with enough history for a stable fit
+    garch_window = min(GARCH_WINDOW, len(df) // 2)
+    if forecast and (timeframe != "D" or garch_window < GARCH_MIN_WINDOW):
+        print(f"Skipping GARCH forecast: needs daily bars and a {GARCH_MIN_WINDOW}-bar fit window "
+              f"(timeframe {timeframe}, {len(df)} bars)")
+        forecast = False
 
     # Calculate daily returns
     df["Gold_Return"] = df["Gold_Close"].pct_change()
@@ -19,14 +37,26 @@ def analyze_rolling_volatility_improved():
     df["Silver_Vol_30"] = df["Silver_Return"].rolling(window=30).std()
     df["Silver_Vol_90"] = df["Silver_Return"].rolling(window=90).std()
 
+    # Out-of-sample GARCH(1,1) forecasts (see garch.py), refitted monthly on
+    # a rolling window of up to GARCH_WINDOW bars
+    if forecast:
+        from src.analysis.garch import garch_volatility
+
+        garch, _ = garch_volatility(df[["Gold_Close", "Silver_Close"]], window=garch_window)
+        df["Gold_GARCH_Vol"] = garch["Gold_Close"]
+        df["Silver_GARCH_Vol"] = garch["Silver_Close"]
+
     # Create improved subplots
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 10), sharex=True)
 
     # Gold subplot - Better colors
     ax1.plot(df["Date"], df["Gold_Vol_30"], 
-             label="30-Day Volatility", color="#FF6B35", linewidth=1.2, alpha=0.8)
+             label=f"30-{bar} Volatility", color="#FF6B35", linewidth=1.2, alpha=0.8)
     ax1.plot(df["Date"], df["Gold_Vol_90"], 
-             label="90-Day Volatility", color="#004E89", linewidth=1.5, alpha=0.9)
+             label=f"90-{bar} Volatility", color="#004E89", linewidth=1.5, alpha=0.9)
+    if forecast:
+        ax1.plot(df["Date"], df["Gold_GARCH_Vol"],
+                 label="GARCH(1,1) Forecast", color="#2A9D8F", linewidth=1, alpha=0.8)
     
     ax1.set_ylabel("Volatility (Std Dev)", fontsize=12, fontweight='bold')
     ax1.set_title("Gold Rolling Volatility", fontsize=13, fontweight='bold', pad=10)
@@ -35,16 +65,19 @@ def analyze_rolling_volatility_improved():
     
     # Add interpretation box
     ax1.text(0.98, 0.97, 
-             "30-Day: Quick reactions to market changes\n90-Day: Smoothed long-term trend",
+             f"30-{bar}: Quick reactions to market changes\n90-{bar}: Smoothed long-term trend",
              transform=ax1.transAxes, fontsize=9,
              verticalalignment='top', horizontalalignment='right',
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
 
     # Silver subplot - Same color scheme
     ax2.plot(df["Date"], df["Silver_Vol_30"], 
-             label="30-Day Volatility", color="#FF6B35", linewidth=1.2, alpha=0.8)
+             label=f"30-{bar} Volatility", color="#FF6B35", linewidth=1.2, alpha=0.8)
     ax2.plot(df["Date"], df["Silver_Vol_90"], 
-             label="90-Day Volatility", color="#004E89", linewidth=1.5, alpha=0.9)
+             label=f"90-{bar} Volatility", color="#004E89", linewidth=1.5, alpha=0.9)
+    if forecast:
+        ax2.plot(df["Date"], df["Silver_GARCH_Vol"],
+                 label="GARCH(1,1) Forecast", color="#2A9D8F", linewidth=1, alpha=0.8)
     
     ax2.set_xlabel("Date", fontsize=12, fontweight='bold')
     ax2.set_ylabel("Volatility (Std Dev)", fontsize=12, fontweight='bold')
@@ -60,12 +93,12 @@ def analyze_rolling_volatility_improved():
              bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.7))
 
     # Overall title
-    fig.suptitle("Rolling Volatility Comparison (30-Day vs 90-Day)", 
+    fig.suptitle(f"Rolling Volatility Comparison (30-{bar} vs 90-{bar})", 
                  fontsize=15, fontweight='bold', y=0.995)
 
     fig.tight_layout()
 
-    output_path = BASE_DIR / "outputs" / "charts" / "rolling_volatility_comparison.png"
+    output_path = BASE_DIR / "outputs" / "charts" / f"rolling_volatility_comparison{timeframe_suffix(timeframe)}.png"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(output_path, dpi=300, bbox_inches='tight')
 
@@ -73,11 +106,14 @@ def analyze_rolling_volatility_improved():
     
     # Print summary statistics
     print("\n=== Volatility Summary ===")
-    print(f"Gold 30-Day Average: {df['Gold_Vol_30'].mean():.4f}")
-    print(f"Gold 90-Day Average: {df['Gold_Vol_90'].mean():.4f}")
-    print(f"Silver 30-Day Average: {df['Silver_Vol_30'].mean():.4f}")
-    print(f"Silver 90-Day Average: {df['Silver_Vol_90'].mean():.4f}")
+    print(f"Gold 30-{bar} Average: {df['Gold_Vol_30'].mean():.4f}")
+    print(f"Gold 90-{bar} Average: {df['Gold_Vol_90'].mean():.4f}")
+    print(f"Silver 30-{bar} Average: {df['Silver_Vol_30'].mean():.4f}")
+    print(f"Silver 90-{bar} Average: {df['Silver_Vol_90'].mean():.4f}")
     print(f"\nSilver/Gold Volatility Ratio: {df['Silver_Vol_30'].mean() / df['Gold_Vol_30'].mean():.2f}x")
+    if forecast:
+        print(f"Gold GARCH Forecast (latest {bar}): {df['Gold_GARCH_Vol'].iloc[-1]:.4f}")
+        print(f"Silver GARCH Forecast (latest {bar}): {df['Silver_GARCH_Vol'].iloc[-1]:.4f}")
 
     plt.show()
     plt.close(fig)
@@ -0,0 +1,307 @@
+import itertools
+import sys
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.resample import load_prices, timeframe_suffix
+from src.data.versioning import data_versions, format_versions, record_run
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+OUTPUT_DATA = BASE_DIR / "outputs" / "data"
+OUTPUT_CHARTS = BASE_DIR / "outputs" / "charts"
+
+
+# -----------------------------
+# Shared indicator arrays
+# -----------------------------
+class Indicators:
+    """
+    Memoized indicator arrays for one price series.
+    Every strategy variant asking for e.g. the 20-day mean gets the same array,
+    so a grid of variants only pays for each distinct window once.
+    """
+
+    def __init__(self, prices):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self._series = pd.Series(self.prices, copy=False)
+        self._cache = {}
+
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def prev(self, values):
+        out = np.empty_like(values)
+        out[:1] = np.nan
+        out[1:] = values[:-1]
+        return out
+
+    def mean(self, window):
+        return self._memo(("mean", window), lambda: self._series.rolling(window).mean().to_numpy())
+
+    def std(self, window):
+        return self._memo(("std", window), lambda: self._series.rolling(window).std().to_numpy())
+
+    def rolling_max(self, window):
+        return self._memo(("max", window), lambda: self._series.rolling(window).max().to_numpy())
+
+    def rolling_min(self, window):
+        return self._memo(("min", window), lambda: self._series.rolling(window).min().to_numpy())
+
+    def momentum(self, lookback):
+        return self._memo(("mom", lookback), lambda: self._series.pct_change(lookback).to_numpy())
+
+    def rsi(self, period):
+        def compute():
+            delta = self._series.diff()
+            gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+            loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+            return (100 - 100 / (1 + gain / loss)).to_numpy()
+        return self._memo(("rsi", period), compute)
+
+
+# -----------------------------
+# Strategy library
+# -----------------------------
+# Each strategy returns (entry, exit) boolean arrays. Signals are evaluated on
+# the close of the bar and filled at that close, same as the Bollinger backtest.
+def crossed_below(ind, values, level):
+    return (values <= level) & (ind.prev(values) > ind.prev(level))
+
+
+def crossed_above(ind, values, level):
+    return (values >= level) & (ind.prev(values) < ind.prev(level))
+
+
+def bollinger_signals(ind, window=20, k=2.0):
+    upper = ind.mean(window) + k * ind.std(window)
+    lower = ind.mean(window) - k * ind.std(window)
+    return crossed_below(ind, ind.prices, lower), crossed_above(ind, ind.prices, upper)
+
+
+def ma_crossover_signals(ind, fast=20, slow=50):
+    fast_ma, slow_ma = ind.mean(fast), ind.mean(slow)
+    return crossed_above(ind, fast_ma, slow_ma), crossed_below(ind, fast_ma, slow_ma)
+
+
+def rsi_signals(ind, period=14, lower=30, upper=70):
+    rsi = ind.rsi(period)
+    return crossed_below(ind, rsi, np.full_like(rsi, lower)), crossed_above(ind, rsi, np.full_like(rsi, upper))
+
+
+def momentum_signals(ind, lookback=60):
+    mom = ind.momentum(lookback)
+    zero = np.zeros_like(mom)
+    return crossed_above(ind, mom, zero), crossed_below(ind, mom, zero)
+
+
+def breakout_signals(ind, window=55, exit_window=20):
+    # Compare against the previous bar's channel so today's close can break it
+    upper = ind.prev(ind.rolling_max(window))
+    lower = ind.prev(ind.rolling_min(exit_window))
+    return ind.prices > upper, ind.prices < lower
+
+
+STRATEGIES = {
+    "bollinger": bollinger_signals,
+    "ma_crossover": ma_crossover_signals,
+    "rsi": rsi_signals,
+    "momentum": momentum_signals,
+    "breakout": breakout_signals,
+}
+
+# Bars a strategy needs before its indicators are all defined: its first
+# usable bar. Buy & hold is measured from there, as in the Bollinger backtest
+# (which drops the band warm-up before trading).
+WARMUP = {
+    "bollinger": lambda window=20, k=2.0: window - 1,
+    "ma_crossover": lambda fast=20, slow=50: max(fast, slow) - 1,
+    "rsi": lambda period=14, lower=30, upper=70: 1,
+    "momentum": lambda lookback=60: lookback,
+    "breakout": lambda window=55, exit_window=20: max(window, exit_window),
+}
+
+DEFAULT_GRID = {
+    "bollinger": {"window": [10, 20, 30, 50], "k": [1.5, 2.0, 2.5]},
+    "ma_crossover": {"fast": [5, 10, 20, 30], "slow": [50, 100, 200]},
+    "rsi": {"period": [7, 14, 21], "lower": [20, 30], "upper": [70, 80]},
+    "momentum": {"lookback": [20, 60, 120, 250]},
+    "breakout": {"window": [20, 55, 100], "exit_window": [10, 20]},
+}
+
+
+def expand_grid(grid=DEFAULT_GRID):
+    """
+    Turn {"strategy": {"param": [values]}} into a list of (label, strategy, params).
+    """
+    variants = []
+    for name, params in grid.items():
+        keys = list(params)
+        for values in itertools.product(*(params[k] for k in keys)):
+            kwargs = dict(zip(keys, values))
+            label = name + "(" + ", ".join(f"{k}={v}" for k, v in kwargs.items()) + ")"
+            variants.append((label, name, kwargs))
+    return variants
+
+
+def warmup_bars(variants):
+    return np.array([WARMUP[name](**kwargs) for _, name, kwargs in variants])
+
+
+def build_signal_matrix(prices, variants):
+    """
+    Evaluate every variant on shared indicators.
+    Returns a time x strategy float matrix: 1 = enter long, 0 = exit, NaN = no change.
+    """
+    ind = Indicators(prices)
+    signals = np.full((len(ind.prices), len(variants)), np.nan)
+    for j, (_, name, kwargs) in enumerate(variants):
+        entry, exit_ = STRATEGIES[name](ind, **kwargs)
+        signals[exit_, j] = 0.0
+        signals[entry, j] = 1.0
+    return signals
+
+
+def ffill_columns(matrix, fill=0.0):
+    """Forward-fill NaNs down each column (vectorized)."""
+    valid = ~np.isnan(matrix)
+    idx = np.where(valid, np.arange(len(matrix))[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    out = matrix[idx, np.arange(matrix.shape[1])]
+    out[~np.maximum.accumulate(valid, axis=0)] = fill
+    return out
+
+
+# -----------------------------
+# Vectorized simulation
+# -----------------------------
+def simulate_signal_matrix(prices, signals, initial_capital=100_000, transaction_cost=0.001):
+    """
+    One pass over the whole matrix. All-in/all-out sizing at the signal close,
+    `transaction_cost` charged on every buy and sell.
+    Returns (equity matrix, positions matrix).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    positions = ffill_columns(signals)
+
+    log_ret = np.zeros(len(prices))
+    log_ret[1:] = np.log(prices[1:] / prices[:-1])
+
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    trades = np.abs(np.diff(positions, axis=0, prepend=0.0))
+
+    log_equity = held * log_ret[:, None] + trades * np.log1p(-transaction_cost)
+    equity = initial_capital * np.exp(np.cumsum(log_equity, axis=0))
+    return equity, positions
+
+
+def strategy_metrics(prices, equity, positions, labels, initial_capital=100_000, start=0):
+    """
+    One row of metrics per column. `start` is the first usable bar of each
+    variant (scalar or per column, see warmup_bars); buy & hold is measured
+    from it.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    start = np.minimum(start, len(prices) - 1)
+
+    peak = np.maximum.accumulate(equity, axis=0)
+    max_dd = ((equity - peak) / peak).min(axis=0) * 100
+
+    # Per-trade PnL (price to price, like the Bollinger backtest)
+    change = np.diff(positions, axis=0, prepend=0.0)
+    entry_price = ffill_columns(np.where(change > 0, prices[:, None], np.nan), fill=np.nan)
+    exits = change < 0
+    pnl = np.where(exits, (prices[:, None] / entry_price - 1) * 100, np.nan)
+    n_trades = exits.sum(axis=0)
+
+    with np.errstate(invalid="ignore"):
+        win_rate = np.where(n_trades > 0, (pnl > 0).sum(axis=0) / np.maximum(n_trades, 1) * 100, 0.0)
+        avg_trade = np.where(n_trades > 0, np.nansum(pnl, axis=0) / np.maximum(n_trades, 1), 0.0)
+
+    return pd.DataFrame({
+        "Strategy": labels,
+        "Total_Return_%": (equity[-1] / initial_capital - 1) * 100,
+        "Buy_Hold_Return_%": (prices[-1] / prices[start] - 1) * 100,
+        "Max_Drawdown_%": max_dd,
+        "Trades": n_trades,
+        "Win_Rate_%": win_rate,
+        "Avg_Trade_%": avg_trade,
+        "Exposure_%": positions.mean(axis=0) * 100,
+    }).set_index("Strategy")
+
+
+def run_batch_backtest(asset="Gold", grid=DEFAULT_GRID, initial_capital=100_000,
+                       transaction_cost=0.001, top_n=5, timeframe="D"):
+    df = load_prices(timeframe)
+    versions = data_versions(("cleaned",))
+    price_col = "Gold_Close" if asset == "Gold" else "Silver_Close"
+    prices = df[price_col].to_numpy(dtype=np.float64)
+    dates = df["Date"]
+
+    variants = expand_grid(grid)
+    labels = [label for label, _, _ in variants]
+
+    signals = build_signal_matrix(prices, variants)
+    equity, positions = simulate_signal_matrix(prices, signals, initial_capital, transaction_cost)
+    metrics = strategy_metrics(prices, equity, positions, labels, initial_capital, warmup_bars(variants))
+    metrics = metrics.sort_values("Total_Return_%", ascending=False)
+
+    # -----------------------------
+    # Print Summary
+    # -----------------------------
+    print("\n" + "=" * 60)
+    print(f"{asset} – Multi-Strategy Backtest ({len(variants)} variants)")
+    print("=" * 60)
+    print(metrics.head(top_n).round(2).to_string())
+    buy_hold = metrics["Buy_Hold_Return_%"]
+    print(f"\nBuy & Hold Return:      {buy_hold.min():.2f}% to {buy_hold.max():.2f}% (from each variant's warm-up)")
+    print(f"Variants beating B&H:   {(metrics['Total_Return_%'] > metrics['Buy_Hold_Return_%']).sum()}")
+    print(f"Data Version:           {format_versions(versions)}")
+    print("Note: Results are illustrative, not financial advice.")
+    print("=" * 60)
+
+    output_path = OUTPUT_DATA / f"{asset.lower()}_strategy_comparison{timeframe_suffix(timeframe)}.csv"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    metrics.to_csv(output_path)
+    record_run(output_path, versions, asset=asset, timeframe=timeframe, variants=len(variants),
+               initial_capital=initial_capital, transaction_cost=transaction_cost)
+
+    # -----------------------------
+    # Equity Curve Plot (top variants)
+    # -----------------------------
+    fig, ax = plt.subplots(figsize=(12, 5))
+    for label in metrics.index[:top_n]:
+        ax.plot(dates, equity[:, labels.index(label)], label=label, linewidth=1)
+    ax.plot(dates, initial_capital * prices / prices[0], label="Buy & Hold", color="black", linestyle="--")
+
+    ax.set_title(f"{asset} – Top {top_n} Strategies vs Buy & Hold")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Portfolio Value")
+    ax.legend(fontsize=8)
+    ax.grid(True, alpha=0.3)
+
+    chart_path = OUTPUT_CHARTS / f"{asset.lower()}_strategy_comparison{timeframe_suffix(timeframe)}.png"
+    chart_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(chart_path, dpi=300, bbox_inches="tight")
+
+    plt.show()
+    plt.close(fig)
+
+    return metrics, equity
+
+
+# -----------------------------
+# Run
+# -----------------------------
+if __name__ == "__main__":
+    run_batch_backtest("Gold")
+    run_batch_backtest("Silver")
@@ -0,0 +1,381 @@
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.analysis.strategy_backtest import (
+    STRATEGIES, build_signal_matrix, simulate_signal_matrix, strategy_metrics, warmup_bars,
+)
+from src.data.price_store import (
+    CLEANED_CSV, STORE_DIR, PriceDataset, ensure_column_store, open_column_store, store_version,
+)
+
+ASSETS = {"Gold": "Gold_Close", "Silver": "Silver_Close"}
+FORMATS = {"json": "application/json", "npz": "application/octet-stream"}
+
+
+# -----------------------------
+# Compute layer (PriceView -> named columns)
+# -----------------------------
+def compute_prices(view, asset):
+    return {"Close": view.column(ASSETS[asset])}
+
+
+def compute_indicators(view, asset, window=20, k=2.0):
+    prices = pd.Series(view.column(ASSETS[asset]), copy=False)
+    ma = prices.rolling(window).mean().to_numpy()
+    std = prices.rolling(window).std().to_numpy()
+    upper, lower = ma + k * std, ma - k * std
+    return {
+        "Close": prices.to_numpy(),
+        "MA": ma,
+        "Upper_Band": upper,
+        "Lower_Band": lower,
+        "Percent_B": (prices.to_numpy() - lower) / (upper - lower),
+    }
+
+
+def compute_ratio(view):
+    return {"Gold_Silver_Ratio": view.ratio()}
+
+
+def compute_volatility(view, asset, window=30):
+    price_col = ASSETS[asset]
+    return {"Return": view.returns(price_col), "Volatility": view.rolling_std(price_col, window)}
+
+
+def compute_backtest(view, asset, strategy="bollinger", **params):
+    prices = np.asarray(view.column(ASSETS[asset]), dtype=np.float64)
+    label = strategy + "(" + ", ".join(f"{k}={v}" for k, v in params.items()) + ")"
+    variants = [(label, strategy, params)]
+    equity, positions = simulate_signal_matrix(prices, build_signal_matrix(prices, variants))
+    metrics = strategy_metrics(prices, equity, positions, [label], start=warmup_bars(variants)).iloc[0]
+    return (
+        {"Equity": equity[:, 0], "Position": positions[:, 0]},
+        {key: float(value) if np.isfinite(value) else None for key, value in metrics.items()},
+    )
+
+
+# -----------------------------
+# Endpoints: parameter schema + compute function
+# -----------------------------
+class BadRequest(ValueError):
+    """Invalid request; the message is sent to the client as is (400)."""
+
+
+def _asset(value):
+    if value not in ASSETS:
+        raise ValueError(f"must be one of {list(ASSETS)}")
+    return value
+
+
+def _strategy(value):
+    if value not in STRATEGIES:
+        raise ValueError(f"must be one of {list(STRATEGIES)}")
+    return value
+
+
+def _int(minimum):
+    def convert(value):
+        try:
+            number = float(value)
+        except ValueError:
+            number = np.nan
+        if not (number.is_integer() and number >= minimum):
+            raise ValueError(f"must be an integer >= {minimum}")
+        return int(number)
+    return convert
+
+
+def _positive(value):
+    try:
+        number = float(value)
+    except ValueError:
+        number = np.nan
+    if not (np.isfinite(number) and number > 0):
+        raise ValueError("must be a positive number")
+    return number
+
+
+def _date(value):
+    try:
+        return pd.Timestamp(value).strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
+        raise ValueError("must be a date (YYYY-MM-DD)") from None
+
+
+ENDPOINTS = {
+    "/prices": ({"asset": (_asset, "Gold")}, compute_prices),
+    "/indicators": ({"asset": (_asset, "Gold"), "window": (_int(2), 20), "k": (_positive, 2.0)}, compute_indicators),
+    "/ratio": ({}, compute_ratio),
+    "/volatility": ({"asset": (_asset, "Gold"), "window": (_int(2), 30)}, compute_volatility),
+    "/backtest": ({"asset": (_asset, "Gold"), "strategy": (_strategy, "bollinger")}, compute_backtest),
+}
+COMMON_PARAMS = ("start", "end", "format")
+
+
+def strategy_schema(strategy):
+    """
+    Strategy arguments accepted by /backtest, from the signal function's
+    signature: periods are integers >= 1, other numbers must be positive.
+    """
+    schema = {}
+    for name, param in inspect.signature(STRATEGIES[strategy]).parameters.items():
+        if param.default is inspect.Parameter.empty:
+            continue  # the Indicators argument
+        convert = _int(1) if isinstance(param.default, int) else _positive
+        schema[name] = (convert, param.default)
+    return schema
+
+
+def _convert(name, convert, value):
+    try:
+        return convert(value)
+    except ValueError as exc:
+        raise BadRequest(f"invalid {name}={value!r}: {exc}") from None
+
+
+def normalize_params(path, query):
+    """
+    Validate and canonicalize query parameters, so equivalent requests share
+    one cache entry and one ETag. Raises BadRequest on bad input.
+    """
+    schema, _ = ENDPOINTS[path]
+    params = {}
+    for name, (convert, default) in schema.items():
+        params[name] = _convert(name, convert, query[name][-1]) if name in query else default
+    allowed = dict(schema)
+
+    if path == "/backtest":
+        # Strategy arguments (window=20&k=2 ...), only those set explicitly
+        strategy_params = strategy_schema(params["strategy"])
+        for name, (convert, _) in strategy_params.items():
+            if name in query:
+                params[name] = _convert(name, convert, query[name][-1])
+        allowed.update(strategy_params)
+
+    unknown = sorted(set(query) - set(allowed) - set(COMMON_PARAMS))
+    if unknown:
+        raise BadRequest(f"unknown parameter(s) {unknown}; allowed: {[*allowed, *COMMON_PARAMS]}")
+
+    for name in ("start", "end"):
+        params[name] = _convert(name, _date, query[name][-1]) if name in query else None
+    if params["start"] and params["end"] and params["start"] > params["end"]:
+        raise BadRequest(f"start ({params['start']}) is after end ({params['end']})")
+
+    fmt = query.get("format", ["json"])[-1]
+    if fmt not in FORMATS:
+        raise BadRequest(f"format must be one of {list(FORMATS)}")
+    params["format"] = fmt
+    return params
+
+
+def _json_column(values):
+    # NaN and +/-inf have no JSON representation: sent as null
+    values = np.asarray(values, dtype=np.float64)
+    out = values.tolist()
+    for i in np.flatnonzero(~np.isfinite(values)):
+        out[i] = None
+    return out
+
+
+def encode_response(dates, columns, meta, fmt):
+    if fmt == "npz":
+        buffer = io.BytesIO()
+        arrays = {"Date": np.asarray(dates, dtype="datetime64[D]").astype(np.int32)}
+        arrays.update({name: np.asarray(values) for name, values in columns.items()})
+        np.savez(buffer, **arrays)
+        return buffer.getvalue()
+
+    payload = {
+        "meta": meta,
+        "Date": pd.DatetimeIndex(dates).strftime("%Y-%m-%d").tolist(),
+        "columns": {name: _json_column(values) for name, values in columns.items()},
+    }
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+# -----------------------------
+# Service: data version, cache, compute
+# -----------------------------
+class AnalyticsService:
+    """
+    Shared by all request threads. Responses are cached in memory per
+    (data version, endpoint, canonical params). The data version is re-read
+    at most every `version_ttl` seconds, so rewritten stores are picked up;
+    each version is served from the dataset opened for it, so an ETag always
+    names the data its response was computed from.
+    """
+
+    def __init__(self, store_dir=STORE_DIR, csv_path=CLEANED_CSV, max_entries=256, version_ttl=1.0):
+        self.store_dir = store_dir
+        self.csv_path = csv_path
+        self.max_entries = max_entries
+        self.version_ttl = version_ttl
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._snapshot = None  # (version, PriceDataset)
+        self._version_checked = 0.0
+        self.hits = self.misses = 0
+
+    def _open(self):
+        # Files are replaced atomically (price_store._replace_file); retry if
+        # the store was rewritten while we opened it, so version and data agree
+        while True:
+            version = store_version(self.store_dir)
+            dataset = PriceDataset(open_column_store(self.store_dir))
+            if store_version(self.store_dir) == version:
+                return version, dataset
+
+    def snapshot(self):
+        """Current (version, dataset); one thread at a time checks and rebuilds."""
+        if time.monotonic() - self._version_checked > self.version_ttl:
+            with self._refresh_lock:
+                if time.monotonic() - self._version_checked > self.version_ttl:
+                    ensure_column_store(self.csv_path, self.store_dir)
+                    if self._snapshot is None or store_version(self.store_dir) != self._snapshot[0]:
+                        snapshot = self._open()
+                        with self._lock:
+                            self._snapshot = snapshot
+                            self._cache.clear()
+                    self._version_checked = time.monotonic()
+        return self._snapshot
+
+    def version(self):
+        return self.snapshot()[0]
+
+    def etag(self, version, path, params):
+        key = json.dumps([version, path, params], sort_keys=True)
+        return '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+    def get(self, snapshot, path, params):
+        version, dataset = snapshot
+        key = (version, path, json.dumps(params, sort_keys=True))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        # Compute outside the lock so slow requests do not block cached ones
+        body = self._compute(version, dataset, path, params)
+        with self._lock:
+            if self._snapshot[0] == version:
+                self._cache[key] = body
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return body
+
+    def _compute(self, version, dataset, path, params):
+        _, compute = ENDPOINTS[path]
+        args = {k: v for k, v in params.items() if k not in COMMON_PARAMS}
+        view = dataset.view(params["start"], params["end"])
+        if not len(view):
+            first, last = (pd.Timestamp(d).strftime("%Y-%m-%d") for d in dataset.dates[[0, -1]])
+            raise BadRequest(f"no data between start={params['start']} and end={params['end']} "
+                             f"(data covers {first} to {last})")
+
+        result = compute(view, **args)
+        columns, extra = result if isinstance(result, tuple) else (result, {})
+        meta = {"endpoint": path, "params": params, "data_version": version, "rows": len(view), **extra}
+        return encode_response(view.dates, columns, meta, params["format"])
+
+
+class AnalyticsHandler(BaseHTTPRequestHandler):
+    server_version = "GoldSilverAnalytics/1.0"
+    service = None  # set by make_server
+
+    def _send(self, status, body=b"", content_type="application/json", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/version":
+            version = self.service.version()
+            stats = {"data_version": version, "cache_hits": self.service.hits, "cache_misses": self.service.misses}
+            return self._send(200, json.dumps(stats).encode())
+        if url.path not in ENDPOINTS:
+            return self._error(404, f"unknown endpoint; try one of {['/version', *ENDPOINTS]}")
+
+        try:
+            params = normalize_params(url.path, parse_qs(url.query))
+        except BadRequest as exc:
+            return self._error(400, str(exc))
+
+        snapshot = self.service.snapshot()
+        version = snapshot[0]
+        etag = self.service.etag(version, url.path, params)
+        headers = [("ETag", etag), ("Cache-Control", "no-cache"), ("X-Data-Version", version)]
+
+        # Conditional request: nothing to compute or send if the client is current
+        if_none_match = self.headers.get("If-None-Match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return self._send(304, headers=headers)
+
+        try:
+            body = self.service.get(snapshot, url.path, params)
+        except BadRequest as exc:
+            return self._error(400, str(exc))
+        except Exception as exc:
+            # Parameters were validated, so this is a server-side bug
+            print(f"⚠️ {url.path} failed: {exc!r}")
+            return self._error(500, f"internal error computing {url.path}")
+        self._send(200, body, FORMATS[params["format"]], headers)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8000, service=None):
+    handler = type("Handler", (AnalyticsHandler,), {"service": service or AnalyticsService()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host="127.0.0.1", port=8000):
+    server = make_server(host, port)
+    print(f"📡 Analytics API on http://{host}:{port}")
+    print("Endpoints: /version " + " ".join(ENDPOINTS))
+    print("Example:   /indicators?asset=Gold&start=2024-01-01&window=20&format=json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP analytics API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -0,0 +1,337 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.price_store import STORE_DIR, STORE_FORMAT_VERSION, _replace_file, open_column_store, read_store_meta
+from src.data.query import _returns, _rolling_mean, _rolling_vol
+
+# Project paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+DERIVED_DIR = BASE_DIR / "data" / "processed" / "gold_silver_derived"
+
+# Rows per chunk. Peak memory is about chunk_size * (window + a few) float64s
+# per worker, independent of the number of rows in the store.
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+# -----------------------------
+# Window carry-over
+# -----------------------------
+# Rolling functions need the previous window - 1 inputs at the start of each
+# chunk. The tail of each input series is carried into the next chunk, and
+# the rolling functions reduce every window on its own, so every output value
+# is computed from exactly the same inputs as in memory: results are identical.
+class _Carry:
+    def __init__(self, size):
+        self.size = size
+        self.tail = np.empty(0)
+
+    def extend(self, values):
+        """Return tail + values and keep the last `size` values for the next chunk."""
+        extended = np.concatenate([self.tail, values])
+        self.tail = extended[max(len(extended) - self.size, 0):] if self.size else extended[:0]
+        return extended
+
+
+def _chunks(n_rows, chunk_size):
+    for lo in range(0, n_rows, chunk_size):
+        yield lo, min(lo + chunk_size, n_rows)
+
+
+# -----------------------------
+# Streaming .npy columns
+# -----------------------------
+# Plain file reads/writes rather than memory maps: mapped pages stay resident
+# (and count as process memory) until the OS evicts them, so a full pass over
+# a memory-mapped store ends up holding all of it. Streaming keeps only the
+# current chunk in memory. The files are ordinary .npy columns, written to a
+# temp file and renamed into place on close (as in write_column_store).
+class _ColumnReader:
+    def __init__(self, store_dir, name):
+        self._file = open(Path(store_dir) / f"{name}.npy", "rb")
+        if np.lib.format.read_magic(self._file) == (1, 0):
+            shape, _, self.dtype = np.lib.format.read_array_header_1_0(self._file)
+        else:
+            shape, _, self.dtype = np.lib.format.read_array_header_2_0(self._file)
+        self.rows = shape[0]
+
+    def read(self, count):
+        return np.fromfile(self._file, dtype=self.dtype, count=count)
+
+    def close(self):
+        self._file.close()
+
+
+class _ColumnWriter:
+    def __init__(self, output_dir, name, n_rows, dtype=np.float64):
+        self.path = Path(output_dir) / f"{name}.npy"
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self._tmp, "wb")
+        header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (n_rows,)}
+        np.lib.format.write_array_header_1_0(self._file, header)
+        self.dtype = np.dtype(dtype)
+
+    def write(self, values):
+        np.ascontiguousarray(values, dtype=self.dtype).tofile(self._file)
+
+    def close(self):
+        self._file.close()
+        os.replace(self._tmp, self.path)
+
+
+# -----------------------------
+# Tasks (one per asset, plus the ratio)
+# -----------------------------
+def asset_columns(asset, window=20, vol_window=30):
+    return [f"{asset}_Return", f"{asset}_MA_{window}", f"{asset}_STD_{window}",
+            f"{asset}_Upper", f"{asset}_Lower", f"{asset}_Vol_{vol_window}"]
+
+
+def _asset_task(store_dir, output_dir, asset, window, k, vol_window, chunk_size):
+    """
+    Returns, Bollinger bands (MA/STD/Upper/Lower) on prices and rolling
+    volatility of returns for one asset, chunk by chunk.
+    """
+    source = _ColumnReader(store_dir, f"{asset}_Close")
+    names = asset_columns(asset, window, vol_window)
+    out = {name: _ColumnWriter(output_dir, name, source.rows) for name in names}
+
+    prices_carry = _Carry(max(window - 1, 1))
+    returns_carry = _Carry(vol_window - 1)
+    for lo, hi in _chunks(source.rows, chunk_size):
+        prices = prices_carry.extend(source.read(hi - lo).astype(np.float64))
+        skip = len(prices) - (hi - lo)
+
+        returns = _returns(prices)[skip:]
+        ma = _rolling_mean(prices, window)[skip:]
+        std = _rolling_vol(prices, window)[skip:]
+        if lo == 0:
+            # First row: no previous price (same NaN as in memory)
+            returns[0] = np.nan
+
+        extended_returns = returns_carry.extend(returns)
+        vol = _rolling_vol(extended_returns, vol_window)[len(extended_returns) - (hi - lo):]
+
+        for name, values in zip(names, (returns, ma, std, ma + k * std, ma - k * std, vol)):
+            out[name].write(values)
+
+    for column in (source, *out.values()):
+        column.close()
+    return names
+
+
+def _ratio_task(store_dir, output_dir, numerator, denominator, chunk_size):
+    num = _ColumnReader(store_dir, f"{numerator}_Close")
+    den = _ColumnReader(store_dir, f"{denominator}_Close")
+    name = f"{numerator}_{denominator}_Ratio"
+    out = _ColumnWriter(output_dir, name, num.rows)
+    for lo, hi in _chunks(num.rows, chunk_size):
+        out.write(num.read(hi - lo).astype(np.float64) / den.read(hi - lo).astype(np.float64))
+    for column in (num, den, out):
+        column.close()
+    return [name]
+
+
+def _date_task(store_dir, output_dir, chunk_size):
+    dates = _ColumnReader(store_dir, "Date")
+    out = _ColumnWriter(output_dir, "Date", dates.rows, dates.dtype)
+    for lo, hi in _chunks(dates.rows, chunk_size):
+        out.write(dates.read(hi - lo))
+    for column in (dates, out):
+        column.close()
+    return ["Date"]
+
+
+def _run_task(task):
+    kind, args = task
+    return {"asset": _asset_task, "ratio": _ratio_task, "date": _date_task}[kind](*args)
+
+
+# -----------------------------
+# Chunked run over a store
+# -----------------------------
+def compute_derived_store(store_dir=STORE_DIR, output_dir=DERIVED_DIR, assets=None, window=20, k=2.0,
+                          vol_window=30, ratio=("Gold", "Silver"), chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    """
+    Compute returns, Bollinger bands, rolling volatility and the ratio for a
+    column store of any length, writing the results as another column store
+    (same layout, readable with open_column_store). Inputs are read and
+    outputs written chunk by chunk, so memory stays bounded by chunk_size.
+    Assets are independent and run in parallel with workers > 1.
+    """
+    meta = read_store_meta(store_dir)
+    if assets is None:
+        assets = [col[: -len("_Close")] for col in meta["columns"] if col.endswith("_Close")]
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [("date", (store_dir, output_dir, chunk_size))]
+    tasks += [("asset", (store_dir, output_dir, asset, window, k, vol_window, chunk_size)) for asset in assets]
+    if ratio and all(f"{asset}_Close" in meta["columns"] for asset in ratio):
+        tasks.append(("ratio", (store_dir, output_dir, *ratio, chunk_size)))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = list(pool.map(_run_task, tasks))
+    else:
+        written = [_run_task(task) for task in tasks]
+
+    # meta.json last, as in write_column_store: marks the store as complete
+    out_meta = {
+        "format_version": STORE_FORMAT_VERSION,
+        "rows": meta["rows"],
+        "date_unit": meta["date_unit"],
+        "price_dtype": "float64",
+        "columns": [name for names in written for name in names],
+        "source": str(store_dir),
+        "params": {"window": window, "k": k, "vol_window": vol_window, "chunk_size": chunk_size},
+    }
+    _replace_file(output_dir / "meta.json", lambda f: f.write(json.dumps(out_meta, indent=2).encode()))
+    return output_dir
+
+
+def in_memory_reference(store_dir=STORE_DIR, assets=None, window=20, k=2.0, vol_window=30, ratio=("Gold", "Silver")):
+    """
+    Same columns computed on whole arrays with the same kernels (for checking
+    the chunked mode: results must match exactly).
+    """
+    columns = open_column_store(store_dir)
+    assets = assets or [col[: -len("_Close")] for col in columns if col.endswith("_Close")]
+    out = {}
+    for asset in assets:
+        prices = np.asarray(columns[f"{asset}_Close"], dtype=np.float64)
+        names = asset_columns(asset, window, vol_window)
+        ma, std = _rolling_mean(prices, window), _rolling_vol(prices, window)
+        returns = _returns(prices)
+        for name, values in zip(names, (returns, ma, std, ma + k * std, ma - k * std,
+                                        _rolling_vol(returns, vol_window))):
+            out[name] = values
+    if ratio:
+        out[f"{ratio[0]}_{ratio[1]}_Ratio"] = (np.asarray(columns[f"{ratio[0]}_Close"], dtype=np.float64)
+                                               / np.asarray(columns[f"{ratio[1]}_Close"], dtype=np.float64))
+    return out
+
+
+def pandas_reference(store_dir=STORE_DIR, assets=None, window=20, k=2.0, vol_window=30, ratio=("Gold", "Silver")):
+    """
+    Same columns computed with pandas .rolling(). Pandas updates running sums,
+    so values agree with the kernels to rounding, not bit for bit.
+    """
+    columns = open_column_store(store_dir)
+    assets = assets or [col[: -len("_Close")] for col in columns if col.endswith("_Close")]
+    out = {}
+    for asset in assets:
+        prices = pd.Series(np.asarray(columns[f"{asset}_Close"], dtype=np.float64))
+        names = asset_columns(asset, window, vol_window)
+        ma, std = prices.rolling(window).mean(), prices.rolling(window).std()
+        returns = prices.pct_change()
+        for name, values in zip(names, (returns, ma, std, ma + k * std, ma - k * std,
+                                        returns.rolling(vol_window).std())):
+            out[name] = values.to_numpy()
+    if ratio:
+        out[f"{ratio[0]}_{ratio[1]}_Ratio"] = (np.asarray(columns[f"{ratio[0]}_Close"], dtype=np.float64)
+                                               / np.asarray(columns[f"{ratio[1]}_Close"], dtype=np.float64))
+    return out
+
+
+# -----------------------------
+# Benchmark: synthetic minute-bar store
+# -----------------------------
+def _synthetic_store(store_dir, n_rows, assets, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Written chunk by chunk too, so the benchmark itself stays out-of-core
+    rng = np.random.default_rng(seed)
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    dates = _ColumnWriter(store_dir, "Date", n_rows, np.int64)
+    prices = {asset: _ColumnWriter(store_dir, f"{asset}_Close", n_rows) for asset in assets}
+    level = {asset: 100.0 for asset in assets}
+    for lo, hi in _chunks(n_rows, chunk_size):
+        dates.write(np.arange(lo, hi))
+        for asset in assets:
+            path = level[asset] * np.exp(np.cumsum(rng.normal(0, 1e-4, hi - lo)))
+            prices[asset].write(path)
+            level[asset] = path[-1]
+    for column in (dates, *prices.values()):
+        column.close()
+    meta = {"format_version": STORE_FORMAT_VERSION, "rows": n_rows, "date_unit": "minutes",
+            "price_dtype": "float64", "columns": ["Date"] + [f"{asset}_Close" for asset in assets]}
+    _replace_file(store_dir / "meta.json", lambda f: f.write(json.dumps(meta, indent=2).encode()))
+
+
+def benchmark(n_rows=20_000_000, n_assets=2, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    import resource  # Unix only; the rest of the module runs anywhere
+
+    assets = ["Gold", "Silver"] + [f"Asset{i}" for i in range(2, n_assets)]
+    root = Path(tempfile.mkdtemp(prefix="chunked_bench_"))
+    try:
+        _synthetic_store(root / "source", n_rows, assets[:n_assets])
+        t0 = time.perf_counter()
+        compute_derived_store(root / "source", root / "derived", chunk_size=chunk_size, workers=workers)
+        elapsed = time.perf_counter() - t0
+        size = sum(path.stat().st_size for path in (root / "derived").glob("*.npy"))
+        # ru_maxrss is in KiB on Linux; children cover the worker processes
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+        print(f"{n_rows:,} rows x {n_assets} assets in {elapsed:.1f}s "
+              f"({workers} worker{'s' if workers > 1 else ''}, chunks of {chunk_size:,})")
+        print(f"output: {size / 2**20:,.0f} MiB on disk, peak RSS: {peak:,.0f} MiB")
+    finally:
+        shutil.rmtree(root)
+
+
+# -----------------------------
+# Run
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chunked (out-of-core) returns, Bollinger bands, volatility and ratio.")
+    parser.add_argument("--store", type=Path, default=STORE_DIR)
+    parser.add_argument("--out", type=Path, default=DERIVED_DIR)
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--k", type=float, default=2.0)
+    parser.add_argument("--vol-window", type=int, default=30)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--bench", type=int, metavar="ROWS", help="run on a synthetic store of ROWS rows")
+    parser.add_argument("--check", action="store_true",
+                        help="compare with the same kernels on whole arrays (must match exactly) "
+                             "and with pandas .rolling() (must match to rtol 1e-9)")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        benchmark(args.bench, chunk_size=args.chunk_size, workers=args.workers)
+        return
+
+    output_dir = compute_derived_store(args.store, args.out, window=args.window, k=args.k,
+                                       vol_window=args.vol_window, chunk_size=args.chunk_size,
+                                       workers=args.workers)
+    meta = read_store_meta(output_dir)
+    print(f"Derived store saved to: {output_dir} ({meta['rows']} rows, {len(meta['columns']) - 1} columns)")
+
+    if args.check:
+        chunked = open_column_store(output_dir)
+        params = {"window": args.window, "k": args.k, "vol_window": args.vol_window}
+        reference = in_memory_reference(args.store, **params)
+        mismatched = [name for name, values in reference.items()
+                      if not np.array_equal(chunked[name], values, equal_nan=True)]
+        print("Matches in-memory results exactly" if not mismatched else f"Mismatched columns: {mismatched}")
+
+        reference = pandas_reference(args.store, **params)
+        mismatched = [name for name, values in reference.items()
+                      if not np.allclose(chunked[name], values, rtol=1e-9, atol=0, equal_nan=True)]
+        print("Matches pandas .rolling() to rtol 1e-9" if not mismatched else f"Differs from pandas: {mismatched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
+import sys
 import pandas as pd
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.price_store import STORE_DIR, write_column_store
+from src.data.validate import print_validation_report, validate_frame
+from src.data.versioning import commit_version
+
 # Project paths
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_RAW = BASE_DIR / "data" / "raw"
@@ -28,7 +37,13 @@ def load_yfinance_csv(path):
 
     return df
 
-def clean_gold_silver_data():
+def clean_gold_silver_data(formats=("csv", "binary"), price_dtype="float64", drop_invalid=False):
+    """
+    Build the cleaned Gold/Silver dataset.
+    formats: any of "csv" and "binary" (memory-mappable store, see price_store.py)
+    price_dtype: "float64" or "float32" for the binary store
+    drop_invalid: drop rows flagged by validation (stale, non-positive, outlier)
+    """
     # Load raw data
     gold = load_yfinance_csv(DATA_RAW / "gold.csv")
     silver = load_yfinance_csv(DATA_RAW / "silver.csv")
@@ -41,18 +56,27 @@ def clean_gold_silver_data():
     gold = gold[["Date", "Gold_Close"]]
     silver = silver[["Date", "Silver_Close"]]
 
-    # Merge datasets (SQL INNER JOIN)
-    merged = pd.merge(gold, silver, on="Date", how="inner")
+    # Validate on the OUTER join so days missing from one asset are reported
+    combined = pd.merge(gold, silver, on="Date", how="outer").sort_values("Date")
+    validation = validate_frame(combined)
+    print_validation_report(validation, "Raw Gold/Silver – Data Quality Report")
 
-    # Sort by date
-    merged = merged.sort_values("Date")
+    if drop_invalid:
+        combined = validation.apply_frame(combined)
 
-    # Save cleaned data
-    output_path = DATA_PROCESSED / "gold_silver_cleaned.csv"
-    merged.to_csv(output_path, index=False)
+    # Keep only days with both prices (SQL INNER JOIN)
+    merged = combined.dropna().reset_index(drop=True)
 
+    # Save cleaned data
     print("✅ Cleaned data saved to:")
-    print(output_path)
+    if "csv" in formats:
+        output_path = DATA_PROCESSED / "gold_silver_cleaned.csv"
+        merged.to_csv(output_path, index=False)
+        print(output_path)
+    if "binary" in formats:
+        print(write_column_store(merged, STORE_DIR, price_dtype))
+    version = commit_version("cleaned", merged, note=f"clean (drop_invalid={drop_invalid})")
+    print("Dataset version: cleaned@" + version)
     print("Final dataset shape:", merged.shape)
     print("\nSample rows:")
     print(merged.head())
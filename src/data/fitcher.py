@@ -1,6 +1,12 @@
-import yfinance as yf
+import sys
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.versioning import commit_version
+
 # Resolve project root
 BASE_DIR = Path(__file__).resolve().parents[2]
 
@@ -8,6 +14,9 @@ DATA_RAW = BASE_DIR / "data" / "raw"
 DATA_RAW.mkdir(parents=True, exist_ok=True)
 
 def fetch_gold_silver_data():
+    # Imported here: yfinance is slow to import and only needed for downloads
+    import yfinance as yf
+
     print("Downloading Gold data...")
     gold = yf.download("GC=F", start="2015-01-01", progress=False)
 
@@ -24,6 +33,15 @@ def fetch_gold_silver_data():
     print(gold_path)
     print(silver_path)
 
+    # Record the refresh; only appended rows and revised cells are stored
+    print("Dataset versions:")
+    for name, df in (("gold", gold), ("silver", silver)):
+        df = df.copy()
+        if df.columns.nlevels > 1:
+            df.columns = df.columns.get_level_values(0)
+        version = commit_version(name, df.rename_axis("Date").reset_index(), note="yfinance download")
+        print(f"{name}@{version}")
+
 if __name__ == "__main__":
     fetch_gold_silver_data()
 
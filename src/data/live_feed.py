@@ -0,0 +1,433 @@
+import asyncio
+import json
+import random
+import sys
+import time
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.price_store import CLEANED_CSV, STORE_DIR, _replace_file, write_column_store
+from src.data.validate import validate_frame
+from src.data.versioning import DatasetVersions
+
+# Project paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_RAW = BASE_DIR / "data" / "raw"
+DATA_PROCESSED = BASE_DIR / "data" / "processed"
+TICKS_DIR = DATA_RAW / "ticks"
+
+# Feed symbols (same tickers as fitcher.py) -> project asset names
+SYMBOLS = {"GC=F": "Gold", "SI=F": "Silver"}
+ASSETS = list(SYMBOLS.values())
+
+TICK_DTYPE = np.dtype(
+    [("ts", "<i8"), ("asset", "<i4"), ("price", "<f8"), ("volume", "<f8")],
+    align=True
+)
+
+
+# -----------------------------
+# Shared-memory ring buffer
+# -----------------------------
+class PriceRingBuffer:
+    """
+    Fixed-size tick buffer in shared memory.
+
+    One writer, any number of readers (threads or processes). The writer
+    fills a slot and then bumps the sequence counter, so readers never need
+    a lock: they read the counter, take views of the slots, and check the
+    counter again to see whether the writer lapped them.
+    """
+
+    HEADER = np.dtype([("seq", "<i8"), ("capacity", "<i8")])
+    HEADER_BYTES = 64
+
+    def __init__(self, shm, owner=False):
+        self._shm = shm
+        self._owner = owner
+        self._header = np.ndarray(1, dtype=self.HEADER, buffer=shm.buf)
+        self.capacity = int(self._header["capacity"][0])
+        self._records = np.ndarray(
+            self.capacity, dtype=TICK_DTYPE, buffer=shm.buf, offset=self.HEADER_BYTES
+        )
+
+    @classmethod
+    def create(cls, capacity=65_536, name=None):
+        size = cls.HEADER_BYTES + capacity * TICK_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray(1, dtype=cls.HEADER, buffer=shm.buf)
+        header["seq"] = 0
+        header["capacity"] = capacity
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def seq(self):
+        """Total number of ticks ever written."""
+        return int(self._header["seq"][0])
+
+    def write(self, ts, asset, price, volume=0.0):
+        seq = self.seq
+        self._records[seq % self.capacity] = (ts, asset, price, volume)
+        self._header["seq"] = seq + 1
+
+    def write_many(self, ticks):
+        """Write a structured array of TICK_DTYPE records in one pass."""
+        seq = self.seq
+        n = len(ticks)
+        if n > self.capacity:
+            ticks = ticks[-self.capacity:]
+            seq += n - self.capacity
+            n = self.capacity
+        start = seq % self.capacity
+        first = min(n, self.capacity - start)
+        self._records[start:start + first] = ticks[:first]
+        self._records[:n - first] = ticks[first:]
+        self._header["seq"] = seq + n
+
+    def views_since(self, seq):
+        """
+        Zero-copy views of every tick written after `seq`.
+        Returns (views, new_seq, lost); at most two views because of wrap-around.
+        `lost` counts ticks that were overwritten before this reader got to them.
+        """
+        end = self.seq
+        lost = max(0, end - self.capacity - seq)
+        # Never before slot 0: slots not yet written hold zeros, not ticks
+        seq = max(seq, end - self.capacity, 0)
+        if seq >= end:
+            return [], end, lost
+
+        start, stop = seq % self.capacity, end % self.capacity
+        if start < stop:
+            views = [self._records[start:stop]]
+        else:
+            views = [self._records[start:], self._records[:stop]]
+        return views, end, lost
+
+    def is_valid(self, seq):
+        """True if slots read from `seq` onward have not been overwritten since."""
+        return self.seq - self.capacity <= seq
+
+    def latest(self, asset=None):
+        """Most recent tick, optionally for one asset index (None if there is none)."""
+        views, _, _ = self.views_since(0)
+        for view in reversed(views):
+            rows = view if asset is None else view[view["asset"] == asset]
+            if len(rows):
+                return rows[-1]
+        return None
+
+    def close(self):
+        self._header = self._records = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# -----------------------------
+# Feed adapters
+# -----------------------------
+class FeedAdapter:
+    """
+    Base class for price feeds.
+    Subclasses implement stream() (raw messages) and normalize() (-> tick tuple).
+    normalize() may raise KeyError/ValueError/TypeError on a malformed message;
+    the ingestion service counts and skips it.
+    """
+
+    async def stream(self):
+        raise NotImplementedError
+        yield
+
+    def normalize(self, message):
+        """Return (ts_ns, asset_name, price, volume) or None to skip."""
+        raise NotImplementedError
+
+
+class JsonLinesFeed(FeedAdapter):
+    """
+    Reads newline-delimited JSON ticks from a TCP server:
+    {"symbol": "GC=F", "ts": 1700000000.0, "price": 2000.5, "volume": 3}
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, symbols=SYMBOLS):
+        self.host = host
+        self.port = port
+        self.symbols = symbols
+
+    async def stream(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while line := await reader.readline():
+                yield line
+        finally:
+            writer.close()
+
+    def normalize(self, message):
+        message = json.loads(message)
+        if not isinstance(message, dict):
+            raise TypeError(f"expected a JSON object, got {type(message).__name__}")
+        asset = self.symbols.get(message.get("symbol"))
+        price = float(message.get("price", "nan"))
+        if asset is None or not price > 0:
+            return None
+        ts_ns = int(float(message["ts"]) * 1e9)
+        return ts_ns, asset, price, float(message.get("volume", 0.0))
+
+
+# -----------------------------
+# Simulated feed server (offline)
+# -----------------------------
+async def run_simulated_feed_server(host="127.0.0.1", port=8765, interval=0.05,
+                                    start_prices=None, seed=None):
+    """
+    Local TCP server streaming random-walk ticks as JSON lines.
+    Returns the asyncio Server; close it to stop.
+    """
+    rng = random.Random(seed)
+    start_prices = start_prices or {"GC=F": 2000.0, "SI=F": 25.0}
+
+    async def handle(reader, writer):
+        prices = dict(start_prices)
+        try:
+            while True:
+                for symbol in prices:
+                    prices[symbol] *= 1 + rng.gauss(0, 0.0005)
+                    message = {
+                        "symbol": symbol,
+                        "ts": time.time(),
+                        "price": round(prices[symbol], 4),
+                        "volume": rng.randint(1, 50),
+                    }
+                    writer.write((json.dumps(message) + "\n").encode())
+                await writer.drain()
+                await asyncio.sleep(interval)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+# -----------------------------
+# Flush sinks
+# -----------------------------
+class CsvTickSink:
+    """Appends each flushed batch to data/raw/ticks/<asset>.csv."""
+
+    def __init__(self, directory=TICKS_DIR):
+        self.directory = Path(directory)
+
+    def __call__(self, batch, assets):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for idx, asset in enumerate(assets):
+            rows = batch[batch["asset"] == idx]
+            if not len(rows):
+                continue
+            path = self.directory / f"{asset.lower()}.csv"
+            df = pd.DataFrame({
+                "Timestamp": pd.to_datetime(rows["ts"], unit="ns"),
+                "Price": rows["price"],
+                "Volume": rows["volume"],
+            })
+            df.to_csv(path, mode="a", header=not path.exists(), index=False)
+
+
+class DailyCloseSink:
+    """
+    Upserts the latest tick of each day into the cleaned dataset, so the
+    processed store (and price_store) move forward with the live feed.
+
+    A new day is only added once every asset has ticked on it (the
+    inner-join contract of clean_gold_silver_data); until then its closes
+    are held in `pending` and merged on a later flush. New days are
+    validated (see validate.py) against the existing history first, and
+    rows with a flagged close are rejected rather than appended. (A spike
+    needs the bar after it to be recognised, so a bad close on the newest
+    day is only caught when it arrives together with the next day.)
+
+    Each change is written like clean_gold_silver_data writes the dataset:
+    the CSV (temp file + rename, so readers never see a partial file), then
+    the binary store, then a new "cleaned" version.
+    store_dir / versions: None to skip the store / versioning.
+    """
+
+    def __init__(self, path=CLEANED_CSV, store_dir=STORE_DIR, versions="cleaned",
+                 checks=("non_positive", "outlier", "stale")):
+        self.path = Path(path)
+        self.store_dir = store_dir
+        self.versions = DatasetVersions(versions) if isinstance(versions, str) else versions
+        self.checks = checks
+        self.pending = {}  # day -> {column: close}
+        self.rows_rejected = 0
+        self.version = None
+
+    def _validated(self, df, new_rows):
+        """
+        New rows whose closes pass validation in the context of `df`.
+        """
+        combined = pd.concat([df, new_rows], ignore_index=True).sort_values("Date", kind="stable")
+        flags = validate_frame(combined).combined(self.checks).any(axis=1)
+        # Flags follow the sorted rows: map them back to the new rows' positions
+        flagged = pd.Series(flags, index=combined.index).sort_index().to_numpy()[len(df):]
+        for day in new_rows.loc[flagged, "Date"]:
+            print(f"⚠️ Live closes for {day:%Y-%m-%d} failed validation; not added to {self.path.name}")
+        self.rows_rejected += int(flagged.sum())
+        return new_rows[~flagged]
+
+    def __call__(self, batch, assets):
+        df = pd.read_csv(self.path)
+        df["Date"] = pd.to_datetime(df["Date"])
+        days = pd.to_datetime(batch["ts"], unit="ns").normalize()
+        changed = False
+
+        for idx, asset in enumerate(assets):
+            col = f"{asset}_Close"
+            mask = batch["asset"] == idx
+            if col not in df.columns or not mask.any():
+                continue
+            closes = pd.Series(batch["price"][mask], index=days[mask]).groupby(level=0).last()
+            for day, price in closes.items():
+                rows = df["Date"] == day
+                if rows.any():
+                    changed |= bool((df.loc[rows, col] != price).any())
+                    df.loc[rows, col] = price
+                else:
+                    self.pending.setdefault(day, {})[col] = price
+
+        columns = [col for col in df.columns if col != "Date"]
+        complete = [day for day, closes in self.pending.items() if all(col in closes for col in columns)]
+        if complete:
+            new_rows = pd.DataFrame([{"Date": day, **self.pending.pop(day)} for day in complete])
+            new_rows = self._validated(df, new_rows[df.columns])
+            if len(new_rows):
+                df = pd.concat([df, new_rows], ignore_index=True)
+                changed = True
+
+        if not changed:
+            return
+        df = df.sort_values("Date").reset_index(drop=True)
+        out = df.copy()
+        out["Date"] = out["Date"].dt.strftime("%Y-%m-%d")
+        _replace_file(self.path, lambda f: out.to_csv(f, index=False))
+        if self.store_dir is not None:
+            write_column_store(df, self.store_dir)
+        if self.versions is not None:
+            self.version = self.versions.commit(df, note="live feed daily closes")
+            self.versions.mark_working(self.version)
+
+
+# -----------------------------
+# Ingestion service
+# -----------------------------
+class IngestionService:
+    """
+    Runs one task per feed, normalizes ticks into the ring buffer, and
+    flushes them to the sinks in batches (every `batch_size` ticks or
+    `flush_interval` seconds, whichever comes first).
+    """
+
+    def __init__(self, feeds, buffer, sinks=None, assets=ASSETS,
+                 batch_size=1_000, flush_interval=5.0):
+        self.feeds = feeds
+        self.buffer = buffer
+        self.sinks = [CsvTickSink()] if sinks is None else sinks
+        self.assets = list(assets)
+        self.asset_index = {asset: i for i, asset in enumerate(self.assets)}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flushed_seq = buffer.seq
+        self.ticks_received = 0
+        self.ticks_dropped = 0
+        self.messages_malformed = 0
+
+    async def _consume(self, feed):
+        async for message in feed.stream():
+            try:
+                tick = feed.normalize(message)
+            except (KeyError, ValueError, TypeError, json.JSONDecodeError):
+                # One bad message must not stop the feed
+                self.messages_malformed += 1
+                continue
+            if tick is None or tick[1] not in self.asset_index:
+                self.ticks_dropped += 1
+                continue
+            ts, asset, price, volume = tick
+            self.buffer.write(ts, self.asset_index[asset], price, volume)
+            self.ticks_received += 1
+            if self.buffer.seq - self.flushed_seq >= self.batch_size:
+                self.flush()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        views, end, lost = self.buffer.views_since(self.flushed_seq)
+        self.flushed_seq = end
+        if lost:
+            print(f"⚠️ {lost} ticks overwritten before flush; raise capacity or flush more often")
+        if not views:
+            return 0
+        batch = np.concatenate(views)
+        for sink in self.sinks:
+            sink(batch, self.assets)
+        return len(batch)
+
+    async def run(self, duration=None):
+        tasks = [asyncio.create_task(self._consume(feed)) for feed in self.feeds]
+        tasks.append(asyncio.create_task(self._flush_periodically()))
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.flush()
+
+
+# -----------------------------
+# Run (offline demo against the simulated feed)
+# -----------------------------
+async def run_simulated_ingestion(duration=3.0, port=8765, sinks=None):
+    server = await run_simulated_feed_server(port=port, seed=42)
+    buffer = PriceRingBuffer.create(capacity=4_096)
+    try:
+        service = IngestionService(
+            [JsonLinesFeed(port=port)], buffer, sinks=sinks, flush_interval=1.0
+        )
+        await service.run(duration=duration)
+
+        print(f"Ticks received: {service.ticks_received} (dropped {service.ticks_dropped}, "
+              f"malformed {service.messages_malformed})")
+        for idx, asset in enumerate(service.assets):
+            tick = buffer.latest(idx)
+            if tick is not None:
+                print(f"Latest {asset}: {tick['price']:.4f}")
+    finally:
+        server.close()
+        await server.wait_closed()
+        buffer.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_simulated_ingestion())
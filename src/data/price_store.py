@@ -0,0 +1,303 @@
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from pathlib import Path
+
+# Project paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_PROCESSED = BASE_DIR / "data" / "processed"
+
+CLEANED_CSV = DATA_PROCESSED / "gold_silver_cleaned.csv"
+STORE_DIR = DATA_PROCESSED / "gold_silver_cleaned"
+
+
+# -----------------------------
+# Column store (compact binary format)
+# -----------------------------
+# A store is a directory holding one .npy file per column plus meta.json:
+#   Date.npy          int32 day numbers (days since 1970-01-01)
+#   <Asset>_Close.npy float64 prices (float32 with price_dtype="float32")
+# .npy files carry their own dtype/shape header and can be memory-mapped,
+# so loading a column costs a page-table update instead of text parsing.
+STORE_FORMAT_VERSION = 1
+PRICE_DTYPES = ("float64", "float32")
+
+
+def _replace_file(path, write):
+    """
+    Write to a temp file and rename it over `path`. The rename gives the file
+    a new inode, so processes that already memory-mapped the old column keep
+    reading the old (complete) data instead of seeing it change or shrink.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def write_column_store(df, store_dir=STORE_DIR, price_dtype="float64"):
+    """
+    Write a DataFrame with a Date column and numeric price columns as a store.
+    """
+    if price_dtype not in PRICE_DTYPES:
+        raise ValueError(f"price_dtype must be one of {PRICE_DTYPES}, got {price_dtype!r}")
+
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    days = pd.to_datetime(df["Date"]).to_numpy(dtype="datetime64[D]").astype(np.int64)
+    _replace_file(store_dir / "Date.npy", lambda f: np.save(f, days.astype(np.int32)))
+
+    columns = [col for col in df.columns if col != "Date"]
+    for col in columns:
+        values = df[col].to_numpy(dtype=price_dtype)
+        _replace_file(store_dir / f"{col}.npy", lambda f: np.save(f, values))
+
+    # meta.json is written last: its mtime marks the store as complete
+    meta = {
+        "format_version": STORE_FORMAT_VERSION,
+        "rows": len(df),
+        "date_unit": "days since 1970-01-01",
+        "price_dtype": price_dtype,
+        "columns": ["Date"] + columns,
+    }
+    _replace_file(store_dir / "meta.json", lambda f: f.write(json.dumps(meta, indent=2).encode()))
+    return store_dir
+
+
+def build_column_store(csv_path=CLEANED_CSV, store_dir=STORE_DIR, price_dtype="float64"):
+    """
+    Convert the cleaned CSV into the binary store.
+    """
+    df = pd.read_csv(csv_path)
+    return write_column_store(df, store_dir, price_dtype)
+
+
+def read_store_meta(store_dir=STORE_DIR):
+    return json.loads((Path(store_dir) / "meta.json").read_text())
+
+
+def store_version(store_dir=STORE_DIR):
+    """
+    Short fingerprint of the store contents (manifest + file sizes/mtimes).
+    Changes whenever the store is rewritten; cheap enough to check per request.
+    """
+    store_dir = Path(store_dir)
+    digest = hashlib.sha1((store_dir / "meta.json").read_bytes())
+    for path in sorted(store_dir.glob("*.npy")):
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _store_is_stale(csv_path, store_dir):
+    meta_file = Path(store_dir) / "meta.json"
+    if not meta_file.exists():
+        return True
+    if read_store_meta(store_dir).get("format_version") != STORE_FORMAT_VERSION:
+        return True
+    return Path(csv_path).exists() and Path(csv_path).stat().st_mtime > meta_file.stat().st_mtime
+
+
+def open_column_store(store_dir=STORE_DIR, columns=None):
+    """
+    Open columns of the store as read-only memory maps (all columns by default).
+    """
+    store_dir = Path(store_dir)
+    names = columns or read_store_meta(store_dir)["columns"]
+    return {name: np.load(store_dir / f"{name}.npy", mmap_mode="r") for name in names}
+
+
+def day_numbers_to_dates(days):
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype("datetime64[ns]")
+
+
+def store_to_frame(store_dir=STORE_DIR):
+    """
+    Read a store back into a regular (in-memory) DataFrame.
+    """
+    columns = open_column_store(store_dir)
+    data = {"Date": day_numbers_to_dates(columns.pop("Date"))}
+    data.update({name: np.asarray(values) for name, values in columns.items()})
+    return pd.DataFrame(data)
+
+
+def store_to_csv(store_dir=STORE_DIR, csv_path=CLEANED_CSV):
+    """
+    Convert a store back to the cleaned CSV layout.
+    """
+    df = store_to_frame(store_dir)
+    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    df.to_csv(csv_path, index=False)
+    return csv_path
+
+
+# -----------------------------
+# Shared dataset and per-session views
+# -----------------------------
+class PriceDataset:
+    """
+    Read-only, memory-mapped price columns shared by all readers in a process.
+    Never mutate it; take a view() and derive new arrays from that instead.
+    """
+
+    def __init__(self, columns):
+        self._columns = columns
+        # Day numbers are decoded once; price columns stay memory-mapped
+        self.dates = day_numbers_to_dates(columns["Date"])
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def column(self, name):
+        if name == "Date":
+            return self.dates
+        return self._columns[name]
+
+    def index_range(self, start=None, end=None):
+        # Dates are sorted, so a date range is a contiguous row range
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), "left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), "right"))
+        return lo, hi
+
+    def view(self, start=None, end=None):
+        lo, hi = self.index_range(start, end)
+        return PriceView(self, lo, hi)
+
+    # Lazy queries (see query.py): dataset.assets([...]).between(...).returns()...
+    def query(self):
+        # Imported here: query.py builds on this module
+        from src.data.query import PriceQuery
+
+        return PriceQuery(self)
+
+    def assets(self, names):
+        return self.query().assets(names)
+
+    def between(self, start=None, end=None):
+        return self.query().between(start, end)
+
+
+class PriceView:
+    """
+    Zero-copy date-range slice of a PriceDataset.
+    Derived columns are returned as new arrays; the shared data is never touched.
+    """
+
+    def __init__(self, dataset, lo, hi):
+        self._dataset = dataset
+        self._slice = slice(lo, hi)
+
+    def __len__(self):
+        return self._slice.stop - self._slice.start
+
+    @property
+    def dates(self):
+        return self._dataset.dates[self._slice]
+
+    def column(self, name):
+        return self._dataset.column(name)[self._slice]
+
+    def series(self, name):
+        return pd.Series(self.column(name), index=pd.DatetimeIndex(self.dates), name=name, copy=False)
+
+    def frame(self, *names, **derived):
+        """
+        Build a DataFrame over the view without copying the stored columns.
+        Extra keyword arguments are added as derived columns.
+        """
+        data = {"Date": self.dates}
+        for name in names or self._dataset.columns:
+            if name != "Date":
+                data[name] = self.column(name)
+        data.update(derived)
+        return pd.DataFrame(data, copy=False)
+
+    # -----------------------------
+    # Derived columns (new arrays)
+    # -----------------------------
+    def total_return(self, name):
+        values = self.column(name)
+        return (values[-1] / values[0] - 1) * 100
+
+    def returns(self, name):
+        values = self.column(name)
+        out = np.empty(len(values))
+        out[:1] = np.nan
+        np.divide(values[1:], values[:-1], out=out[1:])
+        out[1:] -= 1
+        return out
+
+    def rolling_std(self, name, window):
+        return pd.Series(self.returns(name), copy=False).rolling(window).std().to_numpy()
+
+    def normalized(self, name, base=100):
+        values = self.column(name)
+        return values / values[0] * base
+
+    def ratio(self, numerator="Gold_Close", denominator="Silver_Close"):
+        return self.column(numerator) / self.column(denominator)
+
+
+def ensure_column_store(csv_path=CLEANED_CSV, store_dir=STORE_DIR):
+    """
+    Rebuild the store if it is missing or older than the cleaned CSV.
+    """
+    if _store_is_stale(csv_path, store_dir):
+        build_column_store(csv_path, store_dir)
+    return store_dir
+
+
+@lru_cache(maxsize=None)
+def load_price_dataset(csv_path=CLEANED_CSV, store_dir=STORE_DIR):
+    """
+    Load the shared dataset once per process, rebuilding the store
+    if the cleaned CSV is newer than it.
+    """
+    ensure_column_store(csv_path, store_dir)
+    return PriceDataset(open_column_store(store_dir))
+
+
+# -----------------------------
+# Run (conversion tool)
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert between the cleaned CSV and the binary store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    to_binary = sub.add_parser("to-binary", help="CSV -> binary store")
+    to_binary.add_argument("--csv", type=Path, default=CLEANED_CSV)
+    to_binary.add_argument("--store", type=Path, default=STORE_DIR)
+    to_binary.add_argument("--float32", action="store_true", help="store prices as float32")
+
+    to_csv = sub.add_parser("to-csv", help="binary store -> CSV")
+    to_csv.add_argument("--store", type=Path, default=STORE_DIR)
+    to_csv.add_argument("--csv", type=Path, default=CLEANED_CSV)
+
+    info = sub.add_parser("info", help="show store metadata")
+    info.add_argument("--store", type=Path, default=STORE_DIR)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "to-binary":
+        dtype = "float32" if args.float32 else "float64"
+        path = build_column_store(args.csv, args.store, dtype)
+        size = sum(f.stat().st_size for f in path.iterdir())
+        print(f"Binary store saved to: {path} ({size / 1024:.1f} KiB, {dtype})")
+        print(f"Source CSV: {args.csv.stat().st_size / 1024:.1f} KiB")
+    elif args.command == "to-csv":
+        print("CSV saved to:", store_to_csv(args.store, args.csv))
+    else:
+        print(json.dumps(read_store_meta(args.store), indent=2))
+
+
+if __name__ == "__main__":
+    main()
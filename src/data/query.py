@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# -----------------------------
+# Operations
+# -----------------------------
+# Each operation maps one float64 array to another of the same length.
+# `lookback` is how many earlier rows it needs to be exact at the first
+# requested row; the scan reads that many extra rows before the range.
+def _returns(values):
+    out = np.full(len(values), np.nan)
+    out[1:] = values[1:] / values[:-1] - 1
+    return out
+
+
+def _log_returns(values):
+    out = np.full(len(values), np.nan)
+    out[1:] = np.log(values[1:] / values[:-1])
+    return out
+
+
+def _rolling(values, window, reduce):
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        # Each window is reduced on its own, so results do not depend on
+        # where the scan started (a NaN anywhere in the window gives NaN)
+        out[window - 1:] = reduce(sliding_window_view(values, window))
+    return out
+
+
+def _rolling_mean(values, window):
+    return _rolling(values, window, lambda windows: windows.mean(axis=1))
+
+
+def _rolling_vol(values, window):
+    return _rolling(values, window, lambda windows: windows.std(axis=1, ddof=1))
+
+
+OPERATIONS = {
+    # name: (function, lookback(params), column label(params))
+    "returns": (_returns, lambda: 1, lambda: "Return"),
+    "log_returns": (_log_returns, lambda: 1, lambda: "LogReturn"),
+    "rolling_mean": (_rolling_mean, lambda window: window - 1, lambda window: f"MA_{window}"),
+    "rolling_vol": (_rolling_vol, lambda window: window - 1, lambda window: f"Vol_{window}"),
+}
+
+
+# -----------------------------
+# Lazy query
+# -----------------------------
+class PriceQuery:
+    """
+    Lazy, immutable query over a PriceDataset. Each call returns a new query;
+    nothing is read until collect():
+
+        q = dataset.assets(["Gold"]).between("2020-01-01", "2024-12-31")
+        q.returns().rolling_vol(30).collect()
+        q.collect(q.prices(), q.returns(), q.returns().rolling_vol(30))
+
+    The plan is pushed down to the store: only the columns of the selected
+    assets are touched, and only the memory-mapped rows of the date range
+    (plus the lookback the operations need) are read.
+    """
+
+    def __init__(self, dataset, assets=None, start=None, end=None, source=None, ops=()):
+        self._dataset = dataset
+        self._assets = tuple(assets) if assets is not None else self._all_assets()
+        self._start = start
+        self._end = end
+        self._source = source  # None: per-asset closes; ("ratio", num, den): cross-asset
+        self._ops = tuple(ops)
+
+    def _all_assets(self):
+        return tuple(col[: -len("_Close")] for col in self._dataset.columns if col.endswith("_Close"))
+
+    def _with(self, **changes):
+        state = {
+            "assets": self._assets, "start": self._start, "end": self._end,
+            "source": self._source, "ops": self._ops,
+        }
+        state.update(changes)
+        return PriceQuery(self._dataset, **state)
+
+    # Selection
+    def assets(self, names):
+        missing = [name for name in names if f"{name}_Close" not in self._dataset.columns]
+        if missing:
+            raise ValueError(f"Unknown asset(s) {missing}; available: {list(self._all_assets())}")
+        return self._with(assets=tuple(names))
+
+    def between(self, start=None, end=None):
+        return self._with(start=start, end=end)
+
+    # Transforms
+    def _op(self, name, *params):
+        return self._with(ops=self._ops + ((name, params),))
+
+    def prices(self):
+        return self._with(ops=())
+
+    def returns(self):
+        return self._op("returns")
+
+    def log_returns(self):
+        return self._op("log_returns")
+
+    def rolling_mean(self, window):
+        return self._op("rolling_mean", int(window))
+
+    def rolling_vol(self, window):
+        return self._op("rolling_vol", int(window))
+
+    def normalized(self, base=100):
+        # Rebased to the first row of the requested range
+        return self._op("normalized", base)
+
+    def ratio(self, numerator="Gold", denominator="Silver"):
+        return self._with(source=("ratio", numerator, denominator), ops=())
+
+    # Plan
+    def _series(self):
+        """(output name, source key) per output column."""
+        if self._source is not None:
+            _, num, den = self._source
+            return [(f"{num}_{den}_Ratio", self._source)]
+        return [(asset, ("close", asset)) for asset in self._assets]
+
+    def _columns(self):
+        if self._source is not None:
+            return [f"{self._source[1]}_Close", f"{self._source[2]}_Close"]
+        return [f"{asset}_Close" for asset in self._assets]
+
+    def _lookback(self):
+        return sum(OPERATIONS[name][1](*params) for name, params in self._ops if name in OPERATIONS)
+
+    def _names(self):
+        labels = [OPERATIONS[name][2](*params) if name in OPERATIONS else "Normalized"
+                  for name, params in self._ops]
+        names = []
+        for base, source in self._series():
+            if not labels:
+                names.append(base if source[0] == "ratio" else f"{base}_Close")
+            else:
+                names.append("_".join([base] + labels))
+        return names
+
+    def explain(self, *others):
+        """
+        Describe what collect() would read and compute.
+        """
+        plan = _Plan(self._dataset, (self,) + others)
+        lines = [
+            f"scan rows {plan.scan_lo}:{plan.scan_hi} of {len(self._dataset)} "
+            f"({plan.scan_hi - plan.scan_lo} rows, lookback {plan.lookback})",
+            f"scan columns {plan.columns}",
+        ]
+        for query in plan.queries:
+            for name, (_, source) in zip(query._names(), query._series()):
+                steps = " -> ".join(["read " + "/".join(source[1:])]
+                                    + [f"{op}({', '.join(map(str, params))})" for op, params in query._ops])
+                lines.append(f"{name}: {steps}")
+        return "\n".join(lines)
+
+    def collect(self, *others):
+        """
+        Execute this query (and any others over the same dataset) as one plan.
+        Returns a DataFrame with a Date column and one column per output.
+        """
+        return _Plan(self._dataset, (self,) + others).execute()
+
+
+class _Plan:
+    """
+    Merged execution plan for several queries: one scan over the union of
+    their columns and row ranges, and every intermediate (e.g. the returns
+    under several rolling windows) computed once.
+    """
+
+    def __init__(self, dataset, queries):
+        if any(query._dataset is not dataset for query in queries):
+            raise ValueError("All queries in one plan must use the same dataset")
+        self.dataset = dataset
+        self.queries = queries
+
+        self.ranges = [dataset.index_range(query._start, query._end) for query in queries]
+        self.lookback = max(query._lookback() for query in queries)
+        self.scan_lo = max(0, min(lo - query._lookback() for (lo, _), query in zip(self.ranges, queries)))
+        self.scan_hi = max(hi for _, hi in self.ranges)
+        self.columns = sorted({col for query in queries for col in query._columns()})
+
+    def execute(self):
+        # Pushdown: slicing the memory maps reads only these columns and rows
+        scan = {
+            col: np.asarray(self.dataset.column(col)[self.scan_lo: self.scan_hi], dtype=np.float64)
+            for col in self.columns
+        }
+        memo = {}
+
+        def evaluate(source, ops, anchor):
+            key = (source, ops, anchor if any(name == "normalized" for name, _ in ops) else None)
+            if key in memo:
+                return memo[key]
+            if not ops:
+                if source[0] == "ratio":
+                    result = scan[f"{source[1]}_Close"] / scan[f"{source[2]}_Close"]
+                else:
+                    result = scan[f"{source[1]}_Close"]
+            else:
+                (name, params), inner = ops[-1], evaluate(source, ops[:-1], anchor)
+                if name == "normalized":
+                    result = inner / inner[anchor] * params[0]
+                else:
+                    result = OPERATIONS[name][0](inner, *params)
+            memo[key] = result
+            return result
+
+        out_lo = min(lo for lo, _ in self.ranges)
+        data = {"Date": self.dataset.dates[out_lo: self.scan_hi]}
+        for query, (lo, hi) in zip(self.queries, self.ranges):
+            for name, (_, source) in zip(query._names(), query._series()):
+                column = np.full(self.scan_hi - out_lo, np.nan)
+                if hi > lo:
+                    values = evaluate(source, query._ops, lo - self.scan_lo)
+                    column[lo - out_lo: hi - out_lo] = values[lo - self.scan_lo: hi - self.scan_lo]
+                data[name] = column
+        self.evaluated = len(memo)
+        return pd.DataFrame(data)
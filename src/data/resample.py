@@ -0,0 +1,171 @@
+import sys
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.price_store import (
+    CLEANED_CSV, STORE_DIR, day_numbers_to_dates, ensure_column_store, open_column_store, store_version,
+)
+
+# Timeframe code -> pandas resample rule (None = base data as stored)
+TIMEFRAMES = {
+    "D": None,
+    "W": "W-FRI",
+    "M": "ME",
+    "Q": "QE",
+}
+
+# Bar names for chart labels ("20-Day MA", "20-Week MA", ...)
+TIMEFRAME_LABELS = {"D": "Day", "W": "Week", "M": "Month", "Q": "Quarter"}
+TIMEFRAME_ADJECTIVES = {"D": "Daily", "W": "Weekly", "M": "Monthly", "Q": "Quarterly"}
+
+
+def check_timeframe(timeframe):
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"timeframe must be one of {list(TIMEFRAMES)}, got {timeframe!r}")
+    return timeframe
+
+
+def timeframe_suffix(timeframe):
+    """Suffix for output file names; daily keeps the original names."""
+    return "" if timeframe == "D" else f"_{timeframe}"
+
+
+def aggregate_ohlc(base, rule):
+    """
+    Aggregate base rows (DatetimeIndex, <Asset>_Close columns and optional
+    <Asset>_Open/High/Low/Volume) into OHLC bars. Bars are labelled by their
+    period end and close on the right edge, as pandas does for W/ME/QE.
+    """
+    resampler = base.resample(rule)
+    out = {}
+    for close_col in [col for col in base.columns if col.endswith("_Close")]:
+        asset = close_col[: -len("_Close")]
+        opens = base.get(f"{asset}_Open", base[close_col])
+        highs = base.get(f"{asset}_High", base[close_col])
+        lows = base.get(f"{asset}_Low", base[close_col])
+        out[f"{asset}_Open"] = opens.resample(rule).first()
+        out[f"{asset}_High"] = highs.resample(rule).max()
+        out[f"{asset}_Low"] = lows.resample(rule).min()
+        out[close_col] = resampler[close_col].last()
+        if f"{asset}_Volume" in base:
+            out[f"{asset}_Volume"] = base[f"{asset}_Volume"].resample(rule).sum()
+    # Periods without any base rows (e.g. holidays) produce no bar
+    return pd.DataFrame(out).dropna(how="all")
+
+
+class TimeframeCache:
+    """
+    Builds each timeframe from the base data once and keeps it in memory.
+    update() appends new base rows and only recomputes bars from the last
+    (possibly incomplete) period onward.
+    """
+
+    def __init__(self, base):
+        self.base = base.sort_index()
+        self._bars = {}
+
+    def bars(self, timeframe="D"):
+        rule = TIMEFRAMES[check_timeframe(timeframe)]
+        if rule is None:
+            return self.base
+        if timeframe not in self._bars:
+            self._bars[timeframe] = aggregate_ohlc(self.base, rule)
+        return self._bars[timeframe]
+
+    def update(self, new_rows):
+        """
+        Add (or revise) base rows. new_rows has the same columns as the base.
+        """
+        new_rows = new_rows.sort_index()
+        if new_rows.empty:
+            return
+        first_new = new_rows.index[0]
+        merged = pd.concat([self.base, new_rows])
+        self.base = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+        for timeframe, cached in self._bars.items():
+            # Bars are labelled by period end, so a bar labelled before
+            # first_new covers no new rows and is kept as is
+            keep = cached[cached.index < first_new]
+            edge = keep.index[-1] if len(keep) else None
+            tail = self.base if edge is None else self.base[self.base.index > edge]
+            self._bars[timeframe] = pd.concat([keep, aggregate_ohlc(tail, TIMEFRAMES[timeframe])])
+
+    def returns(self, timeframe="D"):
+        closes = self.bars(timeframe).filter(like="_Close")
+        returns = closes.pct_change()
+        returns.columns = [col.replace("_Close", "_Return") for col in closes.columns]
+        return returns
+
+
+def _read_base(store_dir):
+    columns = open_column_store(store_dir)
+    dates = day_numbers_to_dates(columns.pop("Date"))
+    return pd.DataFrame(
+        {col: np.asarray(values) for col, values in columns.items()},
+        index=pd.DatetimeIndex(dates, name="Date"),
+    )
+
+
+def _changed_rows(old, new):
+    """
+    Rows of `new` from the first added or revised date onward (empty if
+    nothing changed), or None if rows or columns were removed.
+    """
+    if list(old.columns) != list(new.columns) or not old.index.isin(new.index).all():
+        return None
+    current = new.reindex(old.index)
+    revised = ~((current == old) | (current.isna() & old.isna())).all(axis=1)
+    changed = old.index[revised].union(new.index.difference(old.index))
+    return new.iloc[:0] if changed.empty else new[new.index >= changed[0]]
+
+
+# store_dir -> (store_version, TimeframeCache)
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_timeframe_cache(csv_path=CLEANED_CSV, store_dir=STORE_DIR):
+    """
+    Process-wide cache over the price store. When the store has been
+    rewritten since the last call, only the added or revised rows are
+    applied with update(); a full rebuild happens only if rows were removed.
+    """
+    with _caches_lock:
+        ensure_column_store(csv_path, store_dir)
+        version = store_version(store_dir)
+        cached_version, cache = _caches.get(store_dir, (None, None))
+        if cached_version != version:
+            base = _read_base(store_dir)
+            changed = None if cache is None else _changed_rows(cache.base, base)
+            if changed is None:
+                cache = TimeframeCache(base)
+            else:
+                cache.update(changed)
+            _caches[store_dir] = (version, cache)
+        return cache
+
+
+def load_prices(timeframe="D"):
+    """
+    Cleaned prices at the requested timeframe, in the cleaned CSV layout
+    (Date column + <Asset>_Close columns, plus OHLC columns for W/M/Q).
+    Returns a new DataFrame, so callers may add columns to it.
+    """
+    return get_timeframe_cache().bars(timeframe).reset_index()
+
+
+def load_returns(timeframe="D"):
+    return get_timeframe_cache().returns(timeframe).reset_index()
+
+
+if __name__ == "__main__":
+    for code, label in TIMEFRAME_LABELS.items():
+        df = load_prices(code)
+        print(f"{label:<8} bars: {len(df):>5}  last: {df['Date'].iloc[-1].date()}")
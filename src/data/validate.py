@@ -0,0 +1,179 @@
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.price_store import load_price_dataset
+
+# Default thresholds
+MAX_GAP_DAYS = 5          # calendar days between observations (weekend + holiday)
+STALE_RUN = 5             # identical consecutive prices
+MAX_ABS_JUMP = 0.25       # |log return| always flagged above this
+OUTLIER_Z = 10.0          # robust z-score of log returns (median / MAD)
+
+CHECKS = ("missing", "gap", "stale", "non_positive", "outlier")
+
+
+# -----------------------------
+# Vectorized helpers
+# -----------------------------
+def _last_valid_index(valid):
+    """
+    For every cell, the row index of the most recent valid cell strictly
+    before it in the same column (-1 if none).
+    """
+    rows = np.arange(len(valid))[:, None]
+    idx = np.where(valid, rows, -1)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    prev = np.full_like(idx, -1)
+    prev[1:] = idx[:-1]
+    return prev
+
+
+def _next_valid_index(valid):
+    """
+    For every cell, the row index of the next valid cell strictly after it
+    in the same column (-1 if none).
+    """
+    nxt = _last_valid_index(valid[::-1])[::-1]
+    return np.where(nxt >= 0, len(valid) - 1 - nxt, -1)
+
+
+class ValidationResult:
+    """
+    Per-check boolean masks (rows x assets, True = flagged) plus a per-asset report.
+    """
+
+    def __init__(self, dates, assets, masks):
+        self.dates = dates
+        self.assets = list(assets)
+        self.masks = masks
+
+    def combined(self, checks=CHECKS):
+        out = np.zeros_like(self.masks["missing"])
+        for check in checks:
+            out |= self.masks[check]
+        return out
+
+    def report(self):
+        rows = len(self.dates)
+        report = pd.DataFrame({"Rows": rows}, index=pd.Index(self.assets, name="Asset"))
+        for check in CHECKS:
+            report[check.title()] = self.masks[check].sum(axis=0)
+        flagged = self.combined(CHECKS[1:]).sum(axis=0)
+        report["Flagged_%"] = flagged / max(rows, 1) * 100
+        return report
+
+    def apply(self, prices, checks=("non_positive", "outlier", "stale")):
+        """
+        Return a copy of `prices` with flagged cells set to NaN.
+        Gaps are informational by default: the observation after a gap is valid.
+        """
+        out = np.array(prices, dtype=np.float64)
+        out[self.combined(checks).reshape(out.shape)] = np.nan
+        return out
+
+    def apply_frame(self, df, checks=("non_positive", "outlier", "stale")):
+        out = df.copy()
+        out[self.assets] = self.apply(df[self.assets].to_numpy(), checks)
+        return out
+
+
+# -----------------------------
+# Validation
+# -----------------------------
+def validate_prices(dates, prices, assets, max_gap_days=MAX_GAP_DAYS, stale_run=STALE_RUN,
+                    max_abs_jump=MAX_ABS_JUMP, outlier_z=OUTLIER_Z):
+    """
+    Run every check over a wide price matrix in one pass of column operations.
+
+    dates:  sorted datetime64 array (rows)
+    prices: float matrix rows x assets, NaN where an asset has no price
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.ndim == 1:
+        prices = prices[:, None]
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    cols = np.arange(prices.shape[1])
+
+    missing = np.isnan(prices)
+    valid = ~missing
+    non_positive = valid & (prices <= 0)
+    usable = valid & ~non_positive
+
+    # Gaps: calendar days since the previous usable observation of the same asset
+    prev = _last_valid_index(usable)
+    has_prev = prev >= 0
+    gap_days = days[:, None] - days[np.maximum(prev, 0)]
+    gap = usable & has_prev & (gap_days > max_gap_days)
+
+    # Stale: length of the run of identical prices ending at each cell
+    prev_price = np.where(has_prev, prices[np.maximum(prev, 0), cols], np.nan)
+    same = usable & (prices == prev_price)
+    run_start = np.where(~same, np.arange(len(prices))[:, None], 0)
+    np.maximum.accumulate(run_start, axis=0, out=run_start)
+    run_len = np.where(usable, np.arange(len(prices))[:, None] - run_start + 1, 0)
+    # Flag the whole run once it reaches stale_run: mark ends, then propagate back
+    stale_end = run_len >= stale_run
+    stale = stale_end.copy()
+    for _ in range(1, stale_run):
+        stale[:-1] |= stale[1:] & same[1:]
+
+    # Outliers: a jump is a log return (vs previous usable price) that is large
+    # in absolute terms or by robust z. A bar is an outlier when it is a spike:
+    # it jumps in and jumps back out (opposite signs), so the bar after a bad
+    # print, and a lasting level shift, are not flagged.
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_ret = np.where(usable & has_prev, np.log(prices / prev_price), np.nan)
+    med = np.nanmedian(log_ret, axis=0)
+    mad = np.nanmedian(np.abs(log_ret - med), axis=0) * 1.4826
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.abs(log_ret - med) / np.where(mad > 0, mad, np.nan)
+    jump = (np.abs(log_ret) > max_abs_jump) | (z > outlier_z)
+
+    nxt = _next_valid_index(usable)
+    has_next = usable & (nxt >= 0)
+    jump_out = np.where(has_next, jump[np.maximum(nxt, 0), cols], False)
+    ret_out = np.where(has_next, log_ret[np.maximum(nxt, 0), cols], np.nan)
+    outlier = jump & jump_out & (np.sign(log_ret) == -np.sign(ret_out))
+
+    masks = {
+        "missing": missing,
+        "gap": gap,
+        "stale": stale,
+        "non_positive": non_positive,
+        "outlier": outlier,
+    }
+    return ValidationResult(np.asarray(dates), assets, masks)
+
+
+def validate_frame(df, assets=None, **thresholds):
+    """
+    Validate a DataFrame with a Date column and one price column per asset.
+    """
+    df = df.sort_values("Date")
+    assets = assets or [col for col in df.columns if col != "Date"]
+    return validate_prices(
+        pd.to_datetime(df["Date"]).to_numpy(), df[assets].to_numpy(dtype=np.float64), assets, **thresholds
+    )
+
+
+def print_validation_report(result, title="Data Quality Report"):
+    print(f"\n{'=' * 60}")
+    print(title)
+    print(f"{'=' * 60}")
+    print(result.report().round(2).to_string())
+    print(f"{'=' * 60}\n")
+
+
+if __name__ == "__main__":
+    dataset = load_price_dataset()
+    columns = [col for col in dataset.columns if col != "Date"]
+    result = validate_prices(
+        dataset.dates, np.column_stack([dataset.column(c) for c in columns]), columns
+    )
+    print_validation_report(result, "Cleaned Dataset – Data Quality Report")
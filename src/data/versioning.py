@@ -0,0 +1,412 @@
+import argparse
+import hashlib
+import json
+import sys
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python src/.../module.py): make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.price_store import CLEANED_CSV, STORE_DIR, write_column_store
+
+# Project paths
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_RAW = BASE_DIR / "data" / "raw"
+VERSIONS_DIR = BASE_DIR / "data" / "versions"
+
+# Versioned datasets -> working files that hold the current version
+DATASETS = {
+    "gold": (DATA_RAW / "gold.csv",),
+    "silver": (DATA_RAW / "silver.csv",),
+    "cleaned": (CLEANED_CSV, STORE_DIR / "meta.json"),
+}
+
+# Every N-th version is stored in full, so rebuilding any version
+# applies at most N - 1 deltas
+SNAPSHOT_EVERY = 10
+# A delta larger than this share of the full table is stored as a snapshot
+MAX_DELTA_SHARE = 0.5
+
+
+# -----------------------------
+# Table <-> arrays
+# -----------------------------
+# A version is a table keyed by date: int32 day numbers plus one float64
+# column per field. Original column dtypes are kept in the manifest.
+def frame_to_table(df):
+    df = df.sort_values("Date")
+    days = pd.to_datetime(df["Date"]).to_numpy(dtype="datetime64[D]").astype(np.int32)
+    columns = [col for col in df.columns if col != "Date"]
+    values = np.column_stack(
+        [pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64) for col in columns]
+    ) if columns else np.empty((len(df), 0))
+    dtypes = {col: str(df[col].dtype) if pd.api.types.is_numeric_dtype(df[col]) else "float64" for col in columns}
+    return days, values, columns, dtypes
+
+
+def table_to_frame(days, values, columns, dtypes):
+    data = {"Date": days.astype("datetime64[D]").astype("datetime64[ns]")}
+    for j, col in enumerate(columns):
+        data[col] = values[:, j].astype(dtypes.get(col, "float64"))
+    return pd.DataFrame(data)
+
+
+def table_digest(days, values, columns):
+    digest = hashlib.sha1(json.dumps(columns).encode())
+    digest.update(np.ascontiguousarray(days).tobytes())
+    digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+# -----------------------------
+# Deltas
+# -----------------------------
+def compute_delta(old_days, old_values, new_days, new_values):
+    """
+    Changes from one table to the next (same columns):
+    added rows, deleted dates and revised cells (date, column, new value).
+    NaN == NaN counts as unchanged.
+    """
+    _, i_old, i_new = np.intersect1d(old_days, new_days, assume_unique=True, return_indices=True)
+    before, after = old_values[i_old], new_values[i_new]
+    changed = (before != after) & ~(np.isnan(before) & np.isnan(after))
+    rows, cols = np.nonzero(changed)
+
+    added = ~np.isin(new_days, old_days, assume_unique=True)
+    return {
+        "add_days": new_days[added],
+        "add_values": new_values[added],
+        "del_days": np.setdiff1d(old_days, new_days, assume_unique=True),
+        "rev_days": new_days[i_new[rows]],
+        "rev_cols": cols.astype(np.int16),
+        "rev_values": after[rows, cols],
+    }
+
+
+def apply_delta(days, values, delta):
+    keep = ~np.isin(days, delta["del_days"], assume_unique=True)
+    days, values = days[keep], values[keep].copy()
+
+    # Dates are sorted, so revised cells are located by binary search
+    rows = np.searchsorted(days, delta["rev_days"])
+    values[rows, delta["rev_cols"]] = delta["rev_values"]
+
+    days = np.concatenate([days, delta["add_days"]])
+    values = np.concatenate([values, delta["add_values"]])
+    order = np.argsort(days, kind="stable")
+    return days[order], values[order]
+
+
+def _delta_cells(delta):
+    return delta["add_values"].size + len(delta["del_days"]) + len(delta["rev_values"])
+
+
+# -----------------------------
+# Version history of one dataset
+# -----------------------------
+class DatasetVersions:
+    """
+    Version history of one dataset in data/versions/<name>/:
+        manifest.json   list of versions, newest last
+        v0001.npz       full snapshot (kind "snapshot")
+        v0002.npz       changes against v0001 (kind "delta")
+    """
+
+    def __init__(self, name, root=VERSIONS_DIR):
+        if name not in DATASETS:
+            raise ValueError(f"dataset must be one of {list(DATASETS)}, got {name!r}")
+        self.name = name
+        self.dir = Path(root) / name
+        self._tables = {}
+
+    # Manifest
+    def manifest(self):
+        path = self.dir / "manifest.json"
+        if not path.exists():
+            return {"dataset": self.name, "versions": [], "working": None}
+        return json.loads(path.read_text())
+
+    def _save_manifest(self, manifest):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.dir / "manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2))
+        tmp.replace(self.dir / "manifest.json")
+
+    def versions(self):
+        return self.manifest()["versions"]
+
+    def head(self):
+        versions = self.versions()
+        return versions[-1]["id"] if versions else None
+
+    def _entry(self, version):
+        versions = self.versions()
+        if not versions:
+            raise ValueError(f"No versions recorded for {self.name!r}")
+        if version is None:
+            return len(versions) - 1, versions[-1]
+        for i, entry in enumerate(versions):
+            if entry["id"] == version:
+                return i, entry
+        raise ValueError(f"Unknown version {version!r} of {self.name!r}")
+
+    # Working files
+    def _stamp(self):
+        stamp = []
+        for path in DATASETS[self.name]:
+            stat = path.stat() if path.exists() else None
+            stamp.append([path.name, stat.st_size, stat.st_mtime_ns] if stat else [path.name, None, None])
+        return stamp
+
+    def mark_working(self, version):
+        """
+        Record that the working files now hold `version`.
+        Call after writing them; any later edit makes them "unversioned".
+        """
+        manifest = self.manifest()
+        manifest["working"] = {"version": version, "stamp": self._stamp()}
+        self._save_manifest(manifest)
+
+    def working_version(self):
+        working = self.manifest().get("working")
+        if working and working["stamp"] == self._stamp():
+            return working["version"]
+        return None
+
+    # Write
+    def commit(self, df, note=""):
+        """
+        Record `df` (Date column + value columns) as a new version.
+        Stores only the changes against the previous version, except every
+        SNAPSHOT_EVERY-th version, on a column change, or for large deltas.
+        Returns the version id; an unchanged table returns the current head.
+        """
+        days, values, columns, dtypes = frame_to_table(df)
+        if len(np.unique(days)) != len(days):
+            raise ValueError(f"{self.name}: dates must be unique to version a dataset")
+
+        manifest = self.manifest()
+        versions = manifest["versions"]
+        digest = table_digest(days, values, columns)
+        if versions and versions[-1]["digest"] == digest:
+            return versions[-1]["id"]
+
+        version = f"v{len(versions) + 1:04d}"
+        entry = {
+            "id": version,
+            "parent": versions[-1]["id"] if versions else None,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "note": note,
+            "rows": int(len(days)),
+            "columns": columns,
+            "dtypes": dtypes,
+            "digest": digest,
+        }
+
+        delta = None
+        if versions and versions[-1]["columns"] == columns and len(versions) % SNAPSHOT_EVERY:
+            old_days, old_values = self._table(len(versions) - 1, versions)
+            delta = compute_delta(old_days, old_values, days, values)
+            if _delta_cells(delta) > MAX_DELTA_SHARE * max(values.size, 1):
+                delta = None
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        if delta is None:
+            entry["kind"] = "snapshot"
+            np.savez_compressed(self.dir / f"{version}.npz", days=days, values=values)
+        else:
+            entry["kind"] = "delta"
+            entry["added"] = int(len(delta["add_days"]))
+            entry["deleted"] = int(len(delta["del_days"]))
+            entry["revised"] = int(len(delta["rev_values"]))
+            np.savez_compressed(self.dir / f"{version}.npz", **delta)
+
+        versions.append(entry)
+        self._save_manifest(manifest)
+        self._tables[version] = (days, values)
+        return version
+
+    # Read
+    def _table(self, index, versions):
+        version = versions[index]["id"]
+        if version in self._tables:
+            return self._tables[version]
+
+        # Walk back to the nearest snapshot (or cached table), then replay deltas
+        start = index
+        while versions[start]["kind"] != "snapshot" and versions[start]["id"] not in self._tables:
+            start -= 1
+        if versions[start]["id"] in self._tables:
+            days, values = self._tables[versions[start]["id"]]
+        else:
+            with np.load(self.dir / f"{versions[start]['id']}.npz") as snapshot:
+                days, values = snapshot["days"], snapshot["values"]
+        for entry in versions[start + 1: index + 1]:
+            with np.load(self.dir / f"{entry['id']}.npz") as delta:
+                days, values = apply_delta(days, values, dict(delta))
+
+        self._tables[version] = (days, values)
+        return days, values
+
+    def load(self, version=None):
+        """
+        Rebuild a version (default: latest) as a DataFrame.
+        """
+        index, entry = self._entry(version)
+        days, values = self._table(index, self.versions())
+        return table_to_frame(days, values, entry["columns"], entry["dtypes"])
+
+    def diff(self, old, new):
+        """
+        Summary of changes between any two versions.
+        """
+        versions = self.versions()
+        old_days, old_values = self._table(self._entry(old)[0], versions)
+        new_days, new_values = self._table(self._entry(new)[0], versions)
+        if self._entry(old)[1]["columns"] != self._entry(new)[1]["columns"]:
+            return {"columns_changed": True}
+        delta = compute_delta(old_days, old_values, new_days, new_values)
+        return {
+            "added": int(len(delta["add_days"])),
+            "deleted": int(len(delta["del_days"])),
+            "revised": int(len(delta["rev_values"])),
+        }
+
+    def disk_usage(self):
+        return sum(path.stat().st_size for path in self.dir.glob("*.npz"))
+
+
+# -----------------------------
+# Dataset-level helpers
+# -----------------------------
+def commit_version(name, df, note=""):
+    """
+    Record a freshly written dataset and mark its working files as that version.
+    """
+    history = DatasetVersions(name)
+    version = history.commit(df, note)
+    history.mark_working(version)
+    return version
+
+
+def read_working(name):
+    """
+    Current working files of a dataset as a DataFrame.
+    """
+    if name == "cleaned":
+        return pd.read_csv(CLEANED_CSV, parse_dates=["Date"])
+    # Raw yfinance CSVs carry extra header rows; imported here to avoid a cycle
+    from src.data.clean_data import load_yfinance_csv
+
+    return load_yfinance_csv(DATASETS[name][0])
+
+
+def working_version(name):
+    """
+    Version held by the dataset's working files, or None if they were
+    modified outside of versioning.
+    """
+    return DatasetVersions(name).working_version()
+
+
+def checkout(name, version):
+    """
+    Rewrite the working files of a dataset with a historical version.
+    """
+    history = DatasetVersions(name)
+    df = history.load(version)
+    version = history._entry(version)[1]["id"]
+
+    if name == "cleaned":
+        out = df.copy()
+        out["Date"] = out["Date"].dt.strftime("%Y-%m-%d")
+        out.to_csv(CLEANED_CSV, index=False)
+        # Store written after the CSV, so it is not considered stale
+        write_column_store(df, STORE_DIR)
+    else:
+        out = df.set_index("Date")
+        out.index = out.index.strftime("%Y-%m-%d")
+        out.to_csv(DATASETS[name][0])
+
+    history.mark_working(version)
+    return version
+
+
+def data_versions(datasets=("cleaned",)):
+    """
+    {dataset: version} for the working files a run reads.
+    """
+    return {name: working_version(name) or "unversioned" for name in datasets}
+
+
+def record_run(output_path, versions, **details):
+    """
+    Write <output>.version.json next to a backtest output, naming the
+    dataset versions it ran on (see data_versions).
+    """
+    output_path = Path(output_path)
+    record = {
+        "output": output_path.name,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "datasets": versions,
+        **details,
+    }
+    record_path = output_path.with_suffix(".version.json")
+    record_path.write_text(json.dumps(record, indent=2, default=str))
+    return record_path
+
+
+def format_versions(used):
+    return ", ".join(f"{name}@{version}" for name, version in used.items())
+
+
+# -----------------------------
+# Run (version tool)
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and restore dataset versions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    log = sub.add_parser("log", help="list versions")
+    log.add_argument("dataset", choices=list(DATASETS))
+
+    diff = sub.add_parser("diff", help="changes between two versions")
+    diff.add_argument("dataset", choices=list(DATASETS))
+    diff.add_argument("old")
+    diff.add_argument("new")
+
+    record = sub.add_parser("commit", help="record the current working files as a version")
+    record.add_argument("dataset", choices=list(DATASETS))
+    record.add_argument("--note", default="manual commit")
+
+    restore = sub.add_parser("checkout", help="rewrite the working files with a version")
+    restore.add_argument("dataset", choices=list(DATASETS))
+    restore.add_argument("version")
+
+    args = parser.parse_args(argv)
+    history = DatasetVersions(args.dataset)
+
+    if args.command == "log":
+        working = history.working_version()
+        print(f"{'Version':<9}{'Kind':<10}{'Rows':>7}{'Added':>7}{'Revised':>9}{'Deleted':>9}  Created")
+        print("-" * 72)
+        for entry in history.versions():
+            marker = " *" if entry["id"] == working else ""
+            print(f"{entry['id']:<9}{entry['kind']:<10}{entry['rows']:>7}{entry.get('added', '-'):>7}"
+                  f"{entry.get('revised', '-'):>9}{entry.get('deleted', '-'):>9}  {entry['created']}{marker}")
+        print(f"\nWorking files: {working or 'unversioned'} | history on disk: {history.disk_usage() / 1024:.1f} KiB")
+    elif args.command == "commit":
+        version = commit_version(args.dataset, read_working(args.dataset), args.note)
+        print(f"{args.dataset} working files recorded as {version}")
+    elif args.command == "diff":
+        print(json.dumps(history.diff(args.old, args.new), indent=2))
+    else:
+        print(f"{args.dataset} working files restored to {checkout(args.dataset, args.version)}")
+
+
+if __name__ == "__main__":
+    main()
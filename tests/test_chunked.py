@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.chunked import compute_derived_store, in_memory_reference
+from src.data.price_store import open_column_store, read_store_meta, write_column_store
+
+N_ROWS = 300
+WINDOW, VOL_WINDOW = 20, 30
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    gold = 1800 * np.exp(np.cumsum(rng.normal(0, 0.01, N_ROWS)))
+    silver = 22 * np.exp(np.cumsum(rng.normal(0, 0.02, N_ROWS)))
+    # NaN runs that cross chunk boundaries (and one longer than a window)
+    gold[20:31] = np.nan
+    gold[140:175] = np.nan
+    silver[49:52] = np.nan
+    store_dir = tmp_path_factory.mktemp("store")
+    write_column_store(pd.DataFrame({
+        "Date": pd.bdate_range("2020-01-01", periods=N_ROWS),
+        "Gold_Close": gold,
+        "Silver_Close": silver,
+    }), store_dir)
+    return store_dir
+
+
+# 1 row, smaller than the window, splitting windows, larger than the store
+@pytest.mark.parametrize("chunk_size", [1, 7, 25, 1_000])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunked_matches_in_memory_exactly(store, tmp_path, chunk_size, workers):
+    output_dir = compute_derived_store(store, tmp_path / "derived", window=WINDOW, vol_window=VOL_WINDOW,
+                                       chunk_size=chunk_size, workers=workers)
+    chunked = open_column_store(output_dir)
+    reference = in_memory_reference(store, window=WINDOW, vol_window=VOL_WINDOW)
+
+    assert read_store_meta(output_dir)["rows"] == N_ROWS
+    np.testing.assert_array_equal(chunked["Date"], open_column_store(store)["Date"])
+    assert set(reference) <= set(chunked)
+    for name, values in reference.items():
+        assert np.array_equal(chunked[name], values, equal_nan=True), name
+    # Sanity: the NaN runs reach the outputs, and values resume after them
+    assert np.isnan(chunked["Gold_MA_20"][31 + WINDOW - 2])
+    assert np.isfinite(chunked["Gold_MA_20"][31 + WINDOW - 1])
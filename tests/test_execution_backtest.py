@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from src.analysis.execution_backtest import simulate_execution, simulate_execution_reference, synthetic_bars
+
+CHUNK_SIZES = (1, 7, 64, 1_000, 1_000_000)
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"sizing": "fixed_units", "sizing_value": 20, "participation": 0.2},
+    {"sizing": "risk_per_trade", "sizing_value": 0.02, "window": 10, "stop_k": 2.5},
+])
+def test_chunked_simulation_matches_per_bar_reference(params):
+    bars = synthetic_bars(5_000, seed=3)
+    ref_equity, ref_fills = simulate_execution_reference(*bars, **params)
+    assert len(ref_fills) > 20
+    assert (ref_fills["side"] < 0).any()
+
+    for chunk_size in CHUNK_SIZES:
+        equity, fills = simulate_execution(*bars, chunk_size=chunk_size, **params)
+        assert np.array_equal(fills, ref_fills), chunk_size
+        assert np.array_equal(equity, ref_equity), chunk_size
+
+
+def test_large_orders_fill_partially_over_several_bars():
+    bars = synthetic_bars(5_000, seed=3)
+    _, fills = simulate_execution(*bars, sizing="fixed_units", sizing_value=2_000, participation=0.05)
+    buys = fills["side"] > 0
+    # Consecutive buy fills belong to one entry order
+    assert (buys[1:] & buys[:-1]).any()
+    assert set(np.unique(fills["reason"])) >= {0, 1}
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.holding_period import HoldingPeriods
+
+
+@pytest.fixture
+def curves():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    dates = pd.bdate_range("2018-01-01", periods=n)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    equity = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.008, n)))
+    return dates, prices, equity
+
+
+def test_returns_match_direct_price_ratios(curves):
+    dates, prices, equity = curves
+    periods = HoldingPeriods(dates, {"prices": prices, "equity": equity})
+    rng = np.random.default_rng(1)
+    i, j = np.sort(rng.integers(0, len(prices), (2, 500)), axis=0)
+
+    np.testing.assert_allclose(periods.total_return("prices", i, j), prices[j] / prices[i] - 1, rtol=1e-9, atol=1e-12)
+    years = (j - i) / 252
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = np.where(years > 0, (prices[j] / prices[i]) ** (1 / years) - 1, np.nan)
+    np.testing.assert_allclose(periods.annualized_return("prices", i, j), expected, rtol=1e-9, atol=1e-12)
+
+    # Dates between rows fall back to the last close on or before them
+    start, end = dates[100] + pd.Timedelta(hours=12), dates[600]
+    assert periods.between("equity", start, end) == pytest.approx(equity[600] / equity[100] - 1, rel=1e-9)
+
+
+def test_window_stats_beat_share_matches_brute_force(curves):
+    dates, prices, equity = curves
+    periods = HoldingPeriods(dates, {"prices": prices, "equity": equity})
+    horizons = {"1M": 21, "1Y": 252}
+    stats = periods.window_stats("equity", horizons, benchmark="prices")
+
+    for label, h in horizons.items():
+        beat = [equity[s + h] / equity[s] > prices[s + h] / prices[s] for s in range(len(prices) - h)]
+        assert stats.loc[label, "Windows"] == len(beat)
+        assert stats.loc[label, "Beat_Benchmark_%"] == pytest.approx(np.mean(beat) * 100)
+        positive = [equity[s + h] / equity[s] > 1 for s in range(len(prices) - h)]
+        assert stats.loc[label, "Positive_%"] == pytest.approx(np.mean(positive) * 100)
+
+
+def test_matrix_is_downsampled(curves):
+    dates, prices, _ = curves
+    periods = HoldingPeriods(dates, {"prices": prices})
+    matrix = periods.matrix("prices", points=50, annualized=False)
+
+    assert matrix.shape == (50, 50)
+    idx = periods.grid(50)
+    a, b = 10, 40
+    assert matrix.iloc[a, b] == pytest.approx(prices[idx[b]] / prices[idx[a]] - 1, rel=1e-9)
+    assert np.isnan(matrix.iloc[b, a]) and np.isnan(matrix.iloc[a, a])
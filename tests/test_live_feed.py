@@ -0,0 +1,174 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from src.data.live_feed import (
+    CsvTickSink, DailyCloseSink, IngestionService, JsonLinesFeed, PriceRingBuffer,
+    TICK_DTYPE, run_simulated_feed_server,
+)
+from src.data.price_store import open_column_store
+from src.data.versioning import DatasetVersions
+
+
+def _seed_cleaned_csv(path):
+    pd.DataFrame({
+        "Date": ["2024-01-02", "2024-01-03"],
+        "Gold_Close": [2050.0, 2040.0],
+        "Silver_Close": [23.5, 23.1],
+    }).to_csv(path, index=False)
+
+
+def _sink(tmp_path, cleaned):
+    return DailyCloseSink(cleaned, store_dir=tmp_path / "store", versions=DatasetVersions("cleaned", tmp_path / "versions"))
+
+
+def _batch(ticks):
+    """ticks: (day, asset index, price) -> TICK_DTYPE records."""
+    return np.array([(pd.Timestamp(day).value, asset, price, 1.0) for day, asset, price in ticks], dtype=TICK_DTYPE)
+
+
+def test_simulated_feed_into_buffer_and_sinks(tmp_path):
+    cleaned = tmp_path / "gold_silver_cleaned.csv"
+    _seed_cleaned_csv(cleaned)
+
+    async def run():
+        server = await run_simulated_feed_server(port=0, interval=0.01, seed=1)
+        port = server.sockets[0].getsockname()[1]
+        buffer = PriceRingBuffer.create(capacity=4_096)
+        try:
+            service = IngestionService(
+                [JsonLinesFeed(port=port)], buffer,
+                sinks=[CsvTickSink(tmp_path / "ticks"), _sink(tmp_path, cleaned)],
+                batch_size=50, flush_interval=0.2,
+            )
+            await service.run(duration=1.0)
+            latest = {asset: buffer.latest(idx) for idx, asset in enumerate(service.assets)}
+            return service, buffer.seq, latest
+        finally:
+            server.close()
+            await server.wait_closed()
+            buffer.close()
+
+    service, seq, latest = asyncio.run(run())
+
+    assert service.ticks_received > 0
+    assert seq == service.ticks_received == service.flushed_seq
+    assert service.messages_malformed == 0
+
+    # Every flushed tick is in the raw tick files, in order
+    ticks = {asset: pd.read_csv(tmp_path / "ticks" / f"{asset.lower()}.csv") for asset in ("Gold", "Silver")}
+    assert sum(len(df) for df in ticks.values()) == service.ticks_received
+    for asset, df in ticks.items():
+        assert pd.to_datetime(df["Timestamp"]).is_monotonic_increasing
+        assert df["Price"].iloc[-1] == latest[asset]["price"]
+
+    # Each day both assets ticked on was appended to the cleaned dataset
+    days = [set(pd.to_datetime(df["Timestamp"]).dt.strftime("%Y-%m-%d")) for df in ticks.values()]
+    df = pd.read_csv(cleaned)
+    assert list(df["Date"]) == ["2024-01-02", "2024-01-03"] + sorted(days[0] & days[1])
+    assert not df.isna().any().any()
+    assert df["Gold_Close"].iloc[-1] == latest["Gold"]["price"]
+    assert df["Silver_Close"].iloc[-1] == latest["Silver"]["price"]
+
+
+def test_daily_close_sink_holds_back_incomplete_days(tmp_path):
+    cleaned = tmp_path / "gold_silver_cleaned.csv"
+    _seed_cleaned_csv(cleaned)
+    sink = _sink(tmp_path, cleaned)
+    assets = ["Gold", "Silver"]
+
+    # Silver only on a new day: existing day updated, new day held back
+    sink(_batch([("2024-01-03 15:00", 1, 23.4), ("2024-01-04 10:00", 1, 23.8)]), assets)
+    df = pd.read_csv(cleaned)
+    assert list(df["Date"]) == ["2024-01-02", "2024-01-03"]
+    assert df["Silver_Close"].iloc[-1] == 23.4
+    assert sink.pending
+
+    # Gold arrives in a later flush: the day is complete and written
+    sink(_batch([("2024-01-04 11:00", 0, 2060.0)]), assets)
+    df = pd.read_csv(cleaned)
+    assert list(df["Date"]) == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert df.iloc[-1][["Gold_Close", "Silver_Close"]].tolist() == [2060.0, 23.8]
+    assert not sink.pending
+
+
+def test_daily_close_sink_validates_writes_atomically_and_versions(tmp_path):
+    cleaned = tmp_path / "gold_silver_cleaned.csv"
+    _seed_cleaned_csv(cleaned)
+    sink = _sink(tmp_path, cleaned)
+    assets = ["Gold", "Silver"]
+
+    # A non-positive close is rejected; the valid day is appended
+    sink(_batch([("2024-01-04", 0, 2060.0), ("2024-01-04", 1, 23.8),
+                 ("2024-01-05", 0, 2065.0), ("2024-01-05", 1, -1.0)]), assets)
+    assert sink.rows_rejected == 1
+    df = pd.read_csv(cleaned, parse_dates=["Date"])
+    assert list(df["Date"].dt.strftime("%Y-%m-%d")) == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert [path.name for path in tmp_path.glob("*.tmp")] == []
+
+    # Store and version follow the CSV
+    store = open_column_store(tmp_path / "store")
+    np.testing.assert_array_equal(store["Gold_Close"], df["Gold_Close"])
+    history = DatasetVersions("cleaned", tmp_path / "versions")
+    assert sink.version == history.head() == "v0001"
+    pd.testing.assert_frame_equal(history.load(), df, check_dtype=False)
+
+    # Nothing changed: no rewrite, no new version
+    mtime = cleaned.stat().st_mtime_ns
+    sink(_batch([("2024-01-04", 0, 2060.0)]), assets)
+    assert cleaned.stat().st_mtime_ns == mtime and history.head() == "v0001"
+
+    # A revised close is a new version
+    sink(_batch([("2024-01-04", 0, 2061.0)]), assets)
+    assert history.head() == "v0002"
+    assert history.diff("v0001", "v0002") == {"added": 0, "deleted": 0, "revised": 1}
+
+
+def test_malformed_messages_are_counted_and_skipped():
+    class ListFeed(JsonLinesFeed):
+        def __init__(self, lines):
+            super().__init__()
+            self.lines = lines
+
+        async def stream(self):
+            for line in self.lines:
+                yield line
+
+    lines = [
+        b'{"symbol": "GC=F", "ts": 1, "price": 2000}',
+        b"not json",
+        b'{"symbol": "GC=F", "price": 2001}',
+        b'{"symbol": "SI=F", "ts": 2, "price": "abc"}',
+        b"[1, 2]",
+        b'{"symbol": "SI=F", "ts": 3, "price": 25}',
+    ]
+    buffer = PriceRingBuffer.create(capacity=16)
+    try:
+        service = IngestionService([ListFeed(lines)], buffer, sinks=[])
+        asyncio.run(service.run(duration=0.1))
+        assert service.ticks_received == 2
+        assert service.messages_malformed == 4
+        assert buffer.latest(1)["price"] == 25.0
+    finally:
+        buffer.close()
+
+
+def test_ring_buffer_latest_ignores_unwritten_slots():
+    buffer = PriceRingBuffer.create(capacity=8)
+    try:
+        assert buffer.latest() is None
+        assert buffer.views_since(0) == ([], 0, 0)
+
+        buffer.write(1, 1, 25.0)
+        assert buffer.latest(0) is None
+        assert buffer.latest(1)["price"] == 25.0
+
+        for i in range(20):
+            buffer.write(i, i % 2, float(i + 1))
+        assert buffer.latest(0)["price"] == 19.0
+        views, end, lost = buffer.views_since(0)
+        assert sum(len(view) for view in views) == 8
+        assert (end, lost) == (21, 13)
+    finally:
+        buffer.close()
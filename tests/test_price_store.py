@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.price_store import (
+    PriceDataset, ensure_column_store, open_column_store, read_store_meta, store_to_csv, store_to_frame,
+    store_version, write_column_store,
+)
+
+
+def _frame(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Date": pd.bdate_range("1999-12-28", periods=n).astype("datetime64[ns]"),
+        "Gold_Close": 1800 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+        "Silver_Close": 22 * np.exp(np.cumsum(rng.normal(0, 0.02, n))),
+    })
+    df.loc[[5, 6, 50], "Silver_Close"] = np.nan
+    return df
+
+
+def test_float64_round_trip_is_exact(tmp_path):
+    df = _frame()
+    write_column_store(df, tmp_path)
+
+    meta = read_store_meta(tmp_path)
+    assert meta["rows"] == len(df) and meta["price_dtype"] == "float64"
+    assert meta["columns"] == ["Date", "Gold_Close", "Silver_Close"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "Date.npy", "Gold_Close.npy", "Silver_Close.npy", "meta.json"]
+
+    columns = open_column_store(tmp_path)
+    assert columns["Date"].dtype == np.int32
+    assert columns["Date"][0] == (pd.Timestamp("1999-12-28") - pd.Timestamp("1970-01-01")).days
+    assert isinstance(columns["Gold_Close"], np.memmap)
+    pd.testing.assert_frame_equal(store_to_frame(tmp_path), df, check_freq=False)
+
+
+def test_float32_option(tmp_path):
+    df = _frame()
+    write_column_store(df, tmp_path, price_dtype="float32")
+
+    columns = open_column_store(tmp_path, ["Silver_Close"])
+    assert list(columns) == ["Silver_Close"] and columns["Silver_Close"].dtype == np.float32
+    np.testing.assert_array_equal(np.isnan(columns["Silver_Close"]), df["Silver_Close"].isna())
+    np.testing.assert_allclose(columns["Silver_Close"], df["Silver_Close"], rtol=1e-7)
+
+    with pytest.raises(ValueError, match="price_dtype"):
+        write_column_store(df, tmp_path, price_dtype="float16")
+
+
+def test_dataset_dates_and_ranges(tmp_path):
+    df = _frame()
+    write_column_store(df, tmp_path)
+    dataset = PriceDataset(open_column_store(tmp_path))
+
+    assert len(dataset) == len(df)
+    np.testing.assert_array_equal(dataset.dates, df["Date"].to_numpy())
+    assert dataset.index_range("2000-01-03", "2000-01-07") == (4, 9)
+    view = dataset.view("2000-01-03", "2000-01-07")
+    np.testing.assert_array_equal(view.column("Gold_Close"), df["Gold_Close"].iloc[4:9])
+
+
+def test_rewrite_changes_version_and_keeps_open_maps(tmp_path):
+    write_column_store(_frame(120), tmp_path)
+    version = store_version(tmp_path)
+    assert store_version(tmp_path) == version
+    old = open_column_store(tmp_path)["Gold_Close"]
+    first = float(old[0])
+
+    write_column_store(_frame(80, seed=1), tmp_path)
+    assert store_version(tmp_path) != version
+    assert not list(tmp_path.glob("*.tmp"))
+    # The old map still reads the old (complete) column
+    assert len(old) == 120 and old[0] == first
+    assert len(open_column_store(tmp_path)["Gold_Close"]) == 80
+
+
+def test_csv_round_trip_and_stale_rebuild(tmp_path):
+    store, csv = tmp_path / "store", tmp_path / "cleaned.csv"
+    df = _frame()
+    write_column_store(df, store)
+    store_to_csv(store, csv)
+    back = pd.read_csv(csv, parse_dates=["Date"]).astype({"Date": "datetime64[ns]"})
+    pd.testing.assert_frame_equal(back, df, check_freq=False)
+
+    # A CSV newer than the store triggers a rebuild
+    shorter = df.iloc[:60].copy()
+    shorter["Date"] = shorter["Date"].dt.strftime("%Y-%m-%d")
+    shorter.to_csv(csv, index=False)
+    meta_mtime = (store / "meta.json").stat().st_mtime
+    os.utime(csv, (meta_mtime + 10, meta_mtime + 10))
+    ensure_column_store(csv, store)
+    assert read_store_meta(store)["rows"] == 60
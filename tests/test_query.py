@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.price_store import PriceDataset, open_column_store, write_column_store
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    n = 400
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2022-01-03", periods=n),
+        "Gold_Close": 1800 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+        "Silver_Close": 22 * np.exp(np.cumsum(rng.normal(0, 0.02, n))),
+    })
+
+
+@pytest.fixture(scope="module")
+def dataset(frame, tmp_path_factory):
+    store_dir = tmp_path_factory.mktemp("store")
+    write_column_store(frame, store_dir)
+    return PriceDataset(open_column_store(store_dir))
+
+
+def _expected(frame, start, end):
+    full = frame.set_index("Date")
+    ratio = full["Gold_Close"] / full["Silver_Close"]
+    expected = pd.DataFrame({
+        "Gold_Return_Vol_30": full["Gold_Close"].pct_change().rolling(30).std(),
+        "Silver_Return_Vol_30": full["Silver_Close"].pct_change().rolling(30).std(),
+        "Silver_Return_Vol_10": full["Silver_Close"].pct_change().rolling(10).std(),
+        "Gold_Silver_Ratio_MA_5": ratio.rolling(5).mean(),
+    }).loc[start:end]
+    in_range = full.loc[start:end]
+    for asset in ("Gold", "Silver"):
+        expected[f"{asset}_Normalized"] = in_range[f"{asset}_Close"] / in_range[f"{asset}_Close"].iloc[0] * 100
+    return expected
+
+
+# Ranges starting well inside the data, within the lookback, and at row 0
+@pytest.mark.parametrize("start, end", [("2022-09-01", "2023-03-31"), ("2022-01-20", "2022-06-30"), (None, None)])
+def test_collect_matches_pandas_on_full_frame(frame, dataset, start, end):
+    q = dataset.between(start, end)
+    silver = q.assets(["Silver"])
+    result = q.returns().rolling_vol(30).collect(silver.returns().rolling_vol(10),
+                                                 q.ratio().rolling_mean(5), q.normalized())
+
+    expected = _expected(frame, start, end)
+    assert result["Date"].tolist() == expected.index.tolist()
+    assert sorted(result.columns) == sorted(["Date", *expected.columns])
+    for name in expected.columns:
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-9, err_msg=name)
+    # Lookback rows before the range were scanned: values start on the first
+    # row of the range, or on row 30 of the data when the range starts earlier
+    first_vol = result["Gold_Return_Vol_30"].first_valid_index()
+    assert result["Date"][first_vol] == max(result["Date"][0], frame["Date"][30])
+
+
+def test_empty_date_range(dataset):
+    q = dataset.between("2030-01-01", "2030-12-31")
+    result = q.returns().rolling_vol(30).collect(q.ratio())
+    assert len(result) == 0
+    assert list(result.columns) == ["Date", "Gold_Return_Vol_30", "Silver_Return_Vol_30", "Gold_Silver_Ratio"]
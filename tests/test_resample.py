@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from src.data.price_store import write_column_store
+from src.data.resample import TIMEFRAMES, aggregate_ohlc, get_timeframe_cache
+
+
+def _prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2023-01-02", periods=n).astype("datetime64[ns]"),
+        "Gold_Close": 1800 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+        "Silver_Close": 22 * np.exp(np.cumsum(rng.normal(0, 0.02, n))),
+    })
+
+
+def _expected(df, timeframe):
+    return aggregate_ohlc(df.set_index("Date"), TIMEFRAMES[timeframe])
+
+
+def test_cache_follows_store_updates(tmp_path):
+    store, csv = tmp_path / "store", tmp_path / "missing.csv"
+    df = _prices(400)
+    write_column_store(df.iloc[:300], store)
+
+    cache = get_timeframe_cache(csv, store)
+    for timeframe in ("W", "M", "Q"):
+        pd.testing.assert_frame_equal(cache.bars(timeframe), _expected(df.iloc[:300], timeframe), check_freq=False)
+
+    # New rows plus a revision inside the last month: updated in place
+    updated = df.copy()
+    updated.loc[290, "Gold_Close"] *= 1.01
+    write_column_store(updated, store)
+    assert get_timeframe_cache(csv, store) is cache
+    for timeframe in ("W", "M", "Q"):
+        pd.testing.assert_frame_equal(cache.bars(timeframe), _expected(updated, timeframe), check_freq=False)
+    assert cache.bars("D")["Gold_Close"].iloc[-1] == updated["Gold_Close"].iloc[-1]
+
+    # Unchanged store: same cache, nothing recomputed
+    assert get_timeframe_cache(csv, store) is cache
+
+    # Rows removed: rebuilt from the store
+    write_column_store(updated.iloc[:200], store)
+    rebuilt = get_timeframe_cache(csv, store)
+    assert rebuilt is not cache
+    pd.testing.assert_frame_equal(rebuilt.bars("M"), _expected(updated.iloc[:200], "M"), check_freq=False)
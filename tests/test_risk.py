@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.risk import SortedWindow, equity_var_es, rolling_historical_var_es
+
+
+def _returns(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = pd.Series(rng.standard_t(4, n) * 0.01, index=pd.bdate_range("2020-01-01", periods=n))
+    returns.iloc[[0, 50, 51, 52, 300]] = np.nan
+    returns.iloc[400:440] = np.nan
+    return returns
+
+
+def test_sorted_window_matches_pandas_and_sorted_tail():
+    values = _returns().dropna().to_numpy()
+    window, q = 60, 0.05
+    expected_quantile = pd.Series(values).rolling(window).quantile(q).to_numpy()
+
+    sorted_window = SortedWindow(window)
+    for i, value in enumerate(values):
+        sorted_window.push(value)
+        if not sorted_window.full:
+            assert i < window - 1
+            continue
+        tail = np.sort(values[i - window + 1: i + 1])[: int(np.ceil(q * window))]
+        assert np.isclose(sorted_window.quantile(q), expected_quantile[i], rtol=1e-12, atol=0)
+        assert np.isclose(sorted_window.tail_mean(q), tail.mean(), rtol=1e-12, atol=0)
+
+
+def test_historical_var_es_skips_nan_gaps():
+    returns = _returns()
+    result = rolling_historical_var_es(returns, windows=(60,), levels=(0.95,))
+    clean = returns.dropna()
+
+    assert result.index.equals(returns.index)
+    assert result.loc[returns.isna(), "VaR_95_60"].isna().all()
+    expected = -clean.rolling(60).quantile(0.05)
+    np.testing.assert_allclose(result["VaR_95_60"].dropna(), expected.dropna(), rtol=1e-12)
+
+
+def test_equity_var_es_uses_in_position_bars_only():
+    returns = _returns().fillna(0.0)
+    held = np.arange(len(returns)) % 3 != 0
+    equity = 100 * np.cumprod(1 + np.where(held, returns, 0.0))
+
+    result = equity_var_es(equity, windows=(60,), levels=(0.95,), held=held)
+    in_position = pd.Series(equity).pct_change()[held].dropna()
+    expected = -in_position.rolling(60).quantile(0.05).dropna()
+    np.testing.assert_allclose(result["VaR_95_60"].dropna(), expected, rtol=1e-9)
+
+    # Always flat: no returns, no VaR (rather than a VaR of zero)
+    assert equity_var_es(np.full(300, 100.0), windows=(60,), held=np.zeros(300, bool)).isna().all().all()
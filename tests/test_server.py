@@ -0,0 +1,88 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.server import AnalyticsService, BadRequest, encode_response, normalize_params
+from src.data.price_store import write_column_store
+
+
+def _strict_json(body):
+    def reject(constant):
+        raise ValueError(f"invalid JSON constant {constant}")
+    return json.loads(body, parse_constant=reject)
+
+
+def _write_store(store, n, gold=1800.0):
+    write_column_store(pd.DataFrame({
+        "Date": pd.bdate_range("2024-01-01", periods=n),
+        "Gold_Close": np.linspace(gold, gold * 1.1, n),
+        "Silver_Close": np.linspace(22.0, 24.0, n),
+    }), store)
+
+
+def test_non_finite_values_are_sent_as_null():
+    columns = {"x": np.array([1.0, np.nan, np.inf, -np.inf])}
+    body = encode_response(pd.bdate_range("2024-01-01", periods=4), columns, {}, "json")
+    assert _strict_json(body)["columns"]["x"] == [1.0, None, None, None]
+
+
+@pytest.mark.parametrize("path, query, message", [
+    ("/volatility", {"window": ["0"]}, "window"),
+    ("/indicators", {"window": ["-5"]}, "window"),
+    ("/indicators", {"foo": ["1"]}, "unknown parameter"),
+    ("/backtest", {"strategy": ["bollinger"], "foo": ["3"]}, "unknown parameter"),
+    ("/backtest", {"strategy": ["rsi"], "window": ["3"]}, "unknown parameter"),
+    ("/prices", {"start": ["2024-02-01"], "end": ["2024-01-01"]}, "after end"),
+    ("/prices", {"start": ["garbage"]}, "start"),
+])
+def test_invalid_parameters_are_rejected(path, query, message):
+    with pytest.raises(BadRequest, match=message):
+        normalize_params(path, query)
+
+
+def test_backtest_parameters_are_canonical():
+    params = normalize_params("/backtest", {"strategy": ["bollinger"], "window": ["10.0"], "k": ["1.5"]})
+    assert params["window"] == 10 and params["k"] == 1.5
+
+
+def test_empty_date_range_is_a_bad_request(tmp_path):
+    store = tmp_path / "store"
+    _write_store(store, 50)
+    service = AnalyticsService(store, tmp_path / "missing.csv")
+    params = normalize_params("/prices", {"start": ["2030-01-01"]})
+    with pytest.raises(BadRequest, match="no data"):
+        service.get(service.snapshot(), "/prices", params)
+
+
+def test_version_matches_data_across_store_rewrites(tmp_path):
+    store = tmp_path / "store"
+    _write_store(store, 50, gold=1000.0)
+    service = AnalyticsService(store, tmp_path / "missing.csv", version_ttl=0.0)
+    params = normalize_params("/prices", {})
+    seen, errors = {}, []
+
+    def read():
+        try:
+            for _ in range(30):
+                snapshot = service.snapshot()
+                body = _strict_json(service.get(snapshot, "/prices", params))
+                seen.setdefault(body["meta"]["data_version"], set()).add(body["columns"]["Close"][0])
+        except Exception as exc:  # reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for gold in (2000.0, 3000.0, 4000.0):
+        _write_store(store, 40, gold=gold)
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    # Every version served exactly one dataset
+    assert all(len(first_prices) == 1 for first_prices in seen.values())
+    body = _strict_json(service.get(service.snapshot(), "/prices", params))
+    assert body["columns"]["Close"][0] == 4000.0 and body["meta"]["rows"] == 40
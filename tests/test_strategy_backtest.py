@@ -0,0 +1,57 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis import bollinger_backtest
+from src.analysis.strategy_backtest import (
+    DEFAULT_GRID, build_signal_matrix, expand_grid, ffill_columns, simulate_signal_matrix, warmup_bars,
+)
+
+
+def _prices(n=1_500, seed=0):
+    # Mean-reverting around a slow trend, so the band strategies trade often
+    rng = np.random.default_rng(seed)
+    noise = np.zeros(n)
+    for i in range(1, n):
+        noise[i] = 0.9 * noise[i - 1] + rng.normal(0, 0.01)
+    return 1800 * np.exp(np.linspace(0, 0.5, n) + noise)
+
+
+def test_batch_bollinger_matches_per_strategy_backtest(tmp_path, monkeypatch):
+    prices = _prices()
+    frame = pd.DataFrame({"Date": pd.bdate_range("2015-01-01", periods=len(prices)),
+                          "Gold_Close": prices, "Silver_Close": prices / 80})
+    monkeypatch.setattr(bollinger_backtest, "load_prices", lambda timeframe: frame.copy())
+    monkeypatch.setattr(bollinger_backtest, "data_versions", lambda datasets: {"cleaned": "test"})
+    monkeypatch.setattr(bollinger_backtest, "BASE_DIR", tmp_path)
+
+    per_bar, trades = bollinger_backtest.backtest_bollinger_strategy("Gold")
+
+    variants = expand_grid({"bollinger": {"window": [20], "k": [2.0]}})
+    equity, positions = simulate_signal_matrix(prices, build_signal_matrix(prices, variants))
+    start = warmup_bars(variants)[0]
+
+    assert len(trades) > 10
+    assert np.count_nonzero(np.diff(positions[:, 0])) == len(trades)
+    # The per-strategy backtest starts after the band warm-up
+    np.testing.assert_allclose(equity[start:, 0], per_bar["Equity"], rtol=1e-9)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_no_position_before_warmup(seed):
+    prices = _prices(600, seed)
+    # An early crash and rebound, to tempt signals right at the start
+    prices[:40] *= np.r_[np.linspace(1, 0.7, 20), np.linspace(0.7, 1.1, 20)]
+    variants = expand_grid(DEFAULT_GRID)
+    signals = build_signal_matrix(prices, variants)
+    positions = ffill_columns(signals)
+
+    for j, start in enumerate(warmup_bars(variants)):
+        assert not (signals[:start, j] == 1).any(), variants[j][0]
+        assert not positions[:start, j].any(), variants[j][0]
+    # The grid does trade once warmed up
+    assert positions.any(axis=0).mean() > 0.5
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from src.data.validate import validate_frame, validate_prices
+
+
+def _walk(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def _dates(n):
+    return pd.bdate_range("2024-01-01", periods=n).to_numpy()
+
+
+def test_single_spike_flags_only_the_spike():
+    prices = _walk()
+    prices[17] *= 1.5
+    result = validate_prices(_dates(len(prices)), prices, ["Gold"])
+
+    assert np.flatnonzero(result.masks["outlier"][:, 0]).tolist() == [17]
+    cleaned = result.apply(prices)
+    assert np.isnan(cleaned[17])
+    assert np.isfinite(np.delete(cleaned, 17)).all()
+
+
+def test_spike_before_missing_row_and_downward_spike():
+    prices = np.column_stack([_walk(seed=1), _walk(seed=2)])
+    prices[30, 0] *= 0.5    # downward spike
+    prices[10, 1] *= 1.6    # upward spike, next price missing
+    prices[11, 1] = np.nan
+    result = validate_prices(_dates(len(prices)), prices, ["Gold", "Silver"])
+
+    assert np.flatnonzero(result.masks["outlier"][:, 0]).tolist() == [30]
+    assert np.flatnonzero(result.masks["outlier"][:, 1]).tolist() == [10]
+
+
+def test_level_shift_is_not_an_outlier():
+    prices = _walk()
+    prices[25:] *= 1.4
+    result = validate_prices(_dates(len(prices)), prices, ["Gold"])
+
+    assert not result.masks["outlier"].any()
+
+
+def test_drop_invalid_keeps_bar_after_spike():
+    prices = _walk()
+    prices[17] *= 1.5
+    df = pd.DataFrame({"Date": pd.bdate_range("2024-01-01", periods=len(prices)), "Gold_Close": prices})
+    cleaned = validate_frame(df).apply_frame(df)
+
+    assert cleaned["Gold_Close"].isna().tolist() == [i == 17 for i in range(len(prices))]
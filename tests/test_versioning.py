@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.data.versioning import SNAPSHOT_EVERY, DatasetVersions, record_run
+
+
+def _frames(n_versions=25, seed=0):
+    """A history of frames with revised cells, deleted rows, NaN cells and appended rows."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=200 + 5 * n_versions)
+    df = pd.DataFrame({
+        "Date": dates[:200],
+        "Gold_Close": 1800 + rng.normal(0, 10, 200),
+        "Silver_Close": 22 + rng.normal(0, 1, 200),
+    })
+    frames = [df]
+    for i in range(1, n_versions):
+        df = df.copy()
+        df.loc[rng.integers(0, len(df), 3), "Gold_Close"] += 1.0                        # revised cells
+        if i % 3 == 0:
+            df = df.drop(index=df.index[rng.integers(0, len(df))]).reset_index(drop=True)  # deleted row
+        if i % 4 == 0:
+            df.loc[rng.integers(0, len(df)), "Silver_Close"] = np.nan                   # cell set to NaN
+        new = pd.DataFrame({
+            "Date": dates[200 + 5 * (i - 1): 200 + 5 * i],
+            "Gold_Close": 1800 + rng.normal(0, 10, 5),
+            "Silver_Close": 22 + rng.normal(0, 1, 5),
+        })
+        df = pd.concat([df, new], ignore_index=True)                                     # appended rows
+        frames.append(df)
+    return frames
+
+
+def test_every_version_round_trips(tmp_path):
+    frames = _frames()
+    history = DatasetVersions("cleaned", tmp_path)
+    ids = [history.commit(df, note=f"step {i}") for i, df in enumerate(frames)]
+
+    assert ids == [f"v{i:04d}" for i in range(1, len(frames) + 1)]
+    kinds = [entry["kind"] for entry in history.versions()]
+    assert [i for i, kind in enumerate(kinds) if kind == "snapshot"] == list(range(0, len(frames), SNAPSHOT_EVERY))
+
+    # Fresh instance: nothing cached, every version rebuilt from disk
+    history = DatasetVersions("cleaned", tmp_path)
+    for version, df in zip(reversed(ids), reversed(frames)):
+        pd.testing.assert_frame_equal(history.load(version), df, check_dtype=False)
+
+    # Committing an unchanged table returns the current head
+    assert history.commit(frames[-1]) == ids[-1]
+
+
+def test_diff_reports_changed_cells(tmp_path):
+    old = _frames(1)[0]
+    new = old.copy()
+    new.loc[[3, 50], "Gold_Close"] += 1.0
+    new.loc[7, "Silver_Close"] = np.nan
+    new = new.drop(index=[10, 11])
+    new = pd.concat([new, pd.DataFrame({"Date": [pd.Timestamp("2021-01-01")],
+                                        "Gold_Close": [1900.0], "Silver_Close": [25.0]})])
+
+    history = DatasetVersions("cleaned", tmp_path)
+    v1, v2 = history.commit(old), history.commit(new)
+    assert history.diff(v1, v2) == {"added": 1, "deleted": 2, "revised": 3}
+    assert history.diff(v1, v1) == {"added": 0, "deleted": 0, "revised": 0}
+
+
+def test_record_run_names_dataset_versions(tmp_path):
+    output = tmp_path / "batch_backtest_results.csv"
+    path = record_run(output, {"cleaned": "v0003"}, strategies=4)
+
+    assert path == tmp_path / "batch_backtest_results.version.json"
+    record = json.loads(path.read_text())
+    assert record["output"] == output.name
+    assert record["datasets"] == {"cleaned": "v0003"}
+    assert record["strategies"] == 4
+    assert "created" in record